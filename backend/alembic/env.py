@@ -8,14 +8,17 @@ from alembic import context
 import sys
 from pathlib import Path
 
-# Add parent directory to path for imports
+# Add parent directory to path for imports (src is importable only after this,
+# hence the E402 exemptions below)
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from src.config import settings
-from src.database import Base
+from src.config import settings  # noqa: E402
+from src.database import Base  # noqa: E402
 
 # Import all models to ensure they're registered with Base
-from src.models import User, JWTToken, VerificationToken, SecurityLog
+import src.models  # noqa: E402, F401
+from src.models.operation_log import SEARCH_FTS_TABLE, SEARCH_INDEXES, SEARCH_VECTOR_COLUMN  # noqa: E402
+from src.models.user import EMAIL_SEARCH_FTS_TABLE, EMAIL_SEARCH_INDEXES  # noqa: E402
 
 # Alembic Config object
 config = context.config
@@ -24,13 +27,31 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# Set sqlalchemy.url from settings
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+# Set sqlalchemy.url from settings (unless the caller already set one)
+if not config.get_main_option("sqlalchemy.url"):
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 
 # Target metadata for 'autogenerate' support
 target_metadata = Base.metadata
 
 
+def include_name(name, type_, parent_names) -> bool:
+    """
+    Keep autogenerate away from the search objects, which are managed by
+    hand (revisions 0005, 0010 and 0011) rather than declared on the models
+    """
+    if type_ == "table":
+        # FTS5 creates shadow tables named <table>_data, <table>_idx, ...
+        return not any(
+            name == table or name.startswith(f"{table}_") for table in (SEARCH_FTS_TABLE, EMAIL_SEARCH_FTS_TABLE)
+        )
+    if type_ == "column":
+        return name != SEARCH_VECTOR_COLUMN
+    if type_ == "index":
+        return name not in SEARCH_INDEXES + EMAIL_SEARCH_INDEXES
+    return True
+
+
 def run_migrations_offline() -> None:
     """
     Run migrations in 'offline' mode.
@@ -48,6 +69,7 @@ def run_migrations_offline() -> None:
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
         compare_server_default=True,
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -73,6 +95,7 @@ def run_migrations_online() -> None:
             target_metadata=target_metadata,
             compare_type=True,
             compare_server_default=True,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,86 @@
+"""hot query indexes
+
+Composite and partial indexes matching the access patterns in the services:
+- jwt_tokens: a user's live sessions (partial, unrevoked only); the boolean
+  `revoked` index is dropped, jti lookups already use the unique jti index
+- verification_tokens: a user's unused tokens of one purpose (partial);
+  (token, token_type) lookups already use the unique token index
+- operation_logs: (user_id, created_at DESC) for "my latest logs" pages
+- security_logs: (user_id, timestamp) for a user's audit trail
+- email_verification_limits: (limit_type, identifier, window_start) for the
+  rate-limit window lookups
+
+The single-column user_id indexes are replaced by the composites, which
+lead with user_id. On PostgreSQL indexes are built CONCURRENTLY so the hot
+tables keep taking writes during the migration.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:54:32.205973+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_email_limits_type_id_window', 'email_verification_limits',
+            ['limit_type', 'identifier', 'window_start'],
+            unique=False, postgresql_concurrently=True
+        )
+        op.drop_index('idx_email_limits_type_id', table_name='email_verification_limits', postgresql_concurrently=True)
+
+        op.create_index(
+            'idx_jwt_tokens_user_active', 'jwt_tokens', ['user_id', 'expires_at'],
+            unique=False, postgresql_concurrently=True,
+            postgresql_where=sa.text('revoked = false'), sqlite_where=sa.text('revoked = 0')
+        )
+        op.drop_index('ix_jwt_tokens_revoked', table_name='jwt_tokens', postgresql_concurrently=True)
+
+        op.create_index(
+            'idx_operation_logs_user_created', 'operation_logs', ['user_id', sa.text('created_at DESC')],
+            unique=False, postgresql_concurrently=True
+        )
+        op.drop_index('ix_operation_logs_user_id', table_name='operation_logs', postgresql_concurrently=True)
+
+        op.create_index(
+            'idx_security_logs_user_time', 'security_logs', ['user_id', 'timestamp'],
+            unique=False, postgresql_concurrently=True
+        )
+        op.drop_index('ix_security_logs_user_id', table_name='security_logs', postgresql_concurrently=True)
+
+        op.create_index(
+            'idx_verification_tokens_user_unused', 'verification_tokens', ['user_id', 'token_type'],
+            unique=False, postgresql_concurrently=True,
+            postgresql_where=sa.text('used = false'), sqlite_where=sa.text('used = 0')
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_verification_tokens_user_unused', table_name='verification_tokens', postgresql_concurrently=True)
+
+        op.create_index('ix_security_logs_user_id', 'security_logs', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('idx_security_logs_user_time', table_name='security_logs', postgresql_concurrently=True)
+
+        op.create_index('ix_operation_logs_user_id', 'operation_logs', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('idx_operation_logs_user_created', table_name='operation_logs', postgresql_concurrently=True)
+
+        op.create_index('ix_jwt_tokens_revoked', 'jwt_tokens', ['revoked'], unique=False, postgresql_concurrently=True)
+        op.drop_index('idx_jwt_tokens_user_active', table_name='jwt_tokens', postgresql_concurrently=True)
+
+        op.create_index(
+            'idx_email_limits_type_id', 'email_verification_limits', ['limit_type', 'identifier'],
+            unique=False, postgresql_concurrently=True
+        )
+        op.drop_index('idx_email_limits_type_id_window', table_name='email_verification_limits', postgresql_concurrently=True)
@@ -0,0 +1,107 @@
+"""uuid7 primary keys for append-heavy tables
+
+security_logs, login_attempts, jwt_tokens and verification_tokens now get
+UUIDv7 ids from the application (src.utils.uuid7). No column type changes,
+so this revision only migrates what is already there:
+
+- Drops the UNIQUE constraint on id that duplicated the primary key index
+  (a second random-order B-tree maintained on every insert)
+- Rewrites existing uuid4 ids as UUIDv7 derived from each row's own
+  timestamp, so old and new rows share one time order (no foreign keys
+  point at these ids)
+- Rebuilds the primary key indexes on PostgreSQL to drop the bloat left
+  by random inserts
+
+Downgrade restores the UNIQUE constraints; rewritten ids stay valid UUIDs.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:10:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.utils.uuid7 import uuid7_from_datetime
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+# table -> column holding the row's creation time
+TABLES = {
+    'security_logs': 'timestamp',
+    'login_attempts': 'attempt_time',
+    'jwt_tokens': 'issued_at',
+    'verification_tokens': 'created_at',
+}
+
+BATCH_SIZE = 5000
+
+# Names for the unnamed constraints reflected from SQLite
+SQLITE_NAMING = {"uq": "uq_%(table_name)s_%(column_0_name)s"}
+
+
+def _drop_id_unique(table_name: str) -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table(table_name, naming_convention=SQLITE_NAMING) as batch_op:
+            batch_op.drop_constraint(f'uq_{table_name}_id', type_='unique')
+    else:
+        # PostgreSQL default name for an inline UNIQUE on id
+        op.drop_constraint(f'{table_name}_id_key', table_name, type_='unique')
+
+
+def _rekey(table_name: str, time_column: str) -> None:
+    """Replace uuid4 ids with UUIDv7 ids carrying the row's timestamp"""
+    if op.get_context().as_sql:
+        # Offline (--sql) mode cannot read rows; run the upgrade online to re-key
+        return
+    conn = op.get_bind()
+    table = sa.table(table_name, sa.column('id', sa.Uuid()), sa.column(time_column, sa.DateTime()))
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam('old_id', type_=sa.Uuid()))
+        .values(id=sa.bindparam('new_id', type_=sa.Uuid()))
+    )
+
+    last_id = None
+    while True:
+        query = sa.select(table.c.id, table.c[time_column]).order_by(table.c.id).limit(BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(table.c.id > last_id)
+        rows = conn.execute(query).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        # Rows already on v7 (new inserts, or re-keyed rows sorting after last_id) are skipped
+        params = [
+            {'old_id': row_id, 'new_id': uuid7_from_datetime(created)}
+            for row_id, created in rows
+            if row_id.version != 7
+        ]
+        if params:
+            conn.execute(update, params)
+
+
+def upgrade() -> None:
+    for table_name, time_column in TABLES.items():
+        _drop_id_unique(table_name)
+        _rekey(table_name, time_column)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for table_name in TABLES:
+                op.execute(f'REINDEX TABLE CONCURRENTLY {table_name}')
+
+
+def downgrade() -> None:
+    for table_name in TABLES:
+        if op.get_bind().dialect.name == 'sqlite':
+            with op.batch_alter_table(table_name, naming_convention=SQLITE_NAMING) as batch_op:
+                batch_op.create_unique_constraint(f'uq_{table_name}_id', ['id'])
+        else:
+            op.create_unique_constraint(f'{table_name}_id_key', table_name, ['id'])
@@ -0,0 +1,42 @@
+"""operation_logs keyset pagination index
+
+Adds id to idx_operation_logs_user_created so cursor pages ordered by
+(created_at DESC, id DESC) are a single index range scan with no sort,
+ties on created_at included.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 10:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+INDEX = 'idx_operation_logs_user_created'
+
+
+def _replace_index(columns) -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # Build the new index next to the old one so pages never lose their index
+        with op.get_context().autocommit_block():
+            op.create_index(f'{INDEX}_new', 'operation_logs', columns, unique=False, postgresql_concurrently=True)
+            op.drop_index(INDEX, table_name='operation_logs', postgresql_concurrently=True)
+        op.execute(f'ALTER INDEX {INDEX}_new RENAME TO {INDEX}')
+    else:
+        op.drop_index(INDEX, table_name='operation_logs')
+        op.create_index(INDEX, 'operation_logs', columns, unique=False)
+
+
+def upgrade() -> None:
+    _replace_index(['user_id', sa.text('created_at DESC'), sa.text('id DESC')])
+
+
+def downgrade() -> None:
+    _replace_index(['user_id', sa.text('created_at DESC')])
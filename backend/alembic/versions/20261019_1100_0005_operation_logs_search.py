@@ -0,0 +1,102 @@
+"""operation_logs full-text and trigram search
+
+PostgreSQL: search_vector tsvector column maintained by a trigger, a GIN
+index on it, and a pg_trgm GIN index over action/resource/details for
+substring search. The column is added empty and backfilled in batches so
+the table is never rewritten under a long lock.
+
+SQLite: FTS5 trigram table over the same columns, kept in sync by triggers.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 11:00:00.000000+00:00
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+from src.utils.fts import fts5_rebuild, fts5_trigger_names, fts5_trigram_ddl
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 10000
+
+SEARCH_DOCUMENT = (
+    "to_tsvector('simple', coalesce(action, '') || ' ' || coalesce(resource, '') || ' ' || coalesce(details, ''))"
+)
+
+
+def _upgrade_postgresql() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("ALTER TABLE operation_logs ADD COLUMN search_vector tsvector")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION operation_logs_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := to_tsvector('simple',
+                coalesce(NEW.action, '') || ' ' || coalesce(NEW.resource, '') || ' ' || coalesce(NEW.details, ''));
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER operation_logs_search_vector_trg
+        BEFORE INSERT OR UPDATE OF action, resource, details ON operation_logs
+        FOR EACH ROW EXECUTE FUNCTION operation_logs_search_vector_update()
+    """)
+
+    with op.get_context().autocommit_block():
+        backfill = (
+            f"UPDATE operation_logs SET search_vector = {SEARCH_DOCUMENT} "
+            f"WHERE id IN (SELECT id FROM operation_logs WHERE search_vector IS NULL LIMIT {BACKFILL_BATCH_SIZE})"
+        )
+        if context.is_offline_mode():
+            op.execute(f"UPDATE operation_logs SET search_vector = {SEARCH_DOCUMENT} WHERE search_vector IS NULL")
+        else:
+            # New rows get their vector from the trigger; each batch commits on its own
+            while op.get_bind().execute(sa.text(backfill)).rowcount:
+                pass
+
+        op.create_index(
+            'idx_operation_logs_search_vector', 'operation_logs', ['search_vector'],
+            postgresql_using='gin', postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_operation_logs_trgm', 'operation_logs', ['action', 'resource', 'details'],
+            postgresql_using='gin', postgresql_concurrently=True,
+            postgresql_ops={'action': 'gin_trgm_ops', 'resource': 'gin_trgm_ops', 'details': 'gin_trgm_ops'}
+        )
+
+
+def _upgrade_sqlite() -> None:
+    for statement in fts5_trigram_ddl('operation_logs_fts', 'operation_logs', ('action', 'resource', 'details')):
+        op.execute(statement)
+    # Index the rows that already exist
+    op.execute(fts5_rebuild('operation_logs_fts'))
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        _upgrade_postgresql()
+    elif dialect == 'sqlite':
+        _upgrade_sqlite()
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('idx_operation_logs_trgm', table_name='operation_logs', postgresql_concurrently=True)
+            op.drop_index('idx_operation_logs_search_vector', table_name='operation_logs', postgresql_concurrently=True)
+        op.execute("DROP TRIGGER IF EXISTS operation_logs_search_vector_trg ON operation_logs")
+        op.execute("DROP FUNCTION IF EXISTS operation_logs_search_vector_update()")
+        op.drop_column('operation_logs', 'search_vector')
+    elif dialect == 'sqlite':
+        for trigger in fts5_trigger_names('operation_logs_fts'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS operation_logs_fts")
@@ -0,0 +1,35 @@
+"""users registration keyset index
+
+(registration_timestamp DESC, id DESC) for the admin user listing: cursor
+pages, and registration range filters, are one index range scan with no
+sort.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 12:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+INDEX = 'idx_users_registration'
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX, 'users', [sa.text('registration_timestamp DESC'), sa.text('id DESC')],
+            unique=False, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX, table_name='users', postgresql_concurrently=True)
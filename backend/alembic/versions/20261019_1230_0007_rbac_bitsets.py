@@ -0,0 +1,48 @@
+"""rbac permission bits and version
+
+- permissions.bit_index: each permission's bit in role and user permission
+  masks; existing permissions are numbered by name, new ones get the next
+  free bit when inserted (never reused)
+- rbac_state: one row whose version is bumped whenever roles or
+  permissions change, so every process knows when to rebuild its snapshot
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 12:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('permissions', sa.Column('bit_index', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE permissions SET bit_index = "
+        "(SELECT COUNT(*) FROM permissions AS earlier WHERE earlier.name < permissions.name)"
+    )
+    with op.batch_alter_table('permissions') as batch_op:
+        batch_op.alter_column('bit_index', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_index('ix_permissions_bit_index', ['bit_index'], unique=True)
+
+    rbac_state = op.create_table('rbac_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(rbac_state, [{'id': 1, 'version': 1}])
+
+
+def downgrade() -> None:
+    op.drop_table('rbac_state')
+    with op.batch_alter_table('permissions') as batch_op:
+        batch_op.drop_index('ix_permissions_bit_index')
+        batch_op.drop_column('bit_index')
@@ -0,0 +1,44 @@
+"""admin stats counters
+
+admin_stats holds the dashboard counters (users, active users, roles,
+permissions, configs), one row each. ORM flushes adjust them in the same
+transaction as the change, so GET /admin/stats no longer counts tables.
+The rows are seeded here from the current table sizes.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 13:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+COUNTERS = {
+    'total_users': "SELECT COUNT(*) FROM users",
+    'active_users': "SELECT COUNT(*) FROM users WHERE account_status = 'ACTIVE'",
+    'total_roles': "SELECT COUNT(*) FROM roles",
+    'total_permissions': "SELECT COUNT(*) FROM permissions",
+    'total_configs': "SELECT COUNT(*) FROM system_configs",
+}
+
+
+def upgrade() -> None:
+    op.create_table('admin_stats',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+    for name, count in COUNTERS.items():
+        op.execute(f"INSERT INTO admin_stats (name, value) SELECT '{name}', ({count})")
+
+
+def downgrade() -> None:
+    op.drop_table('admin_stats')
@@ -0,0 +1,34 @@
+"""system config version
+
+system_config_state holds one row whose version is bumped by every
+config change (once per bulk save), so config caches and GET
+/admin/configs ETags know when configs changed.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 13:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    config_state = op.create_table('system_config_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(config_state, [{'id': 1, 'version': 1}])
+
+
+def downgrade() -> None:
+    op.drop_table('system_config_state')
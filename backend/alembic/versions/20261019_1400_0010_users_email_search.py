@@ -0,0 +1,59 @@
+"""users email search index
+
+PostgreSQL: pg_trgm GIN index on users.email, which serves both prefix
+(LIKE 'abc%') and substring (LIKE '%abc%') matches for the admin email
+search. Built concurrently so sign-ups are not blocked.
+
+SQLite: FTS5 trigram table over users.email, kept in sync by triggers.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 14:00:00.000000+00:00
+
+"""
+from alembic import op
+
+from src.utils.fts import fts5_rebuild, fts5_trigger_names, fts5_trigram_ddl
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def _upgrade_postgresql() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_users_email_trgm', 'users', ['email'],
+            postgresql_using='gin', postgresql_concurrently=True,
+            postgresql_ops={'email': 'gin_trgm_ops'}
+        )
+
+
+def _upgrade_sqlite() -> None:
+    for statement in fts5_trigram_ddl('users_email_fts', 'users', ('email',)):
+        op.execute(statement)
+    # Index the users that already exist
+    op.execute(fts5_rebuild('users_email_fts'))
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        _upgrade_postgresql()
+    elif dialect == 'sqlite':
+        _upgrade_sqlite()
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('idx_users_email_trgm', table_name='users', postgresql_concurrently=True)
+    elif dialect == 'sqlite':
+        for trigger in fts5_trigger_names('users_email_fts'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS users_email_fts")
@@ -0,0 +1,40 @@
+"""users email prefix index
+
+PostgreSQL: btree varchar_pattern_ops index on users.email. The admin
+email search answers prefix matches (LIKE 'abc%') with a range scan of
+this index in its own (byte) order, so ORDER BY ... LIMIT stops after
+LIMIT rows instead of sorting every trigram match. Built concurrently so
+sign-ups are not blocked.
+
+SQLite: nothing to do; prefix matches use a range scan of the existing
+unique email index.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 14:30:00.000000+00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'idx_users_email_pattern', 'users', ['email'],
+                postgresql_concurrently=True,
+                postgresql_ops={'email': 'varchar_pattern_ops'}
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index('idx_users_email_pattern', table_name='users', postgresql_concurrently=True)
@@ -2,16 +2,29 @@
 Admin API Endpoints
 超级管理员系统管理接口
 """
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from typing import List, Literal, Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from pydantic import BaseModel, Field
 from datetime import datetime
+import uuid
 
-from src.database import get_db
-from src.models import User, SystemConfig, Role, Permission
+from src.config import settings
+from src.database import get_async_db, get_async_read_db, get_async_session_factory, get_db, release_session
+from src.models import AccountStatus, User, SystemConfig, SystemConfigState, Role, Permission
+from src.models.role import CONFIG_STATE_ID
+from src.services.admin_stats import load_admin_stats
+from src.services.admin_user_service import AdminUserService, bulk_update_users
 from src.services.auth_service import AuthService
+from src.services.email_queue import VerificationEmailQueue, get_verification_email_queue
+from src.services.operation_log_service import InvalidCursorError
+from src.services.rbac import get_rbac_registry
+from src.services.system_config_service import ConfigValueError, SystemConfigService
+from src.services.user_import import UserImporter, UserImportError, get_password_hash_pool
 from src.dependencies import get_current_user
+from src.utils.pool_metrics import pool_metrics_snapshot
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -53,10 +66,55 @@ class UserResponse(BaseModel):
     created_at: str
     updated_at: Optional[str]
 
+class UserListResponse(BaseModel):
+    users: List[UserResponse]
+    size: int
+    next_cursor: Optional[str] = None
+    has_more: bool
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
 class UserUpdate(BaseModel):
     email_verified: Optional[bool] = None
     account_status: Optional[str] = None
 
+class BulkUserFilter(BaseModel):
+    account_status: Optional[AccountStatus] = None
+    email_verified: Optional[bool] = None
+    role: Optional[str] = None
+    registered_from: Optional[datetime] = None
+    registered_to: Optional[datetime] = None
+    email_prefix: Optional[str] = Field(None, min_length=1, max_length=255)
+
+class BulkUserRequest(BaseModel):
+    action: Literal["lock", "unlock", "verify", "delete"]
+    user_ids: Optional[List[uuid.UUID]] = Field(None, min_length=1, max_length=settings.ADMIN_BULK_USER_MAX_IDS)
+    filter: Optional[BulkUserFilter] = None
+
+class BulkUserResponse(BaseModel):
+    action: str
+    matched: int
+    affected: int
+    tokens_revoked: int
+
+class UserImportResponse(BaseModel):
+    received: int
+    created: int
+    existing: int
+    invalid: int
+    emails_queued: int
+    errors: List[Dict[str, Any]]
+
+class UserSearchMatch(BaseModel):
+    id: str
+    email: str
+    account_status: str
+    match: str
+
+class UserSearchResponse(BaseModel):
+    query: str
+    matches: List[UserSearchMatch]
+
 class RoleResponse(BaseModel):
     id: str
     name: str
@@ -105,17 +163,27 @@ def require_permission(permission_name: str):
 # 系统配置管理
 @router.get("/configs", response_model=List[SystemConfigResponse])
 async def get_system_configs(
+    request: Request,
+    response: Response,
     category: Optional[str] = None,
     # current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """获取系统配置列表"""
+    """获取系统配置列表（ETag 为配置版本，未变化时返回 304）"""
+    version = db.scalar(select(SystemConfigState.version).where(SystemConfigState.id == CONFIG_STATE_ID)) or 0
+    etag = f'W/"config-{version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
     # 从数据库查询配置
     query = db.query(SystemConfig)
     if category:
         query = query.filter(SystemConfig.category == category)
     
     configs = query.all()
+    # 最后一次查询后提前归还连接
+    release_session(db)
     
     return [
         SystemConfigResponse(
@@ -133,46 +201,19 @@ async def get_system_configs(
         for config in configs
     ]
 
-# 系统统计
-@router.get("/stats")
-async def get_system_stats():
-    """获取系统统计信息"""
-    return {
-        "total_users": 2,
-        "active_users": 2,
-        "total_roles": 2,
-        "total_configs": 2,
-        "system_uptime": "24小时",
-        "last_backup": "2025-10-05T09:00:00Z"
-    }
-
-# 角色管理
-@router.get("/roles")
-async def get_roles():
-    """获取角色列表"""
-    return [
-        {
-            "id": "role-1",
-            "name": "admin",
-            "description": "系统管理员",
-            "permissions": ["user.read", "user.write", "system.config.read", "system.config.write"]
-        },
-        {
-            "id": "role-2", 
-            "name": "user",
-            "description": "普通用户",
-            "permissions": ["user.read"]
-        }
-    ]
-
 # 系统配置保存
 @router.post("/configs")
 async def save_system_configs(
     config_data: dict,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """保存系统配置"""
+    """
+    保存系统配置
+    
+    一条多行 upsert 写入全部配置项：已有配置按其 value_type 转换取值，新配置按取值推断类型；
+    任一取值不合法时返回 422 且不写入。配置版本只递增一次，供缓存失效
+    """
     if not current_user or not hasattr(current_user, 'has_permission') or not current_user.has_permission("system.config.update"):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -181,52 +222,27 @@ async def save_system_configs(
     
     category = config_data.get('category', 'basic')
     configs = config_data.get('configs', {})
-    
-    saved_configs = []
+    if not isinstance(configs, dict):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="configs 必须是键值对象"
+        )
     
     try:
-        for key, value in configs.items():
-            if value is not None:  # 只保存非空值
-                # 查找是否已存在
-                existing_config = db.query(SystemConfig).filter(
-                    SystemConfig.key == key,
-                    SystemConfig.category == category
-                ).first()
-                
-                if existing_config:
-                    # 更新现有配置
-                    existing_config.value = str(value)
-                    existing_config.value_type = 'string'
-                    existing_config.updated_at = func.now()
-                else:
-                    # 创建新配置
-                    new_config = SystemConfig(
-                        key=key,
-                        value=str(value),
-                        value_type='string',
-                        category=category,
-                        description=f"系统{key}配置",
-                        is_public=True
-                    )
-                    db.add(new_config)
-                
-                saved_configs.append(key)
-        
-        db.commit()
-        
-        return {
-            "success": True,
-            "message": f"{category}配置保存成功",
-            "saved_configs": saved_configs,
-            "category": category
-        }
-    
-    except Exception as e:
-        db.rollback()
+        result = await SystemConfigService(db).save(category, configs)
+    except ConfigValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"保存配置失败: {str(e)}"
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"message": "配置取值与类型不符", "errors": e.errors}
         )
+    
+    return {
+        "success": True,
+        "message": f"{category}配置保存成功",
+        "saved_configs": result.saved,
+        "category": category,
+        "config_version": result.version
+    }
 
 @router.get("/configs/{config_key}", response_model=SystemConfigResponse)
 async def get_system_config(
@@ -242,6 +258,7 @@ async def get_system_config(
         )
     
     config = db.query(SystemConfig).filter(SystemConfig.key == config_key).first()
+    release_session(db)
     if not config:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -306,62 +323,200 @@ async def update_system_config(
     )
 
 # 用户管理
-@router.get("/users", response_model=List[UserResponse])
+def _user_response(user: User) -> UserResponse:
+    return UserResponse(
+        id=str(user.id),
+        email=user.email,
+        email_verified=user.email_verified,
+        account_status=user.account_status.value,
+        failed_login_attempts=user.failed_login_attempts,
+        account_locked_until=user.account_locked_until.isoformat() if user.account_locked_until else None,
+        registration_timestamp=user.registration_timestamp.isoformat(),
+        last_login_timestamp=user.last_login_timestamp.isoformat() if user.last_login_timestamp else None,
+        roles=[role.name for role in user.roles],
+        created_at=user.created_at.isoformat(),
+        updated_at=user.updated_at.isoformat() if user.updated_at else None
+    )
+
+@router.get("/users", response_model=UserListResponse)
 async def get_users(
+    size: int = Query(20, ge=1, le=100, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor）"),
+    with_total: bool = Query(False, description="是否返回总数（超过上限时为估算值）"),
+    account_status: Optional[AccountStatus] = Query(None, description="账户状态过滤"),
+    email_verified: Optional[bool] = Query(None, description="邮箱验证状态过滤"),
+    role: Optional[List[str]] = Query(None, description="角色名过滤（可重复，拥有其中任一角色即匹配）"),
+    registered_from: Optional[datetime] = Query(None, description="注册时间起"),
+    registered_to: Optional[datetime] = Query(None, description="注册时间止"),
+    email_prefix: Optional[str] = Query(None, min_length=1, max_length=255, description="邮箱前缀"),
     current_user: User = Depends(get_current_user),
-    # db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """获取用户列表"""
-    # 临时简化权限检查
-    # if not current_user or not hasattr(current_user, 'has_permission') or not current_user.has_permission("user.read"):
-    #     raise HTTPException(
-    #         status_code=status.HTTP_403_FORBIDDEN,
-    #         detail="需要用户查看权限"
-    #     )
-    
-    # 临时返回模拟数据，直到数据库连接正常
-    from datetime import datetime
-    return [
-        UserResponse(
-            id="550e8400-e29b-41d4-a716-446655440000",
-            email="superadmin@system.com",
-            email_verified=True,
-            account_status="active",
-            failed_login_attempts=0,
-            account_locked_until=None,
-            registration_timestamp=datetime.now().isoformat(),
-            last_login_timestamp=datetime.now().isoformat(),
-            roles=["super_admin"],
-            created_at=datetime.now().isoformat(),
-            updated_at=datetime.now().isoformat()
-        ),
-        UserResponse(
-            id="550e8400-e29b-41d4-a716-446655440001",
-            email="admin@system.com",
-            email_verified=True,
-            account_status="active",
-            failed_login_attempts=0,
-            account_locked_until=None,
-            registration_timestamp=datetime.now().isoformat(),
-            last_login_timestamp=datetime.now().isoformat(),
-            roles=["admin"],
-            created_at=datetime.now().isoformat(),
-            updated_at=datetime.now().isoformat()
-        ),
-        UserResponse(
-            id="550e8400-e29b-41d4-a716-446655440002",
-            email="demo@example.com",
-            email_verified=True,
-            account_status="active",
-            failed_login_attempts=0,
-            account_locked_until=None,
-            registration_timestamp=datetime.now().isoformat(),
-            last_login_timestamp=datetime.now().isoformat(),
-            roles=["demo"],
-            created_at=datetime.now().isoformat(),
-            updated_at=datetime.now().isoformat()
+    """
+    获取用户列表
+    
+    按 (registration_timestamp, id) 倒序的游标分页；角色通过 selectinload 一次加载，
+    无论每页多少用户，查询次数固定
+    """
+    if not current_user or not hasattr(current_user, 'has_permission') or not current_user.has_permission("user.read"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="需要用户查看权限"
         )
-    ]
+    
+    service = AdminUserService(db)
+    query = service.build_query(
+        status=account_status,
+        email_verified=email_verified,
+        role=role,
+        registered_from=registered_from,
+        registered_to=registered_to,
+        email_prefix=email_prefix
+    )
+    try:
+        page = await service.get_page(query, size=size, cursor=cursor, with_total=with_total)
+    except InvalidCursorError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="无效的分页游标")
+    
+    return UserListResponse(
+        users=[_user_response(user) for user in page.users],
+        size=size,
+        next_cursor=page.next_cursor,
+        has_more=page.next_cursor is not None,
+        total=page.total,
+        total_is_estimate=page.total_is_estimate
+    )
+
+@router.post("/users/bulk", response_model=BulkUserResponse)
+async def bulk_update_user_accounts(
+    request: BulkUserRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    session_factory: async_sessionmaker = Depends(get_async_session_factory)
+):
+    """
+    批量处理用户账户（锁定 / 解锁 / 验证邮箱 / 软删除）
+    
+    按 user_ids 和/或 filter 选择用户（至少提供一个，不包括操作者本人）；
+    按块执行集合式 UPDATE，每块一个事务，锁定与删除同时批量吊销其令牌；
+    完成后记录一条汇总的操作日志
+    """
+    if not current_user or not hasattr(current_user, 'has_permission') or not current_user.has_permission("user.update"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="需要用户修改权限"
+        )
+    
+    filters = request.filter.model_dump(exclude_none=True) if request.filter else {}
+    if request.user_ids is None and not filters:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="需要指定 user_ids 或 filter"
+        )
+    
+    query = AdminUserService(db).build_query(
+        status=filters.get("account_status"),
+        email_verified=filters.get("email_verified"),
+        role=filters.get("role"),
+        registered_from=filters.get("registered_from"),
+        registered_to=filters.get("registered_to"),
+        email_prefix=filters.get("email_prefix")
+    )
+    result = await bulk_update_users(
+        session_factory,
+        request.action,
+        query,
+        actor_id=current_user.id,
+        user_ids=request.user_ids,
+        chunk_size=settings.ADMIN_BULK_USER_CHUNK_SIZE,
+        audit_context={"filter": filters, "user_ids": len(request.user_ids) if request.user_ids else None}
+    )
+    
+    return BulkUserResponse(
+        action=result.action,
+        matched=result.matched,
+        affected=result.affected,
+        tokens_revoked=result.tokens_revoked
+    )
+
+@router.post("/users/import", response_model=UserImportResponse)
+async def import_users(
+    request: Request,
+    format: Literal["csv", "ndjson"] = Query("csv", description="输入格式：csv（首行为列名）或 ndjson"),
+    send_verification: bool = Query(True, description="是否为未验证邮箱的账户发送验证邮件"),
+    current_user: User = Depends(get_current_user),
+    session_factory: async_sessionmaker = Depends(get_async_session_factory),
+    email_queue: VerificationEmailQueue = Depends(get_verification_email_queue)
+):
+    """
+    批量导入用户
+    
+    请求体为 CSV 或 NDJSON，边接收边解析；列/字段：email、password 或 password_hash
+    （bcrypt/argon2 哈希原样保存）、可选 email_verified。密码在进程池中并行哈希，
+    每批多行插入并提交一次，验证邮件进入队列异步发送。已存在的邮箱跳过，
+    无效行计数并返回前若干条错误
+    """
+    if not current_user or not hasattr(current_user, 'has_permission') or not current_user.has_permission("user.create"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="需要用户创建权限"
+        )
+    
+    importer = UserImporter(
+        session_factory,
+        email_queue,
+        hash_pool=get_password_hash_pool(),
+        batch_size=settings.USER_IMPORT_BATCH_SIZE,
+        send_verification=send_verification
+    )
+    try:
+        result = await importer.run(request.stream(), format, actor_id=current_user.id)
+    except UserImportError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    return UserImportResponse(
+        received=result.received,
+        created=result.created,
+        existing=result.existing,
+        invalid=result.invalid,
+        emails_queued=result.emails_queued,
+        errors=result.errors
+    )
+
+@router.get("/users/search", response_model=UserSearchResponse)
+async def search_users_by_email(
+    q: str = Query(..., min_length=1, max_length=255, description="邮箱片段"),
+    match: Literal["prefix", "contains"] = Query("contains", description="匹配方式：prefix（前缀）或 contains（子串）"),
+    limit: int = Query(10, ge=1, le=50, description="最多返回条数"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    按邮箱片段搜索用户（自动补全）
+    
+    前缀匹配走邮箱 btree 索引的范围扫描，按索引顺序（字节序）返回，完全匹配排在最前；
+    不足 limit 条时再走 trigram 索引（PostgreSQL pg_trgm GIN / SQLite FTS5）补充子串匹配，
+    邮箱越短越靠前
+    """
+    if not current_user or not hasattr(current_user, 'has_permission') or not current_user.has_permission("user.read"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="需要用户查看权限"
+        )
+    
+    matches = await AdminUserService(db).search_emails(q, limit=limit, prefix_only=match == "prefix")
+    return UserSearchResponse(
+        query=q,
+        matches=[
+            UserSearchMatch(
+                id=str(hit.id),
+                email=hit.email,
+                account_status=hit.account_status.value,
+                match=hit.match
+            )
+            for hit in matches
+        ]
+    )
 
 @router.get("/users/{user_id}", response_model=UserResponse)
 async def get_user(
@@ -376,26 +531,15 @@ async def get_user(
             detail="需要用户查看权限"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).options(selectinload(User.roles)).filter(User.id == user_id).first()
+    release_session(db)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="用户不存在"
         )
     
-    return UserResponse(
-        id=str(user.id),
-        email=user.email,
-        email_verified=user.email_verified,
-        account_status=user.account_status.value,
-        failed_login_attempts=user.failed_login_attempts,
-        account_locked_until=user.account_locked_until.isoformat() if user.account_locked_until else None,
-        registration_timestamp=user.registration_timestamp.isoformat(),
-        last_login_timestamp=user.last_login_timestamp.isoformat() if user.last_login_timestamp else None,
-        roles=[role.name for role in user.roles],
-        created_at=user.created_at.isoformat(),
-        updated_at=user.updated_at.isoformat() if user.updated_at else None
-    )
+    return _user_response(user)
 
 @router.put("/users/{user_id}", response_model=UserResponse)
 async def update_user(
@@ -411,7 +555,7 @@ async def update_user(
             detail="需要用户修改权限"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).options(selectinload(User.roles)).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -422,25 +566,12 @@ async def update_user(
         user.email_verified = user_update.email_verified
     
     if user_update.account_status is not None:
-        from src.models import AccountStatus
         user.account_status = AccountStatus(user_update.account_status)
     
     db.commit()
     db.refresh(user)
     
-    return UserResponse(
-        id=str(user.id),
-        email=user.email,
-        email_verified=user.email_verified,
-        account_status=user.account_status.value,
-        failed_login_attempts=user.failed_login_attempts,
-        account_locked_until=user.account_locked_until.isoformat() if user.account_locked_until else None,
-        registration_timestamp=user.registration_timestamp.isoformat(),
-        last_login_timestamp=user.last_login_timestamp.isoformat() if user.last_login_timestamp else None,
-        roles=[role.name for role in user.roles],
-        created_at=user.created_at.isoformat(),
-        updated_at=user.updated_at.isoformat() if user.updated_at else None
-    )
+    return _user_response(user)
 
 # 角色管理
 @router.get("/roles", response_model=List[RoleResponse])
@@ -455,7 +586,10 @@ async def get_roles(
             detail="需要角色查看权限"
         )
     
+    # 权限名取自 RBAC 快照中的角色掩码，不再逐个角色懒加载 permissions
     roles = db.query(Role).all()
+    snapshot = get_rbac_registry().current(db)
+    release_session(db)
     return [
         RoleResponse(
             id=str(role.id),
@@ -464,7 +598,7 @@ async def get_roles(
             description=role.description,
             is_system=role.is_system,
             is_active=role.is_active,
-            permissions=[perm.name for perm in role.permissions],
+            permissions=snapshot.permission_names(snapshot.role_masks.get(role.id, 0)),
             created_at=role.created_at.isoformat(),
             updated_at=role.updated_at.isoformat() if role.updated_at else None
         )
@@ -485,6 +619,7 @@ async def get_permissions(
         )
     
     permissions = db.query(Permission).all()
+    release_session(db)
     return [
         PermissionResponse(
             id=str(perm.id),
@@ -505,7 +640,8 @@ async def get_permissions(
 @router.get("/stats")
 async def get_system_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    session_factory: async_sessionmaker = Depends(get_async_session_factory)
 ):
     """获取系统统计信息"""
     if not current_user or not hasattr(current_user, 'has_permission') or not current_user.has_permission("system.config.read"):
@@ -514,16 +650,19 @@ async def get_system_stats(
             detail="需要系统配置查看权限"
         )
     
-    total_users = db.query(User).count()
-    active_users = db.query(User).filter(User.account_status == "active").count()
-    total_roles = db.query(Role).count()
-    total_permissions = db.query(Permission).count()
-    total_configs = db.query(SystemConfig).count()
+    # 计数器随增删改增量维护，读取开销与数据量无关
+    return await load_admin_stats(db, session_factory)
+
+# 数据库连接池监控
+@router.get("/db/pool")
+async def get_db_pool_metrics(
+    current_user: User = Depends(get_current_user)
+):
+    """获取数据库连接池指标（等待时间分布、使用中/空闲连接数、溢出、预检失败）"""
+    if not current_user or not hasattr(current_user, 'has_permission') or not current_user.has_permission("system.config.read"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="需要系统配置查看权限"
+        )
     
-    return {
-        "total_users": total_users,
-        "active_users": active_users,
-        "total_roles": total_roles,
-        "total_permissions": total_permissions,
-        "total_configs": total_configs
-    }
+    return {"engines": pool_metrics_snapshot()}
@@ -3,9 +3,10 @@ Authentication API Routes
 Register, login, logout, email verification
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
+from src.database import get_async_db
 from src.schemas import (
     RegisterRequest, RegisterResponse,
     LoginRequest, LoginResponse,
@@ -47,7 +48,7 @@ async def register(request: RegisterRequest):
 @router.post("/login", response_model=LoginResponse)
 async def login(
     request: LoginRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     client_ip: str = Depends(get_client_ip)
 ):
     """
@@ -144,7 +145,7 @@ async def login(
 async def logout(
     request: LogoutRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     client_ip: str = Depends(get_client_ip)
 ):
     """
@@ -166,13 +167,13 @@ async def logout(
             detail="Invalid refresh token"
         )
     
-    auth_service.logout(
+    await auth_service.logout(
         user_id=current_user.id,
         refresh_token_jti=refresh_jti,
         ip_address=client_ip
     )
     
-    return LogoutResponse(message=SUCCESS_MESSAGES["logout"])
+    return LogoutResponse(message=SUCCESS_MESSAGES["LOGOUT_SUCCESS"])
 
 
 # ============================================================================
@@ -189,7 +190,7 @@ async def logout(
 )
 async def verify_email(
     token: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     client_ip: str = Depends(get_client_ip)
 ):
     """
@@ -201,7 +202,7 @@ async def verify_email(
     """
     user_service = UserService(db)
     
-    success, error = user_service.verify_email(token, client_ip)
+    success, error = await user_service.verify_email(token, client_ip)
     
     if not success:
         # Check if token was already used
@@ -218,14 +219,14 @@ async def verify_email(
     
     # Get user email from token
     from src.models import VerificationToken
-    token_obj = db.query(VerificationToken).filter(
-        VerificationToken.token == token
-    ).first()
+    token_obj = await db.scalar(
+        select(VerificationToken).where(VerificationToken.token == token)
+    )
     
-    user = user_service.get_user_by_id(token_obj.user_id) if token_obj else None
+    user = await user_service.get_user_by_id(token_obj.user_id) if token_obj else None
     
     return VerifyEmailResponse(
-        message=SUCCESS_MESSAGES["email_verified"],
+        message=SUCCESS_MESSAGES["EMAIL_VERIFIED"],
         email=user.email if user else ""
     )
 
@@ -239,7 +240,7 @@ async def verify_email(
     response_model=PasswordRequirementsResponse
 )
 async def get_password_requirements(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get current password policy requirements (FR-041)
@@ -6,15 +6,13 @@ import uuid
 import base64
 import io
 from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
 from PIL import Image, ImageDraw, ImageFont
 import random
 import string
 import time
 
-from src.database import get_db
 from src.models import SystemConfig
 
 router = APIRouter()
@@ -110,8 +108,7 @@ async def generate_captcha():
 @router.post("/captcha/verify", summary="验证图形验证码")
 async def verify_captcha(
     captcha_id: str,
-    captcha_text: str,
-    db: Session = Depends(get_db)
+    captcha_text: str
 ):
     """
     验证图形验证码
@@ -0,0 +1,158 @@
+"""
+Export Job API Routes
+Background exports of large log ranges with resumable downloads
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.database import get_async_read_session_factory
+from src.dependencies import get_current_user
+from src.models import User
+from src.schemas import ExportJobCreate, ExportJobResponse, ErrorResponse
+from src.services.export_jobs import (
+    JOB_DONE, ExportJob, ExportQueueFullError, get_export_job_manager
+)
+from src.utils.http_range import RangeNotSatisfiableError, iter_file_range, parse_range
+
+router = APIRouter()
+
+
+def _job_response(job: ExportJob) -> ExportJobResponse:
+    return ExportJobResponse(
+        id=job.id,
+        source=job.request.source,
+        format=job.request.format,
+        status=job.status,
+        rows_written=job.rows_written,
+        total_rows=job.total_rows,
+        progress=job.progress,
+        size_bytes=job.size_bytes,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        download_url=f"/api/v1/exports/{job.id}/download" if job.status == JOB_DONE else None
+    )
+
+
+def _get_job(job_id: str, current_user: User) -> ExportJob:
+    job = get_export_job_manager().get(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export job not found")
+    return job
+
+
+# ============================================================================
+# Export Jobs
+# ============================================================================
+
+@router.post(
+    "",
+    response_model=ExportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        200: {"model": ExportJobResponse, "description": "Same export already requested; existing job returned"},
+        503: {"model": ErrorResponse, "description": "Export queue is full"}
+    }
+)
+async def create_export_job(
+    request: ExportJobCreate,
+    response: Response,
+    session_factory: async_sessionmaker = Depends(get_async_read_session_factory),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Submit a background export of the current user's logs
+
+    - The file is gzip-compressed CSV or NDJSON
+    - Repeating the same request within the dedupe window returns the
+      existing job (200) instead of starting another one (202)
+    - Poll GET /exports/{id} for progress, then download
+    """
+    try:
+        job, created = get_export_job_manager().submit(
+            current_user.id, current_user.email, request, session_factory
+        )
+    except ExportQueueFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many exports in progress, try again later",
+            headers={"Retry-After": "30"}
+        )
+
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return _job_response(job)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=ExportJobResponse,
+    responses={404: {"model": ErrorResponse, "description": "Unknown job"}}
+)
+async def get_export_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Get the status and progress of an export job"""
+    return _job_response(_get_job(job_id, current_user))
+
+
+@router.get(
+    "/{job_id}/download",
+    responses={
+        206: {"description": "Requested byte range"},
+        404: {"model": ErrorResponse, "description": "Unknown job"},
+        409: {"model": ErrorResponse, "description": "Job not finished"},
+        416: {"description": "Range outside the file"}
+    }
+)
+async def download_export(
+    job_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None, alias="If-Range"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Download a finished export
+
+    Supports a single HTTP byte range (206 Partial Content), so interrupted
+    downloads can resume; If-Range with the ETag guards against resuming
+    into a different file.
+    """
+    job = _get_job(job_id, current_user)
+    if job.status != JOB_DONE:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Export job is {job.status}")
+
+    size = job.size_bytes
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": job.etag,
+        "Content-Disposition": f"attachment; filename={job.filename}",
+    }
+
+    byte_range = None
+    if if_range is None or if_range == job.etag:
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiableError:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{size}"}
+            )
+
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, status.HTTP_200_OK
+    else:
+        (start, end), status_code = byte_range, status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    return StreamingResponse(
+        iter_file_range(job.path, start, end),
+        status_code=status_code,
+        media_type="application/gzip",
+        headers=headers
+    )
@@ -3,101 +3,148 @@
 提供用户操作日志的查询、过滤和导出功能
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import and_
 from typing import List, Optional
-from datetime import datetime, timedelta
-import csv
-import io
-import json
+import asyncio
+from datetime import datetime, timedelta, timezone
 
-from ...database import get_db
+from ...database import get_async_read_db, get_async_read_session_factory, get_async_session_factory, get_db
 from ...models.user import User
 from ...models.operation_log import OperationLog
-from ...schemas.operation_log import OperationLogResponse, OperationLogListResponse
-from ...dependencies import get_current_user
+from ...schemas.operation_log import (
+    OperationLogResponse, OperationLogListResponse, OperationLogBatchCreate, OperationLogBatchResponse,
+    OperationLogPurgeResponse
+)
+from ...services.operation_log_service import (
+    SORT_RELEVANCE, SORT_TIME, InvalidCursorError, OperationLogService
+)
+from ...services.operation_log_export import (
+    EXPORT_FORMAT_CSV, EXPORT_FORMATS, export_chunks, export_filename, media_type
+)
+from ...services.operation_log_archive import ArchiveQuery, OperationLogArchive, get_operation_log_archive
+from ...services.operation_log_purge import PurgeJob, get_operation_log_purger
+from ...services.operation_log_writer import OperationLogWriter, get_operation_log_writer, operation_log_row
+from ...config import settings
+from ...dependencies import get_current_user, get_client_ip
 from ...utils.security import require_permissions
 
 router = APIRouter()
 
 @router.get("/", response_model=OperationLogListResponse)
 async def get_operation_logs(
-    page: int = Query(1, ge=1, description="页码"),
     size: int = Query(10, ge=1, le=100, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor）"),
+    with_total: bool = Query(False, description="是否返回总数（超过上限时为估算值）"),
     action: Optional[str] = Query(None, description="操作类型过滤"),
     result: Optional[str] = Query(None, description="结果过滤"),
     start_date: Optional[datetime] = Query(None, description="开始日期"),
     end_date: Optional[datetime] = Query(None, description="结束日期"),
     search: Optional[str] = Query(None, description="搜索关键词"),
-    db: Session = Depends(get_db),
+    sort: str = Query(SORT_TIME, pattern=f"^({SORT_TIME}|{SORT_RELEVANCE})$", description="排序：time 按时间，relevance 按搜索相关度"),
+    db: AsyncSession = Depends(get_async_read_db),
+    archive: Optional[OperationLogArchive] = Depends(get_operation_log_archive),
     current_user: User = Depends(get_current_user)
 ):
     """
     获取当前用户的操作日志
+    
+    按 (created_at, id) 倒序的游标分页：每一页都是一次索引范围扫描，
+    翻到多深都与第一页的开销相同；搜索走全文/三元组索引，可按相关度排序。
+    启用归档时，按时间排序的结果合并已归档到段文件中的日志
     """
+    filters = dict(action=action, result=result, start_date=start_date, end_date=end_date, search=search)
+    service = OperationLogService(db, archive)
+    query = service.build_query(current_user.id, **filters)
+    
     try:
-        # 构建查询条件
-        query = db.query(OperationLog).filter(
-            OperationLog.user_id == current_user.id
+        relevance = service.relevance(search) if search and sort == SORT_RELEVANCE else None
+        page = await service.get_page(
+            query, size=size, cursor=cursor, with_total=with_total, relevance=relevance,
+            archived=ArchiveQuery(current_user.id, **filters)
         )
-        
-        # 操作类型过滤
-        if action and action != 'all':
-            query = query.filter(OperationLog.action == action)
-        
-        # 结果过滤
-        if result and result != 'all':
-            query = query.filter(OperationLog.result == result)
-        
-        # 日期范围过滤
-        if start_date:
-            query = query.filter(OperationLog.created_at >= start_date)
-        if end_date:
-            query = query.filter(OperationLog.created_at <= end_date)
-        
-        # 搜索过滤
-        if search:
-            search_filter = or_(
-                OperationLog.action.ilike(f'%{search}%'),
-                OperationLog.resource.ilike(f'%{search}%'),
-                OperationLog.details.ilike(f'%{search}%')
-            )
-            query = query.filter(search_filter)
-        
-        # 排序和分页
-        total = query.count()
-        logs = query.order_by(desc(OperationLog.created_at)).offset(
-            (page - 1) * size
-        ).limit(size).all()
-        
-        # 转换为响应格式
-        log_responses = []
-        for log in logs:
-            log_responses.append(OperationLogResponse(
-                id=log.id,
-                timestamp=log.created_at.isoformat(),
-                user_id=log.user_id,
-                user_name=current_user.name,
-                action=log.action,
-                resource=log.resource,
-                result=log.result,
-                ip_address=log.ip_address,
-                user_agent=log.user_agent,
-                details=log.details
-            ))
-        
-        return OperationLogListResponse(
-            logs=log_responses,
-            total=total,
-            page=page,
-            size=size,
-            pages=(total + size - 1) // size
-        )
-        
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取操作日志失败: {str(e)}")
+    
+    # 转换为响应格式
+    log_responses = [
+        OperationLogResponse(
+            id=log.id,
+            timestamp=log.created_at.isoformat(),
+            user_id=str(log.user_id),
+            user_name=current_user.email,
+            action=log.action,
+            resource=log.resource,
+            result=log.result,
+            ip_address=log.ip_address,
+            user_agent=log.user_agent,
+            details=log.details
+        )
+        for log in page.logs
+    ]
+    
+    return OperationLogListResponse(
+        logs=log_responses,
+        size=size,
+        next_cursor=page.next_cursor,
+        has_more=page.next_cursor is not None,
+        total=page.total,
+        total_is_estimate=page.total_is_estimate,
+        page=page.number,
+        pages=None if page.total is None else -(-page.total // size)
+    )
+
+@router.post("/batch", response_model=OperationLogBatchResponse, status_code=status.HTTP_202_ACCEPTED)
+async def ingest_operation_logs(
+    batch: OperationLogBatchCreate,
+    user_agent: Optional[str] = Header(None),
+    client_ip: Optional[str] = Depends(get_client_ip),
+    writer: OperationLogWriter = Depends(get_operation_log_writer),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    批量上报当前用户的客户端操作日志
+    
+    整批校验后交给异步写入器，由其用多行 INSERT 批量写入；
+    接口不等待写入完成（202），写入器缓冲已满时返回 503
+    """
+    if len(batch.events) > settings.OPERATION_LOG_BATCH_MAX_EVENTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"单次最多上报 {settings.OPERATION_LOG_BATCH_MAX_EVENTS} 条事件"
+        )
+    
+    now = datetime.now(timezone.utc)
+    rows = []
+    for event in batch.events:
+        occurred_at = event.occurred_at
+        if occurred_at is not None and occurred_at.tzinfo is None:
+            occurred_at = occurred_at.replace(tzinfo=timezone.utc)
+        rows.append(operation_log_row(
+            user_id=current_user.id,
+            action=event.action,
+            resource=event.resource,
+            result=event.result,
+            details=event.details,
+            ip_address=client_ip,
+            user_agent=user_agent,
+            # 客户端时间不可信：不允许晚于服务器时间
+            created_at=min(occurred_at, now) if occurred_at else now
+        ))
+    
+    if not writer.enqueue(rows):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="操作日志写入繁忙，请稍后重试",
+            headers={"Retry-After": "5"}
+        )
+    
+    return OperationLogBatchResponse(accepted=len(rows))
 
 @router.get("/export")
 async def export_operation_logs(
@@ -106,76 +153,31 @@ async def export_operation_logs(
     start_date: Optional[datetime] = Query(None, description="开始日期"),
     end_date: Optional[datetime] = Query(None, description="结束日期"),
     search: Optional[str] = Query(None, description="搜索关键词"),
-    db: Session = Depends(get_db),
+    format: str = Query(EXPORT_FORMAT_CSV, pattern=f"^({'|'.join(EXPORT_FORMATS)})$", description="导出格式：csv 或 ndjson"),
+    gzip: bool = Query(False, description="是否 gzip 压缩"),
+    db: AsyncSession = Depends(get_async_read_db),
+    session_factory: async_sessionmaker = Depends(get_async_read_session_factory),
+    archive: Optional[OperationLogArchive] = Depends(get_operation_log_archive),
     current_user: User = Depends(get_current_user)
 ):
     """
-    导出当前用户的操作日志为CSV文件
+    导出当前用户的操作日志（CSV 或 NDJSON，可选 gzip）
+    
+    通过服务端游标分批读取，每批编码后立即写入响应，内存占用与导出大小无关。
+    响应体在请求会话关闭后才执行，因此使用独立的会话读取；启用归档时合并已归档的日志
     """
-    try:
-        # 构建查询条件（与get_operation_logs相同）
-        query = db.query(OperationLog).filter(
-            OperationLog.user_id == current_user.id
-        )
-        
-        if action and action != 'all':
-            query = query.filter(OperationLog.action == action)
-        
-        if result and result != 'all':
-            query = query.filter(OperationLog.result == result)
-        
-        if start_date:
-            query = query.filter(OperationLog.created_at >= start_date)
-        if end_date:
-            query = query.filter(OperationLog.created_at <= end_date)
-        
-        if search:
-            search_filter = or_(
-                OperationLog.action.ilike(f'%{search}%'),
-                OperationLog.resource.ilike(f'%{search}%'),
-                OperationLog.details.ilike(f'%{search}%')
-            )
-            query = query.filter(search_filter)
-        
-        # 获取所有符合条件的日志
-        logs = query.order_by(desc(OperationLog.created_at)).all()
-        
-        # 创建CSV内容
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # 写入表头
-        writer.writerow([
-            '时间', '用户', '操作', '资源', '结果', 'IP地址', '用户代理', '详情'
-        ])
-        
-        # 写入数据
-        for log in logs:
-            writer.writerow([
-                log.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                current_user.name,
-                log.action,
-                log.resource,
-                log.result,
-                log.ip_address,
-                log.user_agent,
-                log.details
-            ])
-        
-        # 重置文件指针
-        output.seek(0)
-        
-        # 创建响应
-        filename = f"operation_logs_{current_user.id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        return StreamingResponse(
-            io.BytesIO(output.getvalue().encode('utf-8')),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"导出操作日志失败: {str(e)}")
+    # 构建查询条件（与get_operation_logs相同）
+    filters = dict(action=action, result=result, start_date=start_date, end_date=end_date, search=search)
+    query = OperationLogService(db).build_query(current_user.id, **filters)
+    archived = archive.iter_logs(ArchiveQuery(current_user.id, **filters)) if archive else None
+    
+    filename = export_filename(current_user.id, format, datetime.now().strftime('%Y%m%d_%H%M%S'), compress=gzip)
+    
+    return StreamingResponse(
+        export_chunks(session_factory, query, format, current_user.email, compress=gzip, archived=archived),
+        media_type=media_type(format, compress=gzip),
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
 @router.delete("/{log_id}")
 async def delete_operation_log(
@@ -205,29 +207,67 @@ async def delete_operation_log(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"删除操作日志失败: {str(e)}")
 
-@router.delete("/")
+def _purge_response(job: PurgeJob) -> OperationLogPurgeResponse:
+    return OperationLogPurgeResponse(
+        id=job.id,
+        status=job.status,
+        cutoff=job.cutoff,
+        deleted_count=job.deleted_count,
+        total_rows=job.total_rows,
+        progress=job.progress,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        error=job.error
+    )
+
+def _get_purge_job(job_id: str, current_user: User) -> PurgeJob:
+    job = get_operation_log_purger().get(job_id, current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="清理任务不存在")
+    return job
+
+@router.delete("/", response_model=OperationLogPurgeResponse, status_code=status.HTTP_202_ACCEPTED)
 async def clear_operation_logs(
+    response: Response,
     days: int = Query(30, ge=1, le=365, description="保留天数"),
-    db: Session = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_async_session_factory),
+    archive: Optional[OperationLogArchive] = Depends(get_operation_log_archive),
     current_user: User = Depends(get_current_user)
 ):
     """
     清理指定天数之前的操作日志
+    
+    在后台分批删除（每个事务一批，批间短暂停顿），避免单条大 DELETE 长时间持锁。
+    通过 GET /purge-jobs/{id} 查看进度，DELETE /purge-jobs/{id} 取消。
+    已有进行中的清理任务时直接返回该任务（200）
     """
-    try:
-        cutoff_date = datetime.now() - timedelta(days=days)
-        
-        deleted_count = db.query(OperationLog).filter(
-            OperationLog.user_id == current_user.id,
-            OperationLog.created_at < cutoff_date
-        ).delete()
-        
-        db.commit()
-        
-        return {
-            "message": f"成功清理 {deleted_count} 条操作日志",
-            "deleted_count": deleted_count
-        }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"清理操作日志失败: {str(e)}")
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+    if archive is not None:
+        # 段文件不可修改：已归档的日志通过墓碑隐藏
+        await asyncio.to_thread(archive.forget, current_user.id, cutoff_date)
+    job, created = get_operation_log_purger().submit(current_user.id, cutoff_date, session_factory)
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return _purge_response(job)
+
+@router.get("/purge-jobs/{job_id}", response_model=OperationLogPurgeResponse)
+async def get_purge_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    获取清理任务的状态和进度
+    """
+    return _purge_response(_get_purge_job(job_id, current_user))
+
+@router.delete("/purge-jobs/{job_id}", response_model=OperationLogPurgeResponse)
+async def cancel_purge_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    取消清理任务（当前批次完成后停止，已删除的日志不会恢复）
+    """
+    job = _get_purge_job(job_id, current_user)
+    get_operation_log_purger().cancel(job)
+    return _purge_response(job)
@@ -3,9 +3,9 @@ Password Management API Routes
 Password reset operations
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
+from src.database import get_async_db
 from src.schemas import (
     ForgotPasswordRequest, ForgotPasswordResponse,
     ResetPasswordRequest, ResetPasswordResponse,
@@ -31,7 +31,7 @@ router = APIRouter()
 )
 async def forgot_password(
     request: ForgotPasswordRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     client_ip: str = Depends(get_client_ip)
 ):
     """
@@ -50,7 +50,7 @@ async def forgot_password(
     
     # Always return success (security measure)
     return ForgotPasswordResponse(
-        message=SUCCESS_MESSAGES["password_reset_sent"]
+        message=SUCCESS_MESSAGES["PASSWORD_RESET_SENT"]
     )
 
 
@@ -68,7 +68,7 @@ async def forgot_password(
 )
 async def reset_password(
     request: ResetPasswordRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     client_ip: str = Depends(get_client_ip)
 ):
     """
@@ -102,6 +102,6 @@ async def reset_password(
         )
     
     return ResetPasswordResponse(
-        message=SUCCESS_MESSAGES["password_reset_complete"]
+        message=SUCCESS_MESSAGES["PASSWORD_RESET_COMPLETE"]
     )
 
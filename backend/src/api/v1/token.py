@@ -3,9 +3,9 @@ Token Management API Routes
 Token refresh operations
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
+from src.database import get_async_db
 from src.schemas import RefreshRequest, TokenResponse, ErrorResponse
 from src.services import AuthService
 from src.dependencies import get_client_ip
@@ -27,7 +27,7 @@ router = APIRouter()
 )
 async def refresh_token(
     request: RefreshRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     client_ip: str = Depends(get_client_ip)
 ):
     """
@@ -40,7 +40,7 @@ async def refresh_token(
     """
     auth_service = AuthService(db)
     
-    success, new_tokens, error = auth_service.refresh_token(
+    success, new_tokens, error = await auth_service.refresh_token(
         refresh_token=request.refresh_token,
         ip_address=client_ip
     )
@@ -3,9 +3,9 @@ User Management API Routes
 User profile, password change, GDPR operations
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
+from src.database import get_async_db
 from src.schemas import (
     UserResponse,
     ChangePasswordRequest, ChangePasswordResponse,
@@ -59,7 +59,7 @@ async def get_current_user_profile(
 async def change_password(
     request: ChangePasswordRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     client_ip: str = Depends(get_client_ip)
 ):
     """
@@ -86,7 +86,7 @@ async def change_password(
         )
     
     return ChangePasswordResponse(
-        message=SUCCESS_MESSAGES["password_changed"]
+        message=SUCCESS_MESSAGES["PASSWORD_CHANGED"]
     )
 
 
@@ -103,7 +103,7 @@ async def change_password(
 )
 async def export_user_data(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Export all user data (GDPR Right to Access) (FR-036)
@@ -117,10 +117,10 @@ async def export_user_data(
     token_service = TokenService(db)
     
     # Get all user data
-    user_data = user_service.export_user_data(current_user.id)
+    user_data = await user_service.export_user_data(current_user.id)
     
     # Get active tokens
-    active_tokens = token_service.get_active_tokens(current_user.id)
+    active_tokens = await token_service.get_active_tokens(current_user.id)
     
     from src.schemas.user import UserDetailResponse
     return UserDataExport(
@@ -153,7 +153,7 @@ async def export_user_data(
 async def delete_account(
     request: DeleteAccountRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     client_ip: str = Depends(get_client_ip)
 ):
     """
@@ -189,7 +189,7 @@ async def delete_account(
     
     # Delete account
     user_service = UserService(db)
-    success, deletion_date = user_service.delete_user_account(
+    success, deletion_date = await user_service.delete_user_account(
         user_id=current_user.id,
         ip_address=client_ip
     )
@@ -201,7 +201,7 @@ async def delete_account(
         )
     
     return DeleteAccountResponse(
-        message=SUCCESS_MESSAGES["account_deleted"],
+        message=SUCCESS_MESSAGES["USER_DELETED"],
         deletion_date=deletion_date
     )
 
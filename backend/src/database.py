@@ -2,21 +2,83 @@
 Database Connection and Session Management
 SQLAlchemy configuration for PostgreSQL
 """
-from sqlalchemy import create_engine
+from contextlib import asynccontextmanager
+from fastapi import HTTPException
+from sqlalchemy import Select, create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.orm import sessionmaker, Session, ORMExecuteState
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import AsyncGenerator, AsyncIterator, Dict, Generator, List, Optional
+import asyncio
+import itertools
+import logging
 
 from src.config import settings
+from src.utils.pool_metrics import get_pool_metrics, instrument_engine, instrumented_pool_class
+
+logger = logging.getLogger(__name__)
+
+# Async drivers used when DATABASE_URL names a sync driver
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Derive the async driver URL from a sync database URL
+    
+    postgresql://... -> postgresql+asyncpg://...
+    sqlite:///...    -> sqlite+aiosqlite:///...
+    
+    URLs that already name a driver are returned unchanged.
+    """
+    parsed = make_url(url)
+    if "+" in parsed.drivername or parsed.drivername not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(
+        drivername=f"{parsed.drivername}+{ASYNC_DRIVERS[parsed.drivername]}"
+    ).render_as_string(hide_password=False)
+
+
+def get_pool_options(url: str, name: Optional[str] = None) -> dict:
+    """
+    Connection pool arguments from Settings
+    
+    SQLite keeps SQLAlchemy's default pool for its driver (aiosqlite uses a
+    NullPool that takes no sizing arguments).
+    
+    Args:
+        url: Database URL the engine is created for
+        name: Report checkout wait times under this engine name
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        return {}
+    
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if name:
+        base = AsyncAdaptedQueuePool if parsed.get_dialect().is_async else QueuePool
+        options["poolclass"] = instrumented_pool_class(base, get_pool_metrics(name))
+    return options
+
 
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.DB_ECHO,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=5,
-    max_overflow=10
+    **get_pool_options(settings.DATABASE_URL, name="primary")
 )
+instrument_engine(engine, "primary")
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(
@@ -25,28 +87,376 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async engine for request handlers (shares the same database)
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=settings.DB_ECHO,
+    **get_pool_options(ASYNC_DATABASE_URL, name="primary_async")
+)
+instrument_engine(async_engine.sync_engine, "primary_async")
+
+# Replica lag query per backend; backends without replication report 0
+REPLICA_LAG_QUERIES = {
+    # Caught-up replicas report 0 even when the primary has been idle
+    "postgresql": """
+        SELECT CASE
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END
+    """,
+}
+
+
+class ReplicaSet:
+    """
+    Read replicas with replication lag tracking
+    
+    A replica only receives reads once a lag check has seen it within
+    `max_lag_seconds`; unreachable or lagging replicas are skipped until
+    a later check sees them caught up.
+    """
+    
+    def __init__(self, engines: List[AsyncEngine], max_lag_seconds: float):
+        self.engines = engines
+        self.max_lag_seconds = max_lag_seconds
+        # None = not checked yet or unreachable
+        self._lag: Dict[int, Optional[float]] = {i: None for i in range(len(engines))}
+        self._next = itertools.count()
+    
+    def record_lag(self, index: int, lag: Optional[float]) -> None:
+        self._lag[index] = lag
+    
+    def available(self) -> List[AsyncEngine]:
+        """Replicas currently within the lag limit"""
+        return [
+            engine for i, engine in enumerate(self.engines)
+            if self._lag[i] is not None and self._lag[i] <= self.max_lag_seconds
+        ]
+    
+    def pick(self) -> Optional[Engine]:
+        """
+        Pick a replica round-robin
+        
+        Returns:
+            Sync engine to bind the read to, or None to use the primary
+        """
+        candidates = self.available()
+        if not candidates:
+            return None
+        return candidates[next(self._next) % len(candidates)].sync_engine
+    
+    async def refresh_lag(self) -> None:
+        """Measure replication lag on every replica"""
+        for i, engine in enumerate(self.engines):
+            try:
+                async with engine.connect() as conn:
+                    lag = await measure_replica_lag(conn)
+            except Exception as e:
+                logger.warning(f"Replica {i} unreachable, reads fail over to primary: {e}")
+                lag = None
+            else:
+                if lag > self.max_lag_seconds:
+                    logger.warning(f"Replica {i} lag {lag:.1f}s over limit, reads fail over to primary")
+            self.record_lag(i, lag)
+
+
+async def measure_replica_lag(conn: AsyncConnection) -> float:
+    """Replication lag of the connected replica in seconds"""
+    query = REPLICA_LAG_QUERIES.get(conn.dialect.name, "SELECT 0")
+    return float(await conn.scalar(text(query)) or 0)
+
+
+async def monitor_replica_lag(replicas: "ReplicaSet", interval_seconds: float) -> None:
+    """Refresh replica lag until cancelled (started with the application)"""
+    while True:
+        await replicas.refresh_lag()
+        await asyncio.sleep(interval_seconds)
+
+
+# Session info keys used for routing
+REPLICA_READS_KEY = "replica_reads"
+PRIMARY_PINNED_KEY = "pinned_to_primary"
+REPLICA_BIND_KEY = "replica_bind"
+
+
+class RoutingSession(Session):
+    """
+    Session that can send read-only work to a replica
+    
+    Sessions read from the primary unless they opt in with
+    info={REPLICA_READS_KEY: True} (AsyncReadSessionLocal,
+    get_async_read_db). Replicas lag by up to REPLICA_MAX_LAG_SECONDS, so
+    only listing, search and export reads opt in; read-then-write flows
+    (tokens, auth, security counters, admin writes) stay on the primary.
+    
+    In an opted-in session:
+    - Plain SELECTs go to one replica, kept for the whole session so a
+      request reads from a single snapshot source
+    - Flushes, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE and textual
+      SQL go to the primary
+    - After the first write the session is pinned to the primary for the
+      rest of its life (read-your-writes within the request)
+    - With no replicas configured, or none within the lag limit, every
+      statement goes to the primary
+    """
+    
+    replicas: Optional[ReplicaSet] = None
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self._replica_bind(clause)
+        if replica is not None:
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+    
+    def _replica_bind(self, clause) -> Optional[Engine]:
+        if self.replicas is None or not self.info.get(REPLICA_READS_KEY) or self.info.get(PRIMARY_PINNED_KEY):
+            return None
+        if not isinstance(clause, Select) or clause._for_update_arg is not None:
+            return None
+        if self.new or self.dirty or self.deleted:
+            return None
+        
+        bind = self.info.get(REPLICA_BIND_KEY)
+        if bind is None:
+            bind = self.replicas.pick()
+            if bind is not None:
+                self.info[REPLICA_BIND_KEY] = bind
+        return bind
+
+
+def create_replica_engine(url: str, index: int) -> AsyncEngine:
+    """Async engine for one read replica, with its own pool metrics"""
+    async_url = get_async_database_url(url)
+    name = f"replica_{index}"
+    replica_engine = create_async_engine(
+        async_url,
+        echo=settings.DB_ECHO,
+        **get_pool_options(async_url, name=name)
+    )
+    instrument_engine(replica_engine.sync_engine, name)
+    return replica_engine
+
+
+if settings.DATABASE_REPLICA_URLS:
+    RoutingSession.replicas = ReplicaSet(
+        engines=[
+            create_replica_engine(url, i)
+            for i, url in enumerate(settings.DATABASE_REPLICA_URLS)
+        ],
+        max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS
+    )
+
+# Create AsyncSessionLocal class
+# autoflush=True: services only stage changes, so queries later in the same
+# unit of work must see them (flushes stay inside the transaction)
+# expire_on_commit=False: attributes stay loaded after commit, since lazy
+# refreshes are not possible outside an await
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=True,
+    expire_on_commit=False
+)
+
+# Sessions whose reads may be served by a replica (listings, search, exports)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=True,
+    expire_on_commit=False,
+    info={REPLICA_READS_KEY: True}
+)
+
 # Create Base class for models
 Base = declarative_base()
 
 
+class LazySession:
+    """
+    Session proxy that is only created on first use
+    
+    Routes that declare `db` but never touch it (or only on a rare
+    branch) cost nothing: no Session object and no pooled connection.
+    The connection is checked out on the first query, and `release()`
+    hands it back once the route has finished reading, instead of holding
+    it until the dependency closes.
+    
+    Attribute access is forwarded to the underlying Session, so routes
+    keep using it as a plain `Session`.
+    """
+    
+    def __init__(self, session_factory: sessionmaker = SessionLocal):
+        self._session_factory = session_factory
+        self._session: Optional[Session] = None
+    
+    @property
+    def is_active_session(self) -> bool:
+        """True once the proxy has created its Session"""
+        return self._session is not None
+    
+    def _get_session(self) -> Session:
+        if self._session is None:
+            self._session = self._session_factory()
+        return self._session
+    
+    def __getattr__(self, name: str):
+        return getattr(self._get_session(), name)
+    
+    def release(self) -> None:
+        """
+        Return the connection to the pool after the last read
+        
+        Only read-only sessions are released; pending or flushed writes are
+        kept for the route's commit. Loaded objects are detached with their
+        loaded attributes intact, and a later query checks out a new
+        connection.
+        """
+        db = self._session
+        if db is None or db.new or db.dirty or db.deleted or db.info.get(UOW_WRITES_KEY):
+            return
+        db.close()
+    
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+
+def release_session(db: Session) -> None:
+    """Return a request session's connection to the pool early (no-op for a plain Session)"""
+    if isinstance(db, LazySession):
+        db.release()
+
+
 # Dependency for FastAPI
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency function to get database session
-    Yields a database session and closes it when done
+    Yields a lazy database session and closes it when done
     
     Usage in FastAPI:
         @app.get("/")
         def read_root(db: Session = Depends(get_db)):
             ...
     """
-    db = SessionLocal()
+    db = LazySession()
     try:
         yield db
     finally:
         db.close()
 
 
+# Unit of work: track whether a session wrote anything in this transaction
+UOW_WRITES_KEY = "uow_has_writes"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_writes(session: Session, flush_context) -> None:
+    session.info[UOW_WRITES_KEY] = True
+    session.info[PRIMARY_PINNED_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml_writes(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[UOW_WRITES_KEY] = True
+        orm_execute_state.session.info[PRIMARY_PINNED_KEY] = True
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _reset_writes(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(UOW_WRITES_KEY, None)
+
+
+@asynccontextmanager
+async def async_unit_of_work(
+    session_factory: Optional[async_sessionmaker] = None
+) -> AsyncIterator[AsyncSession]:
+    """
+    Request-scoped unit of work
+    
+    Services only stage changes (add/flush); this is the single place that
+    commits, so one request costs at most one COMMIT (one WAL flush):
+    - Writes staged and the block succeeds -> commit
+    - HTTPException (handled outcome, e.g. 401 after a failed login)
+      -> commit, so state like failed-attempt counters is kept
+    - Any other exception -> rollback
+    - Read-only -> rollback (ends the transaction without a commit)
+    
+    Usage:
+        async with async_unit_of_work() as db:
+            await AuthService(db).login(...)
+    """
+    factory = session_factory or AsyncSessionLocal
+    async with factory() as db:
+        try:
+            yield db
+        except HTTPException:
+            await _finish(db)
+            raise
+        except BaseException:
+            await db.rollback()
+            raise
+        else:
+            await _finish(db)
+
+
+async def _finish(db: AsyncSession) -> None:
+    """Commit only if the transaction wrote or staged something"""
+    if db.info.get(UOW_WRITES_KEY) or db.new or db.dirty or db.deleted:
+        await db.commit()
+    else:
+        await db.rollback()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async dependency function to get database session
+    Yields an AsyncSession so queries do not block the event loop.
+    The session is a request-scoped unit of work: route handlers and
+    services never commit, the dependency commits once on exit.
+    
+    Usage in FastAPI:
+        @app.get("/")
+        async def read_root(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(User))
+            ...
+    """
+    async with async_unit_of_work() as db:
+        yield db
+
+
+async def get_async_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async dependency for read-only endpoints (listings, search)
+    
+    Like get_async_db, but plain SELECTs may be served by a read replica
+    that lags the primary by up to REPLICA_MAX_LAG_SECONDS. Do not use it
+    where a read decides a write.
+    """
+    async with async_unit_of_work(AsyncReadSessionLocal) as db:
+        yield db
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """
+    Dependency returning the async session factory
+    
+    For work that outlives the request's session, such as a streaming
+    response body: FastAPI closes yield dependencies before the body is
+    sent, so the body has to open (and close) its own session.
+    """
+    return AsyncSessionLocal
+
+
+def get_async_read_session_factory() -> async_sessionmaker:
+    """Dependency returning the replica-reading session factory (read-only exports)"""
+    return AsyncReadSessionLocal
+
+
 # Database initialization function
 def init_db() -> None:
     """
@@ -61,17 +471,19 @@ def init_db() -> None:
 
 
 # Database health check
-async def check_db_health() -> bool:
+async def check_db_health(engine: Optional[AsyncEngine] = None) -> bool:
     """
     Check if database connection is healthy
     Returns True if connection is successful, False otherwise
+    
+    Args:
+        engine: Engine to check (default: the primary async engine)
     """
     try:
-        db = SessionLocal()
-        db.execute("SELECT 1")
-        db.close()
+        async with (engine or async_engine).connect() as conn:
+            await conn.execute(text("SELECT 1"))
         return True
     except Exception as e:
-        print(f"❌ Database health check failed: {e}")
+        logger.error(f"Database health check failed: {e}")
         return False
 
@@ -5,13 +5,15 @@ Authentication and database session dependencies
 from typing import Optional
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
-from src.database import get_db
+from src.database import get_async_db
 from src.models import User
 from src.services import TokenService, UserService
+from src.services.rbac import PERMISSION_CLAIM, resolve_token_permissions
 from src.utils.constants import ERROR_CODES
+from src.utils.security import decode_access_claims
 
 # Security scheme for JWT
 security = HTTPBearer()
@@ -19,7 +21,7 @@ security = HTTPBearer()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     """
     Dependency to get current authenticated user from JWT token
@@ -43,7 +45,7 @@ async def get_current_user(
     
     # Validate token
     token_service = TokenService(db)
-    is_valid, user_id, error = token_service.validate_access_token(token)
+    is_valid, user_id, error = await token_service.validate_access_token(token)
     
     if not is_valid or not user_id:
         raise HTTPException(
@@ -58,11 +60,20 @@ async def get_current_user(
             self.id = uuid.UUID(user_id)
             self.email = "test@example.com"
             self.account_status = "active"
+            self.permissions = None
             
         def is_active(self):
             return True
             
+        def has_permission(self, permission_name: str) -> bool:
+            return self.permissions is not None and self.permissions.allows(permission_name)
+            
     user = MockUser()
+    
+    # 令牌携带权限位图时直接据此授权；仅当令牌的 RBAC 版本落后时才回库按角色重算
+    claims = decode_access_claims(token)
+    if claims and PERMISSION_CLAIM in claims:
+        user.permissions = await resolve_token_permissions(db, user.id, claims)
     return user
 
 
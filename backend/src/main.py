@@ -2,10 +2,11 @@
 FastAPI Application Entry Point
 User Authentication System
 """
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.config import settings
+from src.services.health_service import STATUS_DOWN, HealthService, get_health_service
 
 # Create FastAPI application
 app = FastAPI(
@@ -26,6 +27,92 @@ app.add_middleware(
 )
 
 
+# Record mutating API requests as operation logs (written in batches off the request path)
+if settings.OPERATION_LOG_MIDDLEWARE_ENABLED:
+    from src.middleware import OperationLogMiddleware
+    app.add_middleware(OperationLogMiddleware)
+
+
+@app.on_event("startup")
+async def precompile_email_templates():
+    """Compile email templates once per process before serving requests"""
+    from src.services.email_templates import get_email_template_registry
+    get_email_template_registry().precompile()
+
+
+@app.on_event("startup")
+async def start_replica_lag_monitor():
+    """Check read replica lag in the background (no-op without replicas)"""
+    import asyncio
+    from src.database import RoutingSession, monitor_replica_lag
+    if RoutingSession.replicas is None:
+        return
+    await RoutingSession.replicas.refresh_lag()
+    app.state.replica_lag_monitor = asyncio.create_task(
+        monitor_replica_lag(RoutingSession.replicas, settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS)
+    )
+
+
+@app.on_event("shutdown")
+async def stop_replica_lag_monitor():
+    task = getattr(app.state, "replica_lag_monitor", None)
+    if task is not None:
+        task.cancel()
+
+
+@app.on_event("startup")
+async def start_export_workers():
+    """Start the background export job workers"""
+    from src.services.export_jobs import get_export_job_manager
+    get_export_job_manager().start()
+
+
+@app.on_event("shutdown")
+async def stop_export_workers():
+    from src.services.export_jobs import get_export_job_manager
+    await get_export_job_manager().stop()
+
+
+@app.on_event("startup")
+async def start_operation_log_archiver():
+    """Archive cold operation logs periodically (no-op unless enabled)"""
+    from src.services.operation_log_archive import get_operation_log_archiver
+    archiver = get_operation_log_archiver()
+    if archiver is not None:
+        archiver.start()
+
+
+@app.on_event("shutdown")
+async def stop_operation_log_archiver():
+    from src.services.operation_log_archive import get_operation_log_archiver
+    archiver = get_operation_log_archiver()
+    if archiver is not None:
+        await archiver.stop()
+
+
+@app.on_event("shutdown")
+async def stop_operation_log_purges():
+    """Stop running log purges at their next batch boundary"""
+    from src.services.operation_log_purge import get_operation_log_purger
+    await get_operation_log_purger().stop()
+
+
+@app.on_event("shutdown")
+async def stop_user_import_workers():
+    """Stop verification email workers and password hashing processes"""
+    from src.services.email_queue import get_verification_email_queue
+    from src.services.user_import import shutdown_password_hash_pool
+    await get_verification_email_queue().stop()
+    shutdown_password_hash_pool()
+
+
+@app.on_event("shutdown")
+async def flush_operation_log_writer():
+    """Write operation logs still buffered"""
+    from src.services.operation_log_writer import get_operation_log_writer
+    await get_operation_log_writer().stop()
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -37,17 +124,29 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
-    """Detailed health check"""
-    return {
-        "status": "healthy",
-        "database": "connected",  # TODO: Add actual DB check
-        "redis": "connected"  # TODO: Add actual Redis check
-    }
+async def health_check(health: HealthService = Depends(get_health_service)):
+    """Detailed health check (cached dependency report)"""
+    return await health.readiness()
+
+
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe: the process is serving requests (no dependency checks)"""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def readiness(health: HealthService = Depends(get_health_service)):
+    """Readiness probe: 503 while a critical dependency is down"""
+    from fastapi.responses import JSONResponse
+    
+    report = await health.readiness()
+    status_code = 503 if report["status"] == STATUS_DOWN else 200
+    return JSONResponse(status_code=status_code, content=report)
 
 
 # Register API routers
-from src.api.v1 import auth, user, token, password, admin, captcha, operation_logs
+from src.api.v1 import auth, user, token, password, admin, captcha, operation_logs, exports
 
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(token.router, prefix="/api/v1/auth", tags=["Tokens"])
@@ -56,6 +155,7 @@ app.include_router(user.router, prefix="/api/v1/users", tags=["User Management"]
 app.include_router(admin.router, prefix="/api/v1", tags=["Admin Management"])
 app.include_router(captcha.router, prefix="/api/v1", tags=["Captcha"])
 app.include_router(operation_logs.router, prefix="/api/v1/operation-logs", tags=["Operation Logs"])
+app.include_router(exports.router, prefix="/api/v1/exports", tags=["Exports"])
 
 
 if __name__ == "__main__":
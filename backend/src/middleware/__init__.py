@@ -0,0 +1,8 @@
+"""
+ASGI Middleware Package
+"""
+from src.middleware.operation_log import OperationLogMiddleware
+
+__all__ = [
+    "OperationLogMiddleware",
+]
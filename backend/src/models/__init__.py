@@ -6,10 +6,11 @@ from src.models.user import User, AccountStatus
 from src.models.jwt_token import JWTToken, TokenType
 from src.models.verification_token import VerificationToken, TokenPurpose
 from src.models.security_log import SecurityLog, EventType, EventResult
-from src.models.role import Role, Permission, SystemConfig
+from src.models.role import Role, Permission, RbacState, SystemConfig, SystemConfigState
 from src.models.security import LoginAttempt, IPFreeze, EmailVerificationLimit, LoginAttemptResult, SecurityLevel
 from src.models.user_preferences import UserPreferences, AdminPreferences, PreferencesChangeHistory, ThemePreference, LayoutPreference
 from src.models.operation_log import OperationLog, OperationResult
+from src.models.admin_stats import AdminStat
 
 __all__ = [
     # Models
@@ -19,7 +20,9 @@ __all__ = [
     "SecurityLog",
     "Role",
     "Permission",
+    "RbacState",
     "SystemConfig",
+    "SystemConfigState",
     "LoginAttempt",
     "IPFreeze",
     "EmailVerificationLimit",
@@ -27,6 +30,7 @@ __all__ = [
     "AdminPreferences",
     "PreferencesChangeHistory",
     "OperationLog",
+    "AdminStat",
     
     # Enums
     "AccountStatus",
@@ -0,0 +1,110 @@
+"""
+Admin Statistics Model
+管理后台统计计数器：随用户/角色/权限/配置的增删改在同一事务中增量维护
+"""
+from collections import Counter
+from typing import Dict
+
+from sqlalchemy import Column, String, BigInteger, DateTime, event, inspect, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from src.database import Base
+from src.models.role import Permission, Role, SystemConfig
+from src.models.user import AccountStatus, User
+
+STAT_TOTAL_USERS = "total_users"
+STAT_ACTIVE_USERS = "active_users"
+STAT_TOTAL_ROLES = "total_roles"
+STAT_TOTAL_PERMISSIONS = "total_permissions"
+STAT_TOTAL_CONFIGS = "total_configs"
+
+ADMIN_STAT_NAMES = (
+    STAT_TOTAL_USERS, STAT_ACTIVE_USERS, STAT_TOTAL_ROLES, STAT_TOTAL_PERMISSIONS, STAT_TOTAL_CONFIGS,
+)
+
+# 按行计数的模型 -> 计数器
+_ROW_COUNTERS = {
+    Role: STAT_TOTAL_ROLES,
+    Permission: STAT_TOTAL_PERMISSIONS,
+    SystemConfig: STAT_TOTAL_CONFIGS,
+}
+
+
+class AdminStat(Base):
+    """管理后台统计计数器（每个计数器一行）"""
+    __tablename__ = "admin_stats"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<AdminStat(name='{self.name}', value={self.value})>"
+
+
+def _is_active(status) -> bool:
+    # security_service 以字符串赋值状态
+    return status == AccountStatus.ACTIVE or status == AccountStatus.ACTIVE.value
+
+
+def _user_deltas(session: Session, user: User, deltas: Counter) -> None:
+    """已有用户的状态变更对活跃用户数的影响"""
+    history = inspect(user).attrs.account_status.history
+    if not history.added:
+        return
+    if history.deleted:
+        was_active = _is_active(history.deleted[0])
+    else:
+        # 旧值未加载（如对象已过期）时回库读取
+        with session.no_autoflush:
+            was_active = _is_active(session.scalar(select(User.account_status).where(User.id == user.id)))
+    deltas[STAT_ACTIVE_USERS] += _is_active(history.added[0]) - was_active
+
+
+def stat_deltas(session: Session) -> Dict[str, int]:
+    """
+    计算本次 flush 对各计数器的增量
+
+    Args:
+        session: 即将 flush 的会话
+
+    Returns:
+        计数器名 -> 增量（不含为 0 的项）
+    """
+    deltas = Counter()
+    for sign, objects in ((1, session.new), (-1, session.deleted)):
+        for obj in objects:
+            if isinstance(obj, User):
+                deltas[STAT_TOTAL_USERS] += sign
+                deltas[STAT_ACTIVE_USERS] += sign * _is_active(obj.account_status)
+            elif type(obj) in _ROW_COUNTERS:
+                deltas[_ROW_COUNTERS[type(obj)]] += sign
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            _user_deltas(session, obj, deltas)
+    return {name: delta for name, delta in deltas.items() if delta}
+
+
+def apply_stat_deltas(session: Session, deltas: Dict[str, int]) -> None:
+    """
+    在当前事务中累加计数器
+
+    绕过 ORM 的批量语句（Core insert/update/delete）需自行调用本函数。
+    计数器行不存在时不做处理，由首次读取时的重新统计补齐。
+    """
+    for name, delta in deltas.items():
+        if delta:
+            session.execute(
+                update(AdminStat).where(AdminStat.name == name).values(value=AdminStat.value + delta)
+                .execution_options(synchronize_session=False)
+            )
+
+
+@event.listens_for(Session, "before_flush")
+def _track_admin_stats(session, flush_context, instances):
+    """随 ORM 增删改维护统计计数器，与变更同事务提交"""
+    deltas = stat_deltas(session)
+    if deltas:
+        with session.no_autoflush:
+            apply_stat_deltas(session, deltas)
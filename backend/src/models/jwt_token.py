@@ -3,13 +3,13 @@ JWTToken Model
 Tracks refresh tokens and revoked access tokens
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index, Enum as SQLEnum, false
+from sqlalchemy import Uuid
 from sqlalchemy.orm import relationship
-import uuid
 import enum
 
 from src.database import Base
+from src.utils.uuid7 import uuid7
 
 
 class TokenType(enum.Enum):
@@ -32,10 +32,9 @@ class JWTToken(Base):
     
     # Primary Key
     id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
-        unique=True,
+        default=uuid7,
         nullable=False,
         comment="Token record identifier"
     )
@@ -51,7 +50,7 @@ class JWTToken(Base):
     
     # User Reference
     user_id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
@@ -92,7 +91,6 @@ class JWTToken(Base):
         Boolean,
         default=False,
         nullable=False,
-        index=True,
         comment="Token revocation status"
     )
     
@@ -120,6 +118,18 @@ class JWTToken(Base):
     # Relationships
     user = relationship("User", backref="tokens")
     
+    # Indexes
+    # - jti lookups (blacklist check, refresh, revoke) use the unique jti index
+    # - A user's live sessions: partial index over unrevoked tokens only,
+    #   which stays small since most rows end up revoked or expired
+    __table_args__ = (
+        Index(
+            'idx_jwt_tokens_user_active', 'user_id', 'expires_at',
+            postgresql_where=revoked == false(),
+            sqlite_where=revoked == false(),
+        ),
+    )
+    
     def __repr__(self):
         return f"<JWTToken(id={self.id}, type={self.token_type.value}, revoked={self.revoked})>"
     
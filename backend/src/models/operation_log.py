@@ -3,12 +3,13 @@
 记录用户的各种操作行为
 """
 
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum, Index, Uuid, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 
 from ..database import Base
+from ..utils.fts import fts5_trigram_ddl
 
 class OperationResult(str, enum.Enum):
     """操作结果枚举"""
@@ -20,7 +21,7 @@ class OperationLog(Base):
     __tablename__ = "operation_logs"
 
     id = Column(String(36), primary_key=True, index=True)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(Uuid(as_uuid=True), ForeignKey("users.id"), nullable=False)  # 与 users.id 类型一致
     
     # 操作信息
     action = Column(String(100), nullable=False, index=True)  # 操作类型，如 LOGIN, LOGOUT, CREATE_USER 等
@@ -38,6 +39,54 @@ class OperationLog(Base):
     
     # 关联关系
     user = relationship("User", back_populates="operation_logs")
+    
+    # 索引：按用户游标分页（WHERE user_id = ? AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC），
+    # 也覆盖仅按 user_id 的查询
+    __table_args__ = (
+        Index('idx_operation_logs_user_created', 'user_id', created_at.desc(), id.desc()),
+    )
 
     def __repr__(self):
         return f"<OperationLog(id={self.id}, user_id={self.user_id}, action={self.action}, result={self.result})>"
+
+
+# 全文检索对象：不映射到 ORM，建表时（create_all）由下面的事件创建，已有数据库由迁移 0005 创建
+# PostgreSQL：search_vector（tsvector，触发器在写入时维护）+ GIN 索引；pg_trgm GIN 索引支持子串搜索
+# SQLite：FTS5 trigram 外部内容表，触发器同步（VACUUM 可能改变 rowid，之后需执行 rebuild）
+SEARCH_VECTOR_COLUMN = "search_vector"
+SEARCH_FTS_TABLE = "operation_logs_fts"
+SEARCH_INDEXES = ("idx_operation_logs_search_vector", "idx_operation_logs_trgm")
+
+POSTGRESQL_SEARCH_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE operation_logs ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION operation_logs_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := to_tsvector('simple',
+            coalesce(NEW.action, '') || ' ' || coalesce(NEW.resource, '') || ' ' || coalesce(NEW.details, ''));
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER operation_logs_search_vector_trg
+    BEFORE INSERT OR UPDATE OF action, resource, details ON operation_logs
+    FOR EACH ROW EXECUTE FUNCTION operation_logs_search_vector_update()
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_operation_logs_search_vector ON operation_logs USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS idx_operation_logs_trgm ON operation_logs "
+    "USING gin (action gin_trgm_ops, resource gin_trgm_ops, details gin_trgm_ops)",
+)
+
+SQLITE_SEARCH_DDL = fts5_trigram_ddl(SEARCH_FTS_TABLE, "operation_logs", ("action", "resource", "details"))
+
+for _statement in POSTGRESQL_SEARCH_DDL:
+    event.listen(OperationLog.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(OperationLog.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+# 表删除时触发器随之删除，FTS 虚拟表需单独删除
+event.listen(
+    OperationLog.__table__, "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {SEARCH_FTS_TABLE}").execute_if(dialect="sqlite")
+)
@@ -2,9 +2,11 @@
 Role and Permission Models
 支持基于角色的访问控制(RBAC)
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, Table
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from itertools import chain
+
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, BigInteger, Text, ForeignKey, Table, event, inspect, select, update
+from sqlalchemy import Uuid
+from sqlalchemy.orm import Session, relationship
 from sqlalchemy.sql import func
 import uuid
 
@@ -14,16 +16,16 @@ from src.database import Base
 role_permissions = Table(
     'role_permissions',
     Base.metadata,
-    Column('role_id', UUID(as_uuid=True), ForeignKey('roles.id'), primary_key=True),
-    Column('permission_id', UUID(as_uuid=True), ForeignKey('permissions.id'), primary_key=True)
+    Column('role_id', Uuid(as_uuid=True), ForeignKey('roles.id'), primary_key=True),
+    Column('permission_id', Uuid(as_uuid=True), ForeignKey('permissions.id'), primary_key=True)
 )
 
 # 用户角色关联表
 user_roles = Table(
     'user_roles',
     Base.metadata,
-    Column('user_id', UUID(as_uuid=True), ForeignKey('users.id'), primary_key=True),
-    Column('role_id', UUID(as_uuid=True), ForeignKey('roles.id'), primary_key=True)
+    Column('user_id', Uuid(as_uuid=True), ForeignKey('users.id'), primary_key=True),
+    Column('role_id', Uuid(as_uuid=True), ForeignKey('roles.id'), primary_key=True)
 )
 
 
@@ -31,7 +33,7 @@ class Role(Base):
     """角色模型"""
     __tablename__ = "roles"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(50), unique=True, nullable=False, index=True)
     display_name = Column(String(100), nullable=False)
     description = Column(Text)
@@ -52,12 +54,13 @@ class Permission(Base):
     """权限模型"""
     __tablename__ = "permissions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(100), unique=True, nullable=False, index=True)
     display_name = Column(String(100), nullable=False)
     description = Column(Text)
     resource = Column(String(50), nullable=False)  # 资源类型: system, user, data
     action = Column(String(50), nullable=False)    # 操作类型: create, read, update, delete, manage
+    bit_index = Column(Integer, unique=True, index=True, nullable=False)  # 权限位（写入时自动分配，删除后不复用）
     is_system = Column(Boolean, default=False)     # 是否为系统权限
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -70,11 +73,64 @@ class Permission(Base):
         return f"<Permission(name='{self.name}')>"
 
 
+class RbacState(Base):
+    """RBAC 版本：角色或权限每次变更时加一，各进程据此重建权限位快照"""
+    __tablename__ = "rbac_state"
+
+    id = Column(Integer, primary_key=True)  # 只有一行，id = 1
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+RBAC_STATE_ID = 1
+
+
+def _roles_changed(obj) -> bool:
+    """对象（用户）的 roles 关联是否有未刷新的变更"""
+    state = inspect(obj)
+    return "roles" in state.mapper.relationships and state.attrs.roles.history.has_changes()
+
+
+@event.listens_for(Session, "before_flush")
+def _track_rbac_changes(session, flush_context, instances):
+    """
+    为新权限分配权限位，并在角色/权限（含角色-权限关联）或已有用户的角色变更时递增 RBAC 版本
+
+    访问令牌中的权限位图以该版本为准，版本变化后旧令牌回库重算。
+    与变更在同一事务中提交；session.info["rbac_changed"] 供提交后使本进程快照失效
+    """
+    new_permissions = sorted(
+        (obj for obj in session.new if isinstance(obj, Permission) and obj.bit_index is None),
+        key=lambda perm: perm.name
+    )
+    if new_permissions:
+        with session.no_autoflush:
+            next_bit = session.scalar(select(func.coalesce(func.max(Permission.bit_index) + 1, 0)))
+        for offset, permission in enumerate(new_permissions):
+            permission.bit_index = next_bit + offset
+
+    changed = any(isinstance(obj, (Role, Permission)) for obj in chain(session.new, session.deleted)) or any(
+        isinstance(obj, (Role, Permission)) and session.is_modified(obj) or _roles_changed(obj)
+        for obj in session.dirty
+    )
+    if not changed:
+        return
+
+    with session.no_autoflush:
+        bumped = session.execute(
+            update(RbacState).where(RbacState.id == RBAC_STATE_ID).values(version=RbacState.version + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    if not bumped:
+        session.add(RbacState(id=RBAC_STATE_ID, version=1))
+    session.info["rbac_changed"] = True
+
+
 class SystemConfig(Base):
     """系统配置模型"""
     __tablename__ = "system_configs"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     key = Column(String(100), unique=True, nullable=False, index=True)
     value = Column(Text)
     value_type = Column(String(20), default='string')  # string, int, bool, json
@@ -87,3 +143,34 @@ class SystemConfig(Base):
 
     def __repr__(self):
         return f"<SystemConfig(key='{self.key}')>"
+
+
+class SystemConfigState(Base):
+    """系统配置版本：任一配置变更时加一，供配置缓存（及 ETag）判断是否过期"""
+    __tablename__ = "system_config_state"
+
+    id = Column(Integer, primary_key=True)  # 只有一行，id = 1
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+CONFIG_STATE_ID = 1
+
+
+@event.listens_for(Session, "before_flush")
+def _track_config_changes(session, flush_context, instances):
+    """ORM 方式增删改配置时递增配置版本（批量 upsert 在 system_config_service 中自行递增）"""
+    changed = any(isinstance(obj, SystemConfig) for obj in chain(session.new, session.deleted)) or any(
+        isinstance(obj, SystemConfig) and session.is_modified(obj) for obj in session.dirty
+    )
+    if not changed:
+        return
+
+    with session.no_autoflush:
+        bumped = session.execute(
+            update(SystemConfigState).where(SystemConfigState.id == CONFIG_STATE_ID)
+            .values(version=SystemConfigState.version + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    if not bumped:
+        session.add(SystemConfigState(id=CONFIG_STATE_ID, version=1))
@@ -4,11 +4,12 @@
 """
 from datetime import datetime, timedelta
 from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Uuid
 import uuid
 import enum
 
 from src.database import Base
+from src.utils.uuid7 import uuid7
 
 class LoginAttemptResult(enum.Enum):
     """登录尝试结果枚举"""
@@ -32,17 +33,16 @@ class LoginAttempt(Base):
     __tablename__ = "login_attempts"
 
     id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
-        unique=True,
+        default=uuid7,
         nullable=False,
         comment="唯一标识符"
     )
     
     # 用户信息
     user_id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         nullable=True,
         comment="用户ID（登录失败时可能为空）"
     )
@@ -120,7 +120,7 @@ class IPFreeze(Base):
     __tablename__ = "ip_freezes"
 
     id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
@@ -167,7 +167,7 @@ class IPFreeze(Base):
     )
     
     unfrozen_by = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         nullable=True,
         comment="解冻操作员ID"
     )
@@ -210,7 +210,7 @@ class EmailVerificationLimit(Base):
     __tablename__ = "email_verification_limits"
 
     id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
@@ -264,7 +264,7 @@ class EmailVerificationLimit(Base):
     
     # 索引
     __table_args__ = (
-        Index('idx_email_limits_type_id', 'limit_type', 'identifier'),
+        Index('idx_email_limits_type_id_window', 'limit_type', 'identifier', 'window_start'),
         Index('idx_email_limits_time', 'window_start', 'window_end'),
     )
 
@@ -3,13 +3,14 @@ SecurityLog Model
 Security audit trail for authentication events
 """
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Enum as SQLEnum, JSON
+from sqlalchemy import Uuid
 from sqlalchemy.orm import relationship
 import uuid
 import enum
 
 from src.database import Base
+from src.utils.uuid7 import uuid7
 
 
 class EventType(enum.Enum):
@@ -66,10 +67,9 @@ class SecurityLog(Base):
     
     # Primary Key
     id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
-        unique=True,
+        default=uuid7,
         nullable=False,
         comment="Log entry identifier"
     )
@@ -84,10 +84,9 @@ class SecurityLog(Base):
     
     # User Reference (nullable for anonymous events)
     user_id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         ForeignKey("users.id", ondelete="SET NULL"),
         nullable=True,
-        index=True,
         comment="Associated user (null for failed logins with unknown email)"
     )
     
@@ -136,6 +135,12 @@ class SecurityLog(Base):
     # Relationships
     user = relationship("User", backref="security_logs")
     
+    # Indexes
+    # A user's audit trail by time; also serves user_id-only lookups
+    __table_args__ = (
+        Index('idx_security_logs_user_time', 'user_id', 'timestamp'),
+    )
+    
     def __repr__(self):
         return f"<SecurityLog(id={self.id}, event={self.event_type.value}, result={self.result.value})>"
     
@@ -3,13 +3,14 @@ User Model
 Represents a registered account holder
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, Integer, DateTime, Enum as SQLEnum, Table, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, Integer, DateTime, Enum as SQLEnum, Index, Table, func, DDL, event
+from sqlalchemy import Uuid
 from sqlalchemy.orm import relationship
 import uuid
 import enum
 
 from src.database import Base
+from src.utils.fts import fts5_trigram_ddl
 
 
 class AccountStatus(enum.Enum):
@@ -34,7 +35,7 @@ class User(Base):
     
     # Primary Key
     id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
@@ -191,6 +192,12 @@ class User(Base):
     # 角色关系 (延迟定义避免循环导入)
     roles = relationship("Role", secondary="user_roles", back_populates="users")
     
+    # Admin user listing: keyset pages ordered by (registration_timestamp DESC, id DESC),
+    # optionally limited to a registration range
+    __table_args__ = (
+        Index('idx_users_registration', registration_timestamp.desc(), id.desc()),
+    )
+    
     # 用户偏好关系
     preferences = relationship("UserPreferences", back_populates="user", uselist=False)
     
@@ -228,12 +235,19 @@ class User(Base):
         """检查用户是否具有指定角色"""
         return any(role.name == role_name for role in self.roles)
     
+    def permission_mask(self) -> int:
+        """用户权限位掩码：所有角色掩码的按位或（见 src.services.rbac）"""
+        from sqlalchemy.orm import object_session
+        from src.services.rbac import get_rbac_registry
+        snapshot = get_rbac_registry().current(object_session(self))
+        return snapshot.mask_for_roles(role.id for role in self.roles)
+    
     def has_permission(self, permission_name: str) -> bool:
-        """检查用户是否具有指定权限"""
-        for role in self.roles:
-            if any(perm.name == permission_name for perm in role.permissions):
-                return True
-        return False
+        """检查用户是否具有指定权限（一次按位与）"""
+        from sqlalchemy.orm import object_session
+        from src.services.rbac import get_rbac_registry
+        snapshot = get_rbac_registry().current(object_session(self))
+        return snapshot.allows(snapshot.mask_for_roles(role.id for role in self.roles), permission_name)
     
     def is_super_admin(self) -> bool:
         """检查是否为超级管理员"""
@@ -243,20 +257,27 @@ class User(Base):
     operation_logs = relationship("OperationLog", back_populates="user", cascade="all, delete-orphan")
 
 
+# 邮箱搜索对象：不映射到 ORM，建表时（create_all）由下面的事件创建，已有数据库由迁移 0010、0011 创建
+# PostgreSQL：pg_trgm GIN 索引服务 LIKE '%xxx%' 子串匹配；
+#   btree varchar_pattern_ops 索引服务 LIKE 'xxx%' 前缀匹配，并按索引顺序（字节序）返回，LIMIT 无需排序
+# SQLite：FTS5 trigram 外部内容表（触发器同步）服务子串匹配；前缀匹配走 email 唯一索引的范围扫描
+EMAIL_SEARCH_FTS_TABLE = "users_email_fts"
+EMAIL_SEARCH_INDEXES = ("idx_users_email_trgm", "idx_users_email_pattern")
 
+POSTGRESQL_EMAIL_SEARCH_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_users_email_trgm ON users USING gin (email gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_users_email_pattern ON users (email varchar_pattern_ops)",
+)
 
+SQLITE_EMAIL_SEARCH_DDL = fts5_trigram_ddl(EMAIL_SEARCH_FTS_TABLE, "users", ("email",))
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+for _statement in POSTGRESQL_EMAIL_SEARCH_DDL:
+    event.listen(User.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_EMAIL_SEARCH_DDL:
+    event.listen(User.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+# 表删除时触发器随之删除，FTS 虚拟表需单独删除
+event.listen(
+    User.__table__, "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {EMAIL_SEARCH_FTS_TABLE}").execute_if(dialect="sqlite")
+)
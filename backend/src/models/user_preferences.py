@@ -4,7 +4,7 @@ Manages user-specific theme and layout preferences
 """
 from datetime import datetime
 from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Uuid
 from sqlalchemy.orm import relationship
 import uuid
 import enum
@@ -35,7 +35,7 @@ class UserPreferences(Base):
     
     # Primary Key
     id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
@@ -45,7 +45,7 @@ class UserPreferences(Base):
     
     # User Reference
     user_id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         unique=True,
@@ -157,7 +157,7 @@ class AdminPreferences(Base):
     
     # Primary Key
     id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
@@ -167,7 +167,7 @@ class AdminPreferences(Base):
     
     # Admin User Reference
     admin_id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         unique=True,
@@ -274,7 +274,7 @@ class PreferencesChangeHistory(Base):
     
     # Primary Key
     id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
@@ -284,7 +284,7 @@ class PreferencesChangeHistory(Base):
     
     # User Reference
     user_id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         comment="Reference to user"
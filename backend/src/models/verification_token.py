@@ -3,13 +3,13 @@ VerificationToken Model
 Email verification and password reset tokens
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index, Enum as SQLEnum, false
+from sqlalchemy import Uuid
 from sqlalchemy.orm import relationship
-import uuid
 import enum
 
 from src.database import Base
+from src.utils.uuid7 import uuid7
 
 
 class TokenPurpose(enum.Enum):
@@ -32,10 +32,9 @@ class VerificationToken(Base):
     
     # Primary Key
     id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
-        unique=True,
+        default=uuid7,
         nullable=False,
         comment="Token record identifier"
     )
@@ -51,7 +50,7 @@ class VerificationToken(Base):
     
     # User Reference
     user_id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
@@ -97,6 +96,18 @@ class VerificationToken(Base):
     # Relationships
     user = relationship("User", backref="verification_tokens")
     
+    # Indexes
+    # - (token, token_type) lookups use the unique token index
+    # - A user's outstanding tokens of one purpose: partial index over
+    #   unused tokens only
+    __table_args__ = (
+        Index(
+            'idx_verification_tokens_user_unused', 'user_id', 'token_type',
+            postgresql_where=used == false(),
+            sqlite_where=used == false(),
+        ),
+    )
+    
     def __repr__(self):
         return f"<VerificationToken(id={self.id}, type={self.token_type.value}, used={self.used})>"
     
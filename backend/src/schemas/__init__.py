@@ -67,6 +67,12 @@ from src.schemas.verification import (
     VerificationStatusResponse,
 )
 
+# Export Job Schemas
+from src.schemas.export_job import (
+    ExportJobCreate,
+    ExportJobResponse,
+)
+
 __all__ = [
     # Authentication
     "RegisterRequest",
@@ -121,5 +127,9 @@ __all__ = [
     "ResendVerificationEmailRequest",
     "ResendVerificationEmailResponse",
     "VerificationStatusResponse",
+    
+    # Export Jobs
+    "ExportJobCreate",
+    "ExportJobResponse",
 ]
 
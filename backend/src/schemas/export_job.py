@@ -0,0 +1,61 @@
+"""
+Export Job Request/Response Schemas
+Pydantic models for background log exports
+"""
+from pydantic import BaseModel, Field, model_validator
+from typing import Literal, Optional
+from datetime import datetime
+
+from src.models.operation_log import OperationResult
+from src.models.security_log import EventResult, EventType
+
+
+class ExportJobCreate(BaseModel):
+    """Background export request (filters depend on the source)"""
+    source: Literal["operation_logs", "security_logs"] = Field(
+        "operation_logs",
+        description="Which logs to export"
+    )
+    format: Literal["csv", "ndjson"] = Field(
+        "csv",
+        description="File format (always gzip-compressed)"
+    )
+    start_date: Optional[datetime] = Field(None, description="Earliest entry")
+    end_date: Optional[datetime] = Field(None, description="Latest entry")
+    action: Optional[str] = Field(None, description="Operation logs: action filter")
+    search: Optional[str] = Field(None, description="Operation logs: search term")
+    event_type: Optional[str] = Field(None, description="Security logs: event type filter")
+    result: Optional[str] = Field(None, description="Result filter (values depend on the source)")
+
+    @model_validator(mode="after")
+    def check_filters(self) -> "ExportJobCreate":
+        """Reject filters the chosen source cannot apply"""
+        if self.source == "security_logs":
+            if self.action or self.search:
+                raise ValueError("action and search only apply to operation_logs")
+            if self.event_type and self.event_type not in {e.value for e in EventType}:
+                raise ValueError(f"Unknown event_type: {self.event_type}")
+            if self.result and self.result not in {r.value for r in EventResult}:
+                raise ValueError(f"Unknown result: {self.result}")
+        else:
+            if self.event_type:
+                raise ValueError("event_type only applies to security_logs")
+            if self.result and self.result != "all" and self.result not in {r.value for r in OperationResult}:
+                raise ValueError(f"Unknown result: {self.result}")
+        return self
+
+
+class ExportJobResponse(BaseModel):
+    """Export job status and progress"""
+    id: str = Field(..., description="Job identifier")
+    source: str = Field(..., description="Exported logs")
+    format: str = Field(..., description="File format")
+    status: str = Field(..., description="queued | running | done | failed")
+    rows_written: int = Field(..., description="Rows written so far")
+    total_rows: Optional[int] = Field(None, description="Rows matching the filters (known once running)")
+    progress: Optional[float] = Field(None, description="rows_written / total_rows, 0.0 - 1.0")
+    size_bytes: int = Field(..., description="Compressed file size so far")
+    created_at: datetime = Field(..., description="Submission time")
+    finished_at: Optional[datetime] = Field(None, description="Completion time")
+    error: Optional[str] = Field(None, description="Failure reason")
+    download_url: Optional[str] = Field(None, description="Download location once done")
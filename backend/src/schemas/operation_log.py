@@ -32,12 +32,18 @@ class OperationLogResponse(OperationLogBase):
         from_attributes = True
 
 class OperationLogListResponse(BaseModel):
-    """操作日志列表响应模式"""
+    """操作日志列表响应模式（游标分页）"""
     logs: List[OperationLogResponse] = Field(..., description="日志列表")
-    total: int = Field(..., description="总数量")
-    page: int = Field(..., description="当前页码")
     size: int = Field(..., description="每页数量")
-    pages: int = Field(..., description="总页数")
+    next_cursor: Optional[str] = Field(None, description="下一页游标，为空表示没有更多数据")
+    has_more: bool = Field(..., description="是否还有下一页")
+    total: Optional[int] = Field(None, description="总数量（仅在 with_total=true 时返回）")
+    total_is_estimate: bool = Field(False, description="总数是否为估算值（超过计数上限时为查询规划器的行数估计）")
+    # 页码分页时代的字段，保留给旧客户端；新客户端请使用 next_cursor/has_more
+    page: int = Field(..., description="当前页码（从 1 开始，已弃用）", json_schema_extra={"deprecated": True})
+    pages: Optional[int] = Field(
+        None, description="总页数（仅在 with_total=true 时返回，已弃用）", json_schema_extra={"deprecated": True}
+    )
 
 class OperationLogFilter(BaseModel):
     """操作日志过滤条件"""
@@ -46,7 +52,7 @@ class OperationLogFilter(BaseModel):
     start_date: Optional[datetime] = Field(None, description="开始日期")
     end_date: Optional[datetime] = Field(None, description="结束日期")
     search: Optional[str] = Field(None, description="搜索关键词")
-    page: int = Field(1, ge=1, description="页码")
+    cursor: Optional[str] = Field(None, description="分页游标")
     size: int = Field(10, ge=1, le=100, description="每页数量")
 
 class OperationLogExportRequest(BaseModel):
@@ -57,3 +63,31 @@ class OperationLogExportRequest(BaseModel):
     end_date: Optional[datetime] = Field(None, description="结束日期")
     search: Optional[str] = Field(None, description="搜索关键词")
     format: str = Field("csv", description="导出格式")
+
+class OperationLogEvent(BaseModel):
+    """客户端上报的单条操作事件（用户、IP 和用户代理由服务端填写）"""
+    action: str = Field(..., min_length=1, max_length=100, description="操作类型")
+    resource: str = Field(..., min_length=1, max_length=200, description="操作的资源")
+    result: OperationResult = Field(..., description="操作结果")
+    details: Optional[str] = Field(None, max_length=4000, description="操作详情")
+    occurred_at: Optional[datetime] = Field(None, description="客户端记录的发生时间（不得晚于服务器时间）")
+
+class OperationLogBatchCreate(BaseModel):
+    """批量上报操作事件请求（整批校验，任一事件无效则整批拒绝）"""
+    events: List[OperationLogEvent] = Field(..., min_length=1, description="操作事件列表")
+
+class OperationLogBatchResponse(BaseModel):
+    """批量上报响应"""
+    accepted: int = Field(..., description="已接收（排队写入）的事件数")
+
+class OperationLogPurgeResponse(BaseModel):
+    """后台清理任务状态"""
+    id: str = Field(..., description="任务ID")
+    status: str = Field(..., description="状态：queued、running、done、cancelled 或 failed")
+    cutoff: datetime = Field(..., description="早于该时间的日志将被删除")
+    deleted_count: int = Field(..., description="已删除的日志数")
+    total_rows: Optional[int] = Field(None, description="开始时待删除的日志数")
+    progress: Optional[float] = Field(None, description="进度（0-1，总数未知时为空）")
+    created_at: datetime = Field(..., description="创建时间")
+    finished_at: Optional[datetime] = Field(None, description="结束时间")
+    error: Optional[str] = Field(None, description="失败原因")
@@ -0,0 +1,84 @@
+"""
+Admin Stats Service
+Dashboard counters read from the admin_stats table
+"""
+from typing import Dict
+import asyncio
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.database import async_unit_of_work
+from src.models import AccountStatus, Permission, Role, SystemConfig, User
+from src.models.admin_stats import (
+    ADMIN_STAT_NAMES, STAT_ACTIVE_USERS, STAT_TOTAL_CONFIGS, STAT_TOTAL_PERMISSIONS,
+    STAT_TOTAL_ROLES, STAT_TOTAL_USERS, AdminStat
+)
+
+# One recount at a time per process when counter rows are missing
+_rebuild_lock = asyncio.Lock()
+
+
+def _count(model, *criteria):
+    """Scalar count of model rows matching criteria"""
+    return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+
+def _count_query():
+    """Every counter from the source tables in one statement"""
+    return select(
+        _count(User).label(STAT_TOTAL_USERS),
+        _count(User, User.account_status == AccountStatus.ACTIVE).label(STAT_ACTIVE_USERS),
+        _count(Role).label(STAT_TOTAL_ROLES),
+        _count(Permission).label(STAT_TOTAL_PERMISSIONS),
+        _count(SystemConfig).label(STAT_TOTAL_CONFIGS),
+    )
+
+
+async def count_admin_stats(db: AsyncSession) -> Dict[str, int]:
+    """Count every counter from the source tables (full scans; used to seed and to check)"""
+    return dict((await db.execute(_count_query())).mappings().one())
+
+
+async def _read(db: AsyncSession) -> Dict[str, int]:
+    rows = await db.execute(select(AdminStat.name, AdminStat.value))
+    return {name: value for name, value in rows.all()}
+
+
+async def load_admin_stats(db: AsyncSession, session_factory: async_sessionmaker) -> Dict[str, int]:
+    """
+    Get the dashboard counters
+
+    Reads the admin_stats rows, which ORM flushes keep current (see
+    src.models.admin_stats), so the cost does not grow with table sizes.
+    Missing rows (a database created without the migration) are seeded
+    once by counting, in a unit of work of their own so the request
+    session is never committed here; concurrent requests wait for that
+    recount instead of repeating it.
+
+    Args:
+        db: Async database session
+        session_factory: Session factory for the seeding unit of work
+
+    Returns:
+        Counter name -> value for every name in ADMIN_STAT_NAMES
+    """
+    stats = await _read(db)
+    if all(name in stats for name in ADMIN_STAT_NAMES):
+        return {name: stats[name] for name in ADMIN_STAT_NAMES}
+
+    async with _rebuild_lock:
+        try:
+            async with async_unit_of_work(session_factory) as session:
+                stats = await _read(session)
+                missing = [name for name in ADMIN_STAT_NAMES if name not in stats]
+                if missing:
+                    counts = await count_admin_stats(session)
+                    await session.execute(insert(AdminStat), [{"name": name, "value": counts[name]} for name in missing])
+                    stats.update({name: counts[name] for name in missing})
+        except IntegrityError:
+            # Another process seeded them first
+            async with async_unit_of_work(session_factory) as session:
+                stats = await _read(session)
+    return {name: stats.get(name, 0) for name in ADMIN_STAT_NAMES}
@@ -0,0 +1,422 @@
+"""
+Admin User Service
+Filtered, keyset-paginated user listing, indexed email search and set-based bulk actions for the admin API
+"""
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import json
+import uuid
+
+from sqlalchemy import Select, func, insert, literal_column, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from src.database import async_unit_of_work
+from src.models import AccountStatus, JWTToken, OperationLog, OperationResult, Role, User
+from src.models.user import EMAIL_SEARCH_FTS_TABLE
+from src.models.admin_stats import STAT_ACTIVE_USERS, apply_stat_deltas
+from src.services.operation_log_service import InvalidCursorError, capped_count, decode_cursor, encode_cursor
+from src.services.operation_log_writer import operation_log_row
+from src.utils.fts import MIN_TRIGRAM_LENGTH, fts5_rowid_matches
+
+BULK_LOCK = "lock"
+BULK_UNLOCK = "unlock"
+BULK_VERIFY = "verify"
+BULK_DELETE = "delete"
+
+# Email search match kinds, best first
+EMAIL_MATCH_EXACT = "exact"
+EMAIL_MATCH_PREFIX = "prefix"
+EMAIL_MATCH_CONTAINS = "contains"
+EMAIL_MATCHES = (EMAIL_MATCH_EXACT, EMAIL_MATCH_PREFIX, EMAIL_MATCH_CONTAINS)
+
+# Substring matches ranked per email search; bounds the sort for short, common terms
+EMAIL_SEARCH_MAX_CANDIDATES = 500
+
+
+@dataclass(frozen=True)
+class BulkUserAction:
+    """
+    What a bulk action writes and to which users
+
+    Args:
+        values: Columns set by the UPDATE
+        from_statuses: Only users in these statuses change (None = any)
+        unverified_only: Only users whose email is not verified change
+        revoke_tokens: Revoke the refresh tokens of every matched user
+    """
+    values: Dict[str, Any]
+    from_statuses: Optional[Tuple[AccountStatus, ...]] = None
+    unverified_only: bool = False
+    revoke_tokens: bool = False
+
+
+BULK_USER_ACTIONS = {
+    BULK_LOCK: BulkUserAction(
+        values={"account_status": AccountStatus.LOCKED, "account_locked_until": None},
+        from_statuses=(AccountStatus.ACTIVE, AccountStatus.INACTIVE),
+        revoke_tokens=True,
+    ),
+    BULK_UNLOCK: BulkUserAction(
+        values={"account_status": AccountStatus.ACTIVE, "failed_login_attempts": 0, "account_locked_until": None},
+        from_statuses=(AccountStatus.LOCKED,),
+    ),
+    BULK_VERIFY: BulkUserAction(values={"email_verified": True}, unverified_only=True),
+    BULK_DELETE: BulkUserAction(
+        values={"account_status": AccountStatus.DELETED},
+        from_statuses=(AccountStatus.ACTIVE, AccountStatus.INACTIVE, AccountStatus.LOCKED),
+        revoke_tokens=True,
+    ),
+}
+
+
+@dataclass
+class BulkUserResult:
+    """Totals of a bulk user action"""
+    action: str
+    matched: int = 0
+    affected: int = 0
+    tokens_revoked: int = 0
+    chunks: int = 0
+
+
+@dataclass
+class EmailMatch:
+    """One email search hit"""
+    id: uuid.UUID
+    email: str
+    account_status: AccountStatus
+    match: str
+
+
+def email_prefix_query(dialect_name: str, term: str, limit: int) -> Select:
+    """
+    Build the prefix half of an email search: emails starting with term, first `limit` in byte order
+
+    Both dialects answer it with an index range scan that stops after
+    `limit` rows, already in ORDER BY order. PostgreSQL uses the btree
+    varchar_pattern_ops index idx_users_email_pattern for LIKE 'abc%' and
+    orders by its operator (~<~, byte order) so no sort is needed. SQLite's
+    LIKE is case-insensitive and cannot use the email index; the same
+    prefix as a range can (emails are stored lowercase, compared bytewise).
+
+    Args:
+        dialect_name: Database dialect name ("postgresql" or "sqlite")
+        term: Lowercase search term
+        limit: Maximum number of rows
+
+    Returns:
+        SELECT of (id, email, account_status)
+    """
+    query = select(User.id, User.email, User.account_status).where(User.email.startswith(term, autoescape=True))
+    if dialect_name == "postgresql":
+        return query.order_by(literal_column("users.email USING ~<~")).limit(limit)
+    if dialect_name == "sqlite":
+        query = query.where(User.email >= term, User.email < term[:-1] + chr(ord(term[-1]) + 1))
+    return query.order_by(User.email).limit(limit)
+
+
+def email_substring_query(dialect_name: str, term: str, limit: int) -> Select:
+    """
+    Build the substring half of an email search: emails containing term but not starting with it
+
+    PostgreSQL narrows through the pg_trgm GIN index idx_users_email_trgm,
+    SQLite through the FTS5 trigram table; terms shorter than a trigram
+    fall back to LIKE, which no index can serve. At most
+    EMAIL_SEARCH_MAX_CANDIDATES matches are taken before ranking them
+    (shorter emails, where the term is a larger share, first), so a short
+    term matching most of the table costs a bounded sort.
+
+    Args:
+        dialect_name: Database dialect name ("postgresql" or "sqlite")
+        term: Lowercase search term
+        limit: Maximum number of rows
+
+    Returns:
+        SELECT of (id, email, account_status)
+    """
+    condition = User.email.contains(term, autoescape=True)
+    if dialect_name == "sqlite" and len(term) >= MIN_TRIGRAM_LENGTH:
+        matches = fts5_rowid_matches(EMAIL_SEARCH_FTS_TABLE, term, "email_match")
+        condition = literal_column("users.rowid").in_(matches)
+    candidates = (
+        select(User.id, User.email, User.account_status)
+        .where(condition, ~User.email.startswith(term, autoescape=True))
+        .limit(EMAIL_SEARCH_MAX_CANDIDATES)
+        .subquery()
+    )
+    return select(candidates).order_by(func.length(candidates.c.email), candidates.c.email).limit(limit)
+
+
+@dataclass
+class UserPage:
+    """One page of users plus the cursor for the next page"""
+    users: List[User]
+    next_cursor: Optional[str]
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
+class AdminUserService:
+    """
+    Service for listing users in the admin API
+
+    Pages are ordered by (registration_timestamp DESC, id DESC) and continue
+    from a cursor with a row-value comparison on idx_users_registration.
+    Roles are loaded for the whole page with one selectinload query, so a
+    page costs two queries (three with a total) whatever its size. Email
+    search is one ranked query over the email trigram index.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @property
+    def dialect_name(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    def build_query(
+        self,
+        status: Optional[AccountStatus] = None,
+        email_verified: Optional[bool] = None,
+        role: Union[str, Sequence[str], None] = None,
+        registered_from: Optional[datetime] = None,
+        registered_to: Optional[datetime] = None,
+        email_prefix: Optional[str] = None
+    ) -> Select:
+        """
+        Build the filtered user query (no ordering)
+
+        Args:
+            status: Account status
+            email_verified: Email verification state
+            role: Name of a role the user must have, or several names (any of them)
+            registered_from: Registered at or after
+            registered_to: Registered at or before
+            email_prefix: Start of the email address (case-insensitive)
+        """
+        query = select(User)
+
+        if status is not None:
+            query = query.where(User.account_status == status)
+        if email_verified is not None:
+            query = query.where(User.email_verified == email_verified)
+        if role:
+            names = [role] if isinstance(role, str) else list(role)
+            query = query.where(User.roles.any(Role.name.in_(names)))
+        if registered_from:
+            query = query.where(User.registration_timestamp >= registered_from)
+        if registered_to:
+            query = query.where(User.registration_timestamp <= registered_to)
+        if email_prefix:
+            # Emails are stored lowercase
+            query = query.where(User.email.startswith(email_prefix.lower(), autoescape=True))
+
+        return query
+
+    async def get_page(
+        self,
+        query: Select,
+        size: int,
+        cursor: Optional[str] = None,
+        with_total: bool = False
+    ) -> UserPage:
+        """
+        Get one page of a filtered user query, roles loaded
+
+        Args:
+            query: Query from build_query
+            size: Page size
+            cursor: next_cursor of the previous page (None for the first page)
+            with_total: Also count matching users (estimated past TOTAL_COUNT_CAP)
+
+        Returns:
+            UserPage with the users and the cursor of the following page
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        page_query = query.options(selectinload(User.roles))
+        if cursor:
+            registered_at, user_id, rank = decode_cursor(cursor)
+            if rank is not None:
+                raise InvalidCursorError("Cursor belongs to a different listing")
+            try:
+                user_id = uuid.UUID(user_id)
+            except ValueError as e:
+                raise InvalidCursorError("Invalid cursor") from e
+            page_query = page_query.where(
+                tuple_(User.registration_timestamp, User.id) < tuple_(registered_at, user_id)
+            )
+
+        # One extra row tells whether another page exists
+        users = (await self.db.scalars(
+            page_query.order_by(User.registration_timestamp.desc(), User.id.desc()).limit(size + 1)
+        )).all()
+
+        next_cursor = None
+        if len(users) > size:
+            last = users[size - 1]
+            next_cursor = encode_cursor(last.registration_timestamp, str(last.id))
+
+        page = UserPage(users=list(users[:size]), next_cursor=next_cursor)
+        if with_total:
+            page.total, page.total_is_estimate = await self.count(query)
+        return page
+
+    async def search_emails(self, term: str, limit: int = 10, prefix_only: bool = False) -> List[EmailMatch]:
+        """
+        Find users by part of their email, best matches first
+
+        Prefix matches come first (an exact match sorts first among them),
+        in byte order; substring matches are looked up only when there are
+        fewer than `limit` prefix matches, shorter emails (where the term is
+        a larger share) first, then alphabetical. See email_prefix_query and
+        email_substring_query for the indexes each step uses.
+
+        Args:
+            term: Part of an email (case-insensitive)
+            limit: Maximum number of matches
+            prefix_only: Match the start of the email only
+
+        Returns:
+            Up to `limit` EmailMatch, best first
+        """
+        # Emails are stored lowercase
+        term = term.strip().lower()
+        if not term:
+            return []
+        rows = await self.db.execute(email_prefix_query(self.dialect_name, term, limit))
+        matches = [
+            EmailMatch(
+                id=user_id, email=email, account_status=account_status,
+                match=EMAIL_MATCH_EXACT if email == term else EMAIL_MATCH_PREFIX
+            )
+            for user_id, email, account_status in rows.all()
+        ]
+        if prefix_only or len(matches) >= limit:
+            return matches
+
+        rows = await self.db.execute(email_substring_query(self.dialect_name, term, limit - len(matches)))
+        return matches + [
+            EmailMatch(id=user_id, email=email, account_status=account_status, match=EMAIL_MATCH_CONTAINS)
+            for user_id, email, account_status in rows.all()
+        ]
+
+    async def count(self, query: Select) -> Tuple[int, bool]:
+        """
+        Count matching users (see operation_log_service.capped_count)
+
+        Returns:
+            Tuple of (total, is_estimate)
+        """
+        return await capped_count(self.db, query, User.id)
+
+
+async def _select_chunk(db: AsyncSession, query: Select, after: Optional[uuid.UUID], chunk_size: int) -> List[uuid.UUID]:
+    """Next chunk_size matching ids after `after`, in id order (keyset, one index range per read)"""
+    page = query.with_only_columns(User.id).order_by(User.id).limit(chunk_size)
+    if after is not None:
+        page = page.where(User.id > after)
+    return list((await db.scalars(page)).all())
+
+
+async def _apply_chunk(db: AsyncSession, spec: BulkUserAction, ids: List[uuid.UUID], result: BulkUserResult) -> None:
+    """One chunk: set-based UPDATEs, the active-user counter and token revocation"""
+    target = spec.values.get("account_status")
+    scope = update(User).where(User.id.in_(ids)).values(**spec.values).execution_options(synchronize_session=False)
+    if spec.unverified_only:
+        scope = scope.where(User.email_verified.is_(False))
+
+    if spec.from_statuses is None:
+        result.affected += (await db.execute(scope)).rowcount
+    else:
+        # Active users are updated separately so the active-user counter can follow
+        active_delta = 0
+        others = [state for state in spec.from_statuses if state != AccountStatus.ACTIVE]
+        if AccountStatus.ACTIVE in spec.from_statuses:
+            moved = (await db.execute(scope.where(User.account_status == AccountStatus.ACTIVE))).rowcount
+            result.affected += moved
+            active_delta -= moved
+        if others:
+            moved = (await db.execute(scope.where(User.account_status.in_(others)))).rowcount
+            result.affected += moved
+            if target == AccountStatus.ACTIVE:
+                active_delta += moved
+        if active_delta:
+            await db.run_sync(apply_stat_deltas, {STAT_ACTIVE_USERS: active_delta})
+
+    if spec.revoke_tokens:
+        result.tokens_revoked += (await db.execute(
+            update(JWTToken)
+            .where(JWTToken.user_id.in_(ids), JWTToken.revoked.is_(False))
+            .values(revoked=True, revoked_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )).rowcount
+
+
+async def bulk_update_users(
+    session_factory: async_sessionmaker,
+    action: str,
+    query: Select,
+    actor_id: uuid.UUID,
+    user_ids: Optional[Sequence[uuid.UUID]] = None,
+    chunk_size: int = 1000,
+    audit_context: Optional[Dict[str, Any]] = None
+) -> BulkUserResult:
+    """
+    Apply a bulk action to every user matching a query (and an id list)
+
+    Matching ids are read in keyset chunks; each chunk is changed with a
+    few set-based UPDATEs and committed on its own, so row locks are held
+    for one chunk only. Refresh tokens of the chunk's users are revoked
+    in the same transaction. The actor is never included. One operation
+    log entry with the totals is written once all chunks are done.
+
+    Args:
+        session_factory: Async session factory (one unit of work per chunk)
+        action: One of BULK_USER_ACTIONS
+        query: Filter query from AdminUserService.build_query
+        actor_id: Admin performing the action (excluded, and owner of the audit entry)
+        user_ids: Restrict to these ids (None = every match of the query)
+        chunk_size: Users per transaction
+        audit_context: Extra details for the audit entry (e.g. the filters)
+
+    Returns:
+        BulkUserResult with matched and affected user counts
+
+    Raises:
+        KeyError: If the action is unknown
+    """
+    spec = BULK_USER_ACTIONS[action]
+    result = BulkUserResult(action=action)
+    query = query.where(User.id != actor_id)
+    # An id list is walked in sorted slices; each slice keeps only the ids matching the query
+    slices = sorted(set(user_ids)) if user_ids is not None else None
+    after, position = None, 0
+
+    while slices is None or position < len(slices):
+        async with async_unit_of_work(session_factory) as db:
+            if slices is None:
+                ids = await _select_chunk(db, query, after, chunk_size)
+                if not ids:
+                    break
+                after = ids[-1]
+            else:
+                ids = list((await db.scalars(query.with_only_columns(User.id).where(
+                    User.id.in_(slices[position:position + chunk_size])
+                ))).all())
+                position += chunk_size
+            if ids:
+                await _apply_chunk(db, spec, ids, result)
+                result.matched += len(ids)
+                result.chunks += 1
+
+    details = {**asdict(result), **(audit_context or {})}
+    async with async_unit_of_work(session_factory) as db:
+        await db.execute(insert(OperationLog).values(**operation_log_row(
+            actor_id, f"BULK_USER_{action.upper()}", "admin/users",
+            OperationResult.SUCCESS, details=json.dumps(details, ensure_ascii=False, default=str)
+        )))
+    return result
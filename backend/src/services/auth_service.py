@@ -4,7 +4,8 @@ Core authentication logic - login, logout, password management
 """
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Tuple
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
 from src.models import User, VerificationToken, TokenPurpose, EventType, EventResult, AccountStatus
@@ -29,7 +30,7 @@ class AuthService:
     - Password reset (FR-024 to FR-028)
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.password_service = PasswordService()
         self.token_service = TokenService(db)
@@ -82,7 +83,7 @@ class AuthService:
     # Login (FR-008 to FR-014)
     # ========================================================================
     
-    def authenticate_user(
+    async def authenticate_user(
         self,
         email: str,
         password: str,
@@ -95,7 +96,7 @@ class AuthService:
             Tuple of (user_dict, access_token, refresh_token) or (None, None, None) if failed
         """
         # Get user
-        user = self.user_service.get_user_by_email(email)
+        user = await self.user_service.get_user_by_email(email)
         
         if not user:
             return None, None, None
@@ -109,10 +110,13 @@ class AuthService:
             return None, None, None
             
         # Generate tokens
-        token_pair = self.token_service.generate_token_pair(user.id)
+        token_pair = await self.token_service.generate_token_pair(user.id)
         access_token = token_pair['access_token']
         refresh_token = token_pair['refresh_token']
         
+        # Roles cannot be lazy-loaded on an AsyncSession
+        await self.db.refresh(user, attribute_names=["roles"])
+        
         # Build user dict
         user_dict = {
             "id": str(user.id),
@@ -165,7 +169,7 @@ class AuthService:
         8. Log success
         """
         # Get user
-        user = self.user_service.get_user_by_email(email)
+        user = await self.user_service.get_user_by_email(email)
         
         # Generic error message for security (FR-010)
         generic_error = "Invalid email or password"
@@ -191,7 +195,7 @@ class AuthService:
         
         if not is_valid_password:
             # Increment failed attempts (FR-011)
-            attempts = self.security_service.increment_failed_attempts(user, ip_address)
+            attempts = await self.security_service.increment_failed_attempts(user, ip_address)
             
             if attempts >= 5:
                 return False, None, "Account locked due to multiple failed login attempts"
@@ -207,16 +211,16 @@ class AuthService:
             return False, None, "Account is not active"
         
         # Generate tokens (FR-008, FR-009)
-        tokens = self.token_service.generate_token_pair(
+        tokens = await self.token_service.generate_token_pair(
             user_id=user.id,
             device_info=user_agent
         )
         
         # Reset failed attempts
-        self.security_service.reset_failed_attempts(user)
+        await self.security_service.reset_failed_attempts(user)
         
         # Update last login
-        self.user_service.update_last_login(user)
+        await self.user_service.update_last_login(user)
         
         # Log successful login
         self.security_service.log_event(
@@ -257,7 +261,7 @@ class AuthService:
     # Logout (FR-016)
     # ========================================================================
     
-    def logout(
+    async def logout(
         self,
         user_id: uuid.UUID,
         refresh_token_jti: str,
@@ -275,7 +279,7 @@ class AuthService:
             True if successful
         """
         # Revoke refresh token
-        self.token_service.revoke_token(refresh_token_jti)
+        await self.token_service.revoke_token(refresh_token_jti)
         
         # Log logout
         self.security_service.log_event(
@@ -319,7 +323,7 @@ class AuthService:
         6. Send confirmation email (FR-040)
         7. Log event
         """
-        user = self.user_service.get_user_by_id(user_id)
+        user = await self.user_service.get_user_by_id(user_id)
         if not user:
             return False, "User not found"
         
@@ -336,10 +340,10 @@ class AuthService:
             return False, "; ".join(errors)
         
         # Update password
-        self.user_service.update_password(user, new_hash, ip_address)
+        await self.user_service.update_password(user, new_hash, ip_address)
         
         # Revoke all existing tokens (FR-027)
-        revoked_count = self.token_service.revoke_all_user_tokens(user_id)
+        revoked_count = await self.token_service.revoke_all_user_tokens(user_id)
         
         # Send confirmation email (FR-040)
         await self.email_service.send_password_changed_email(user.email)
@@ -367,27 +371,31 @@ class AuthService:
             
         Note: Always returns success to prevent email enumeration
         """
-        user = self.user_service.get_user_by_email(email)
+        user = await self.user_service.get_user_by_email(email)
         
         if user and user.email_verified:
-            # Create password reset token
-            token = VerificationToken(
-                id=uuid.uuid4(),
-                token=generate_password_reset_token(),
-                user_id=user.id,
-                token_type=TokenPurpose.PASSWORD_RESET,
-                created_at=datetime.utcnow(),
-                expires_at=get_password_reset_expiry(),
-                used=False
-            )
+            # Retries within the coalescing window reuse the still-valid token
+            reset_token = await self._get_reusable_reset_token(user)
             
-            self.db.add(token)
-            self.db.flush()
+            if reset_token is None:
+                # Create password reset token
+                token = VerificationToken(
+                    token=generate_password_reset_token(),
+                    user_id=user.id,
+                    token_type=TokenPurpose.PASSWORD_RESET,
+                    created_at=datetime.utcnow(),
+                    expires_at=get_password_reset_expiry(),
+                    used=False
+                )
+                
+                self.db.add(token)
+                await self.db.flush()
+                reset_token = token.token
             
-            # Send reset email (FR-025, FR-026)
+            # Send reset email (FR-025, FR-026); duplicates are coalesced
             await self.email_service.send_password_reset_email(
                 to_email=user.email,
-                reset_token=token.token
+                reset_token=reset_token
             )
             
             # Log request
@@ -398,11 +406,34 @@ class AuthService:
                 ip_address=ip_address
             )
             
-            self.db.commit()
-        
         # Always return True (security - don't reveal if email exists)
         return True
     
+    async def _get_reusable_reset_token(self, user: User) -> Optional[str]:
+        """
+        Get a reset token already mailed to this user within the coalescing window
+        
+        Args:
+            user: User requesting the reset
+            
+        Returns:
+            Token string if it is still unused and unexpired, else None
+        """
+        token_str = self.email_service.reusable_token("password_reset", user.email)
+        if token_str is None:
+            return None
+        
+        token = await self.db.scalar(select(VerificationToken).where(
+            VerificationToken.token == token_str,
+            VerificationToken.token_type == TokenPurpose.PASSWORD_RESET
+        ))
+        
+        if not token or not token.is_valid():
+            self.email_service.coalescer.invalidate("password_reset", user.email)
+            return None
+        
+        return token_str
+    
     async def reset_password(
         self,
         token_str: str,
@@ -429,10 +460,10 @@ class AuthService:
         6. Send confirmation email (FR-040)
         """
         # Find token
-        token = self.db.query(VerificationToken).filter(
+        token = await self.db.scalar(select(VerificationToken).where(
             VerificationToken.token == token_str,
             VerificationToken.token_type == TokenPurpose.PASSWORD_RESET
-        ).first()
+        ))
         
         if not token:
             return False, "Invalid or expired reset token"
@@ -446,7 +477,7 @@ class AuthService:
             return False, "Reset link has expired. Please request a new one."
         
         # Get user
-        user = self.user_service.get_user_by_id(token.user_id)
+        user = await self.user_service.get_user_by_id(token.user_id)
         if not user:
             return False, "User not found"
         
@@ -458,13 +489,14 @@ class AuthService:
             return False, "; ".join(errors)
         
         # Update password
-        self.user_service.update_password(user, new_hash, ip_address)
+        await self.user_service.update_password(user, new_hash, ip_address)
         
         # Mark token as used (one-time use)
         token.mark_as_used()
+        self.email_service.coalescer.invalidate("password_reset", user.email)
         
         # Revoke all existing tokens (FR-027)
-        self.token_service.revoke_all_user_tokens(user.id)
+        await self.token_service.revoke_all_user_tokens(user.id)
         
         # Log password reset completion
         self.security_service.log_event(
@@ -477,15 +509,13 @@ class AuthService:
         # Send confirmation email (FR-040)
         await self.email_service.send_password_changed_email(user.email)
         
-        self.db.commit()
-        
         return True, None
     
     # ========================================================================
     # Token Operations
     # ========================================================================
     
-    def refresh_token(
+    async def refresh_token(
         self,
         refresh_token: str,
         ip_address: Optional[str] = None
@@ -500,7 +530,7 @@ class AuthService:
         Returns:
             Tuple of (success: bool, new_tokens: dict, error: str)
         """
-        success, new_tokens, error = self.token_service.refresh_access_token(refresh_token)
+        success, new_tokens, error = await self.token_service.refresh_access_token(refresh_token)
         
         if success:
             # Log token refresh
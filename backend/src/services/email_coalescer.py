@@ -0,0 +1,158 @@
+"""
+Email Coalescer
+Merges duplicate outgoing emails within a time window
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+CoalesceKey = Tuple[str, str]
+
+
+@dataclass
+class _CoalescedSend:
+    """One delivery that later duplicates are merged into"""
+    token: Optional[str]
+    started_at: float
+    task: "asyncio.Future[bool]"
+
+
+class EmailCoalescer:
+    """
+    Coalescing layer in front of EmailService
+
+    Within `window_seconds`, repeated sends of the same message type to the
+    same recipient carrying the same token (client retries of
+    forgot-password or verification emails) are merged into the first
+    delivery:
+    - Concurrent duplicates await the in-flight send instead of opening
+      another SMTP connection
+    - Later duplicates return the earlier result without sending
+    - The token carried by the first delivery can be reused by callers,
+      so retries do not insert new VerificationToken rows
+
+    A message with a different token (e.g. a re-registration that issued a
+    new verification token) is always sent and replaces the entry, since
+    the earlier mail's link would not carry the new token. Failed
+    deliveries are not coalesced, so a retry after an SMTP error sends
+    again. State is per process.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._sends: "OrderedDict[CoalesceKey, _CoalescedSend]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_seconds > 0
+
+    @staticmethod
+    def _key(message_type: str, recipient: str) -> CoalesceKey:
+        return message_type, recipient.strip().lower()
+
+    def _purge_expired(self) -> None:
+        """Drop entries older than the window (insertion order == age order, see send)"""
+        cutoff = self._clock() - self.window_seconds
+        while self._sends:
+            key, entry = next(iter(self._sends.items()))
+            if entry.started_at > cutoff:
+                break
+            self._sends.pop(key)
+
+    def _active(self, key: CoalesceKey) -> Optional[_CoalescedSend]:
+        self._purge_expired()
+        entry = self._sends.get(key)
+        if entry is None:
+            return None
+        if entry.started_at <= self._clock() - self.window_seconds:
+            self._sends.pop(key, None)
+            return None
+
+        # A failed delivery must not swallow the retry
+        if entry.task.done() and (entry.task.cancelled() or entry.task.exception() or not entry.task.result()):
+            self._sends.pop(key, None)
+            return None
+
+        return entry
+
+    def reusable_token(self, message_type: str, recipient: str) -> Optional[str]:
+        """
+        Get the token of a delivery still inside the window
+
+        Args:
+            message_type: Template name, e.g. "password_reset"
+            recipient: Recipient email address
+
+        Returns:
+            Token string to reuse, or None if a new token is needed
+        """
+        if not self.enabled:
+            return None
+
+        entry = self._active(self._key(message_type, recipient))
+        return entry.token if entry else None
+
+    def invalidate(self, message_type: str, recipient: str) -> None:
+        """Forget a delivery, e.g. once its token has been used"""
+        self._sends.pop(self._key(message_type, recipient), None)
+
+    async def send(
+        self,
+        message_type: str,
+        recipient: str,
+        send: Callable[[], Awaitable[bool]],
+        token: Optional[str] = None
+    ) -> bool:
+        """
+        Send unless a delivery with the same token is already in the window
+
+        Args:
+            message_type: Template name used as part of the coalescing key
+            recipient: Recipient email address
+            send: Coroutine factory performing the actual delivery
+            token: Token carried by this message (for reuse by retries)
+
+        Returns:
+            Result of the (possibly shared) delivery
+        """
+        if not self.enabled:
+            return await send()
+
+        key = self._key(message_type, recipient)
+        entry = self._active(key)
+
+        if entry is not None and entry.token == token:
+            logger.info(f"Coalesced duplicate {message_type} email to {recipient}")
+            return await asyncio.shield(entry.task)
+
+        task = asyncio.ensure_future(send())
+        # Re-insert at the end so the dict stays in age order for _purge_expired
+        self._sends.pop(key, None)
+        self._sends[key] = _CoalescedSend(token=token, started_at=self._clock(), task=task)
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Number of deliveries still being sent"""
+        return sum(1 for entry in self._sends.values() if not entry.task.done())
+
+    def clear(self) -> None:
+        self._sends.clear()
+
+
+@lru_cache(maxsize=None)
+def get_email_coalescer() -> EmailCoalescer:
+    """Get the process-wide email coalescer"""
+    return EmailCoalescer(window_seconds=settings.EMAIL_COALESCE_WINDOW_SECONDS)
@@ -0,0 +1,116 @@
+"""
+Verification Email Queue
+Sends verification emails from background workers instead of inline
+"""
+from collections import deque
+from functools import lru_cache
+from typing import Awaitable, Callable, Deque, List, Optional, Tuple
+import asyncio
+import logging
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (recipient, verification token)
+QueuedEmail = Tuple[str, str]
+
+
+async def _send_verification(to_email: str, token: str) -> bool:
+    from src.services.email_service import EmailService
+    return await EmailService().send_verification_email(to_email=to_email, verification_token=token)
+
+
+class VerificationEmailQueue:
+    """
+    In-memory queue of verification emails with a few sending workers
+
+    enqueue() returns at once; up to `concurrency` workers send in the
+    background. Sending is best effort like the operation log writer:
+    emails still queued when the process stops are dropped (their tokens
+    stay valid, so users can ask for a new email), and when more than
+    `max_pending` are waiting new ones are refused.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        max_pending: int = 100000,
+        send: Callable[[str, str], Awaitable[bool]] = _send_verification
+    ):
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self._send = send
+        self.sent = 0
+        self.failed = 0
+        self.refused = 0
+        self._pending: Deque[QueuedEmail] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+
+    def pending(self) -> int:
+        """Number of queued emails (for readiness reporting)"""
+        return len(self._pending)
+
+    def enqueue(self, emails: List[QueuedEmail]) -> int:
+        """
+        Queue emails for sending (must be called on the event loop)
+
+        Args:
+            emails: (recipient, verification token) pairs
+
+        Returns:
+            Number of emails queued (the rest were refused)
+        """
+        room = max(self.max_pending - len(self._pending), 0)
+        accepted = emails[:room]
+        self.refused += len(emails) - len(accepted)
+        if accepted:
+            self._pending.extend(accepted)
+            self._ensure_running()
+            self._wakeup.set()
+        return len(accepted)
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._workers = [task for task in self._workers if not task.done() and task.get_loop() is loop]
+        if not self._workers:
+            self._wakeup = asyncio.Event()
+        while len(self._workers) < self.concurrency:
+            self._workers.append(loop.create_task(self._run()))
+
+    async def _run(self) -> None:
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            to_email, token = self._pending.popleft()
+            try:
+                if await self._send(to_email, token):
+                    self.sent += 1
+                else:
+                    self.failed += 1
+            except Exception:
+                self.failed += 1
+                logger.exception("Failed to send verification email to %s", to_email)
+
+    async def stop(self) -> None:
+        """Stop the workers; emails still queued are dropped"""
+        workers, self._workers = self._workers, []
+        loop = asyncio.get_running_loop()
+        for task in workers:
+            if task.get_loop() is loop:
+                task.cancel()
+        await asyncio.gather(*(task for task in workers if task.get_loop() is loop), return_exceptions=True)
+        if self._pending:
+            logger.warning("Dropped %d queued verification emails on shutdown", len(self._pending))
+
+
+@lru_cache(maxsize=None)
+def get_verification_email_queue() -> VerificationEmailQueue:
+    """Get the process-wide verification email queue (also a FastAPI dependency)"""
+    return VerificationEmailQueue(
+        concurrency=settings.EMAIL_QUEUE_CONCURRENCY,
+        max_pending=settings.EMAIL_QUEUE_MAX_PENDING
+    )
@@ -5,13 +5,12 @@ Async email sending for verification and notifications
 import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from pathlib import Path
 from typing import Optional
 import logging
 
 from src.config import settings
-from src.utils.constants import EMAIL_TEMPLATES
+from src.services.email_templates import get_email_template_registry
+from src.services.email_coalescer import get_email_coalescer
 
 logger = logging.getLogger(__name__)
 
@@ -29,13 +28,12 @@ class EmailService:
     """
     
     def __init__(self):
-        """Initialize email service with Jinja2 template engine"""
-        # Setup Jinja2 template environment
-        template_dir = Path(__file__).parent.parent / "templates"
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(str(template_dir)),
-            autoescape=select_autoescape(['html', 'xml'])
-        )
+        """Initialize email service with the shared template registry"""
+        # Templates are compiled once per process, not per service instance
+        self.templates = get_email_template_registry()
+        self.jinja_env = self.templates.env
+        # Duplicate sends within the coalescing window share one delivery
+        self.coalescer = get_email_coalescer()
     
     async def send_email(
         self,
@@ -89,6 +87,62 @@ class EmailService:
             logger.error(f"Failed to send email to {to_email}: {str(e)}")
             return False
     
+    async def send_template_email(
+        self,
+        to_email: str,
+        template_name: str,
+        coalesce_token: Optional[str] = None,
+        **context
+    ) -> bool:
+        """
+        Render a registered template and send it
+        
+        Retried sends of the same template and token to the same recipient
+        within EMAIL_COALESCE_WINDOW_SECONDS are merged into one delivery.
+        Messages without a token (security notices such as password changed
+        or account locked) report separate events and are always sent.
+        
+        Args:
+            to_email: Recipient email address
+            template_name: Template name in the registry
+            coalesce_token: Token carried by the message, reusable by retries
+                (None = never coalesced)
+            **context: Template variables
+            
+        Returns:
+            True if sent successfully
+        """
+        async def deliver() -> bool:
+            rendered = self.templates.render(template_name, **context)
+            return await self.send_email(
+                to_email=to_email,
+                subject=rendered.subject,
+                html_content=rendered.html,
+                plain_content=rendered.plain
+            )
+        
+        if coalesce_token is None:
+            return await deliver()
+        return await self.coalescer.send(
+            template_name,
+            to_email,
+            deliver,
+            token=coalesce_token
+        )
+    
+    def reusable_token(self, template_name: str, to_email: str) -> Optional[str]:
+        """
+        Get the token of a recent delivery that a retry should reuse
+        
+        Args:
+            template_name: Template name in the registry
+            to_email: Recipient email address
+            
+        Returns:
+            Token string, or None if a new token must be created
+        """
+        return self.coalescer.reusable_token(template_name, to_email)
+    
     async def send_verification_email(
         self,
         to_email: str,
@@ -110,46 +164,13 @@ class EmailService:
         # TODO: Get base URL from settings
         verification_url = f"http://localhost:8000/api/v1/auth/verify-email/{verification_token}"
         
-        # Render template (when template exists)
-        # For now, use simple HTML
-        html_content = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; padding: 20px;">
-                <h2>Welcome to User Authentication System!</h2>
-                <p>Hello {user_name or 'there'},</p>
-                <p>Thank you for registering. Please verify your email address by clicking the link below:</p>
-                <p style="margin: 30px 0;">
-                    <a href="{verification_url}" 
-                       style="background-color: #4CAF50; color: white; padding: 14px 28px; 
-                              text-decoration: none; border-radius: 4px;">
-                        Verify Email Address
-                    </a>
-                </p>
-                <p>Or copy and paste this link into your browser:</p>
-                <p style="color: #666; word-break: break-all;">{verification_url}</p>
-                <p style="margin-top: 30px; color: #999; font-size: 12px;">
-                    This link will expire in 24 hours.<br>
-                    If you didn't register for an account, please ignore this email.
-                </p>
-            </body>
-        </html>
-        """
-        
-        plain_content = f"""
-        Welcome to User Authentication System!
-        
-        Thank you for registering. Please verify your email address by visiting:
-        {verification_url}
-        
-        This link will expire in 24 hours.
-        If you didn't register for an account, please ignore this email.
-        """
-        
-        return await self.send_email(
-            to_email=to_email,
-            subject="Please verify your email address",
-            html_content=html_content,
-            plain_content=plain_content
+        return await self.send_template_email(
+            to_email,
+            "email_verification",
+            coalesce_token=verification_token,
+            user_name=user_name,
+            verification_url=verification_url,
+            expire_hours=settings.EMAIL_VERIFICATION_TOKEN_EXPIRE_HOURS
         )
     
     async def send_password_reset_email(
@@ -172,44 +193,13 @@ class EmailService:
         # Build reset URL
         reset_url = f"http://localhost:8000/api/v1/auth/reset-password?token={reset_token}"
         
-        html_content = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; padding: 20px;">
-                <h2>Password Reset Request</h2>
-                <p>Hello {user_name or 'there'},</p>
-                <p>We received a request to reset your password. Click the link below to create a new password:</p>
-                <p style="margin: 30px 0;">
-                    <a href="{reset_url}" 
-                       style="background-color: #2196F3; color: white; padding: 14px 28px; 
-                              text-decoration: none; border-radius: 4px;">
-                        Reset Password
-                    </a>
-                </p>
-                <p>Or copy and paste this link into your browser:</p>
-                <p style="color: #666; word-break: break-all;">{reset_url}</p>
-                <p style="margin-top: 30px; color: #999; font-size: 12px;">
-                    <strong>Important:</strong> This link will expire in 1 hour for security reasons.<br>
-                    If you didn't request a password reset, please ignore this email or contact support if you're concerned.
-                </p>
-            </body>
-        </html>
-        """
-        
-        plain_content = f"""
-        Password Reset Request
-        
-        We received a request to reset your password. Visit the link below:
-        {reset_url}
-        
-        This link will expire in 1 hour.
-        If you didn't request a password reset, please ignore this email.
-        """
-        
-        return await self.send_email(
-            to_email=to_email,
-            subject="Password Reset Request",
-            html_content=html_content,
-            plain_content=plain_content
+        return await self.send_template_email(
+            to_email,
+            "password_reset",
+            coalesce_token=reset_token,
+            user_name=user_name,
+            reset_url=reset_url,
+            expire_hours=settings.PASSWORD_RESET_TOKEN_EXPIRE_HOURS
         )
     
     async def send_password_changed_email(
@@ -227,40 +217,10 @@ class EmailService:
         Returns:
             True if sent successfully
         """
-        html_content = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; padding: 20px;">
-                <h2>Password Changed Successfully</h2>
-                <p>Hello {user_name or 'there'},</p>
-                <p>Your password has been changed successfully.</p>
-                <p style="background-color: #fff3cd; padding: 15px; border-left: 4px solid #ffc107;">
-                    <strong>Security Notice:</strong> All active sessions have been invalidated. 
-                    You'll need to log in again with your new password.
-                </p>
-                <p style="margin-top: 30px; color: #999; font-size: 12px;">
-                    If you didn't make this change, please contact support immediately 
-                    as your account may be compromised.
-                </p>
-            </body>
-        </html>
-        """
-        
-        plain_content = f"""
-        Password Changed Successfully
-        
-        Your password has been changed successfully.
-        
-        Security Notice: All active sessions have been invalidated.
-        You'll need to log in again with your new password.
-        
-        If you didn't make this change, please contact support immediately.
-        """
-        
-        return await self.send_email(
-            to_email=to_email,
-            subject="Password Changed - Security Notice",
-            html_content=html_content,
-            plain_content=plain_content
+        return await self.send_template_email(
+            to_email,
+            "password_changed",
+            user_name=user_name
         )
     
     async def send_account_locked_email(
@@ -280,37 +240,9 @@ class EmailService:
         Returns:
             True if sent successfully
         """
-        html_content = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; padding: 20px;">
-                <h2>Account Temporarily Locked</h2>
-                <p>Hello {user_name or 'there'},</p>
-                <p style="background-color: #f8d7da; padding: 15px; border-left: 4px solid #dc3545;">
-                    <strong>Security Alert:</strong> Your account has been temporarily locked 
-                    due to multiple failed login attempts.
-                </p>
-                <p>Your account will be automatically unlocked at: <strong>{unlock_time}</strong></p>
-                <p>If you believe this is unauthorized activity, please reset your password immediately 
-                   or contact support.</p>
-            </body>
-        </html>
-        """
-        
-        plain_content = f"""
-        Account Temporarily Locked
-        
-        Your account has been temporarily locked due to multiple failed login attempts.
-        
-        Your account will be unlocked at: {unlock_time}
-        
-        If you believe this is unauthorized activity, please reset your password 
-        or contact support.
-        """
-        
-        return await self.send_email(
-            to_email=to_email,
-            subject="Account Locked - Security Alert",
-            html_content=html_content,
-            plain_content=plain_content
+        return await self.send_template_email(
+            to_email,
+            "account_locked",
+            user_name=user_name,
+            unlock_time=unlock_time
         )
-
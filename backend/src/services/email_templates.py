@@ -0,0 +1,117 @@
+"""
+Email Template Registry
+Process-wide registry of precompiled Jinja2 email templates
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates" / "email"
+
+# Templates compiled at startup; each defines subject, html and plain blocks
+EMAIL_TEMPLATE_NAMES = (
+    "email_verification",
+    "password_reset",
+    "password_changed",
+    "account_locked",
+)
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    """Subject plus html and plain variants rendered from one template"""
+    subject: str
+    html: str
+    plain: str
+
+
+class EmailTemplateRegistry:
+    """
+    Registry of compiled email templates
+
+    - One Jinja2 Environment per process instead of one per EmailService
+    - Compiled code is persisted in a filesystem bytecode cache, so a fresh
+      worker loads templates without re-parsing them
+    - In production the compiled Template objects are pinned and never
+      re-checked; with auto_reload (development) Jinja2 stats the source
+      file on each lookup and recompiles only when it changed
+    """
+
+    def __init__(
+        self,
+        template_dir: Path = TEMPLATE_DIR,
+        cache_dir: Optional[str] = None,
+        auto_reload: bool = False
+    ):
+        self.auto_reload = auto_reload
+        if cache_dir:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        self.env = Environment(
+            loader=FileSystemLoader(str(template_dir)),
+            autoescape=select_autoescape(["html", "xml", "j2"]),
+            bytecode_cache=FileSystemBytecodeCache(directory=cache_dir or None),
+            auto_reload=auto_reload,
+        )
+        self._compiled: Dict[str, Template] = {}
+
+    def precompile(self) -> None:
+        """Compile (or load from bytecode cache) every registered template"""
+        for name in EMAIL_TEMPLATE_NAMES:
+            self._compiled[name] = self.env.get_template(f"{name}.j2")
+        logger.info(f"Precompiled {len(self._compiled)} email templates")
+
+    def get_template(self, name: str) -> Template:
+        """
+        Get a compiled template by name
+
+        Raises:
+            KeyError: If the template is not registered
+        """
+        if name not in EMAIL_TEMPLATE_NAMES:
+            raise KeyError(f"Unknown email template: {name}")
+
+        if self.auto_reload or name not in self._compiled:
+            # Jinja2's own cache only recompiles when the source changed
+            self._compiled[name] = self.env.get_template(f"{name}.j2")
+
+        return self._compiled[name]
+
+    def render(self, name: str, **context) -> RenderedEmail:
+        """
+        Render subject, html and plain variants of a template
+
+        Args:
+            name: Registered template name (without extension)
+            **context: Template variables
+
+        Returns:
+            RenderedEmail with all three parts
+        """
+        template = self.get_template(name)
+        ctx = template.new_context(context)
+
+        def render_block(block: str) -> str:
+            return "".join(template.blocks[block](ctx)).strip()
+
+        return RenderedEmail(
+            subject=render_block("subject"),
+            html=render_block("html"),
+            plain=render_block("plain"),
+        )
+
+
+@lru_cache(maxsize=None)
+def get_email_template_registry() -> EmailTemplateRegistry:
+    """Get the process-wide email template registry"""
+    return EmailTemplateRegistry(
+        cache_dir=settings.EMAIL_TEMPLATE_CACHE_DIR,
+        auto_reload=settings.DEBUG
+    )
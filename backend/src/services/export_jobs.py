@@ -0,0 +1,306 @@
+"""
+Export Jobs
+Background production of large log exports as gzip files on local disk
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import os
+import secrets
+import time
+import uuid
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.schemas.export_job import ExportJobCreate
+from src.services.operation_log_archive import ArchiveQuery, get_operation_log_archive
+from src.services.operation_log_export import OPERATION_LOG_EXPORT, ExportSource, export_chunks
+from src.services.operation_log_service import OperationLogService
+from src.services.security_log_export import SECURITY_LOG_EXPORT, build_security_log_query
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class ExportQueueFullError(Exception):
+    """No room for another queued export job"""
+
+
+@dataclass
+class ExportJob:
+    """One background export and its progress"""
+    id: str
+    user_id: uuid.UUID
+    user_name: str
+    request: ExportJobCreate
+    dedupe_key: str
+    session_factory: async_sessionmaker = field(repr=False)
+    submitted_at: float
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    status: str = JOB_QUEUED
+    rows_written: int = 0
+    total_rows: Optional[int] = None
+    size_bytes: int = 0
+    path: Optional[Path] = None
+    error: Optional[str] = None
+    finished_at: Optional[datetime] = None
+    finished_at_clock: Optional[float] = None
+
+    @property
+    def progress(self) -> Optional[float]:
+        if self.status == JOB_DONE:
+            return 1.0
+        if not self.total_rows:
+            return None
+        return min(self.rows_written / self.total_rows, 1.0)
+
+    @property
+    def filename(self) -> str:
+        """File name offered for download"""
+        stamp = self.created_at.strftime('%Y%m%d_%H%M%S')
+        return f"{self.request.source}_{self.user_id}_{stamp}.{self.request.format}.gz"
+
+    @property
+    def etag(self) -> str:
+        """Validator for If-Range: a finished job's file never changes"""
+        return f'"{self.id}-{self.size_bytes}"'
+
+
+class ExportJobManager:
+    """
+    In-process export job queue with a fixed pool of worker tasks
+
+    - submit() queues a job, or returns the existing one when the same user
+      asked for the same filters within `dedupe_window_seconds` (failed
+      jobs are never reused)
+    - Workers write the export gzip-compressed, batch by batch, to
+      `<directory>/<job id>.part`, renamed into place when complete, and
+      update rows_written as they go
+    - Finished jobs and their files are dropped after `retention_seconds`
+
+    State is per process: jobs are only visible on the instance that took
+    them, and queued jobs do not survive a restart.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        workers: int,
+        max_queue: int,
+        dedupe_window_seconds: float,
+        retention_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.directory = Path(directory)
+        self.workers = workers
+        self.max_queue = max_queue
+        self.dedupe_window_seconds = dedupe_window_seconds
+        self.retention_seconds = retention_seconds
+        self._clock = clock
+        self._jobs: Dict[str, ExportJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def depth(self) -> int:
+        """Number of queued jobs (for readiness reporting)"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Stop the workers; unfinished jobs are marked failed"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        for job in self._jobs.values():
+            if job.status in (JOB_QUEUED, JOB_RUNNING):
+                self._fail(job, "Interrupted by shutdown")
+
+    @staticmethod
+    def _dedupe_key(user_id: uuid.UUID, request: ExportJobCreate) -> str:
+        payload = f"{user_id}:{request.model_dump_json()}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def submit(
+        self,
+        user_id: uuid.UUID,
+        user_name: str,
+        request: ExportJobCreate,
+        session_factory: async_sessionmaker
+    ) -> Tuple[ExportJob, bool]:
+        """
+        Queue an export job
+
+        Args:
+            user_id: Owner of the logs (and of the job)
+            user_name: Value for the export's user column
+            request: Source, format and filters
+            session_factory: Factory for the session the export reads in
+
+        Returns:
+            Tuple of (job, created); created is False for a deduplicated job
+
+        Raises:
+            ExportQueueFullError: If the queue is full or the workers are not running
+        """
+        self._purge_expired()
+        key = self._dedupe_key(user_id, request)
+        cutoff = self._clock() - self.dedupe_window_seconds
+        for job in self._jobs.values():
+            if job.dedupe_key == key and job.status != JOB_FAILED and job.submitted_at > cutoff:
+                return job, False
+
+        if self._queue is None or self._queue.full():
+            raise ExportQueueFullError("Export queue is full")
+
+        job = ExportJob(
+            id=secrets.token_urlsafe(16),
+            user_id=user_id,
+            user_name=user_name,
+            request=request,
+            dedupe_key=key,
+            session_factory=session_factory,
+            submitted_at=self._clock()
+        )
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        return job, True
+
+    def get(self, job_id: str, user_id: uuid.UUID) -> Optional[ExportJob]:
+        """Get a job by id if it belongs to `user_id`"""
+        self._purge_expired()
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    def _purge_expired(self) -> None:
+        cutoff = self._clock() - self.retention_seconds
+        for job_id in [
+            job.id for job in self._jobs.values()
+            if job.finished_at_clock is not None and job.finished_at_clock < cutoff
+        ]:
+            job = self._jobs.pop(job_id)
+            if job.path is not None:
+                job.path.unlink(missing_ok=True)
+
+    def _fail(self, job: ExportJob, error: str) -> None:
+        job.status = JOB_FAILED
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+        job.finished_at_clock = self._clock()
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Export job %s failed", job.id)
+                self._fail(job, str(e))
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _build_query(db: AsyncSession, job: ExportJob) -> Tuple[Select, ExportSource]:
+        request = job.request
+        if request.source == "security_logs":
+            query = build_security_log_query(
+                job.user_id,
+                event_type=request.event_type,
+                result=request.result,
+                start_date=request.start_date,
+                end_date=request.end_date
+            )
+            return query, SECURITY_LOG_EXPORT
+        query = OperationLogService(db).build_query(
+            job.user_id,
+            action=request.action,
+            result=request.result,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            search=request.search
+        )
+        return query, OPERATION_LOG_EXPORT
+
+    @staticmethod
+    def _archive_query(job: ExportJob) -> ArchiveQuery:
+        request = job.request
+        return ArchiveQuery(
+            job.user_id,
+            action=request.action,
+            result=request.result,
+            start_date=request.start_date,
+            end_date=request.end_date,
+            search=request.search
+        )
+
+    async def _run(self, job: ExportJob) -> None:
+        job.status = JOB_RUNNING
+        async with job.session_factory() as db:
+            query, source = self._build_query(db, job)
+            job.total_rows = await db.scalar(select(func.count()).select_from(query.subquery()))
+
+        # Operation logs moved to the archive are exported with the hot rows
+        archived: Optional[Iterator[Any]] = None
+        archive = get_operation_log_archive()
+        if archive is not None and source is OPERATION_LOG_EXPORT:
+            archive_query = self._archive_query(job)
+            job.total_rows += await asyncio.to_thread(archive.count, archive_query)
+            archived = archive.iter_logs(archive_query)
+
+        def count_rows(rows: int) -> None:
+            job.rows_written += rows
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        part = self.directory / f"{job.id}.part"
+        try:
+            with open(part, "wb") as f:
+                async for chunk in export_chunks(
+                    job.session_factory, query, job.request.format, job.user_name,
+                    compress=True, source=source, on_batch=count_rows, archived=archived
+                ):
+                    await asyncio.to_thread(f.write, chunk)
+                    job.size_bytes += len(chunk)
+            path = self.directory / f"{job.id}.{job.request.format}.gz"
+            os.replace(part, path)
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
+
+        job.path = path
+        job.status = JOB_DONE
+        job.finished_at = datetime.now(timezone.utc)
+        job.finished_at_clock = self._clock()
+
+
+@lru_cache(maxsize=None)
+def get_export_job_manager() -> ExportJobManager:
+    """Get the process-wide export job manager"""
+    return ExportJobManager(
+        directory=settings.EXPORT_JOB_DIR,
+        workers=settings.EXPORT_JOB_WORKERS,
+        max_queue=settings.EXPORT_JOB_MAX_QUEUE,
+        dedupe_window_seconds=settings.EXPORT_JOB_DEDUPE_SECONDS,
+        retention_seconds=settings.EXPORT_JOB_RETENTION_SECONDS
+    )
@@ -0,0 +1,242 @@
+"""
+Health Service
+Liveness and readiness checks with short-lived cached results
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+
+import aiosmtplib
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_DEGRADED = "degraded"
+STATUS_DOWN = "down"
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one dependency check"""
+    status: str
+    critical: bool
+    detail: Dict[str, Any] = field(default_factory=dict)
+    latency_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "critical": self.critical,
+            "latency_ms": round(self.latency_ms, 1),
+            **self.detail,
+        }
+
+
+@dataclass
+class _QueueProbe:
+    depth: Callable[[], int]
+    max_depth: Optional[int]
+
+
+class HealthService:
+    """
+    Readiness checks for the service's dependencies
+
+    - database (critical): SELECT 1 on the async engine, plus pool gauges
+      (the application's primary engine unless another one is given)
+    - replicas: how many read replicas are within the lag limit
+    - redis, smtp: reachability; reported but not required for readiness
+    - queues: depth of registered background queues against their limits
+
+    A full report is computed at most once per `ttl_seconds`; concurrent
+    probes during a refresh wait for the same run, so load-balancer
+    probing frequency never turns into database load.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        timeout_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+        engine: Optional[AsyncEngine] = None
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.timeout_seconds = timeout_seconds
+        self._clock = clock
+        self._engine = engine
+        self._queues: Dict[str, _QueueProbe] = {}
+        self._report: Optional[Dict[str, Any]] = None
+        self._report_at = 0.0
+        self._refresh: Optional[asyncio.Future] = None
+
+    def register_queue(self, name: str, depth: Callable[[], int], max_depth: Optional[int] = None) -> None:
+        """
+        Report a background queue's depth in readiness
+
+        Args:
+            name: Queue name shown in the report
+            depth: Callable returning the current number of queued items
+            max_depth: Depth above which the queue is reported degraded
+        """
+        self._queues[name] = _QueueProbe(depth=depth, max_depth=max_depth)
+
+    async def readiness(self) -> Dict[str, Any]:
+        """
+        Get the (cached) readiness report
+
+        Returns:
+            Report with overall status and one entry per check
+        """
+        if self._report is not None and self._clock() - self._report_at < self.ttl_seconds:
+            return self._report
+
+        if self._refresh is None:
+            self._refresh = asyncio.ensure_future(self._run_checks())
+        return await asyncio.shield(self._refresh)
+
+    async def _run_checks(self) -> Dict[str, Any]:
+        try:
+            return await self._collect()
+        finally:
+            self._refresh = None
+
+    async def _collect(self) -> Dict[str, Any]:
+        checks = {
+            "database": self._timed(self.check_database, critical=True),
+            "replicas": self._timed(self.check_replicas, critical=False),
+            "redis": self._timed(self.check_redis, critical=False),
+            "smtp": self._timed(self.check_smtp, critical=False),
+        }
+        names = list(checks)
+        results = dict(zip(names, await asyncio.gather(*checks.values())))
+        results["queues"] = self.check_queues()
+
+        if any(r.critical and r.status == STATUS_DOWN for r in results.values()):
+            overall = STATUS_DOWN
+        elif any(r.status != STATUS_OK for r in results.values()):
+            overall = STATUS_DEGRADED
+        else:
+            overall = STATUS_OK
+
+        report = {
+            "status": overall,
+            "checked_at": time.time(),
+            "checks": {name: result.to_dict() for name, result in results.items()},
+        }
+        self._report = report
+        self._report_at = self._clock()
+        return report
+
+    async def _timed(self, check: Callable[[], Awaitable[Dict[str, Any]]], critical: bool) -> CheckResult:
+        started = time.perf_counter()
+        try:
+            detail = await asyncio.wait_for(check(), timeout=self.timeout_seconds)
+            status = detail.pop("status", STATUS_OK)
+        except asyncio.TimeoutError:
+            status, detail = STATUS_DOWN, {"error": f"timed out after {self.timeout_seconds}s"}
+        except Exception as e:
+            status, detail = STATUS_DOWN, {"error": str(e)}
+        if status == STATUS_DOWN and not critical:
+            # Optional dependencies never take the instance out of rotation
+            status = STATUS_DEGRADED
+        return CheckResult(
+            status=status,
+            critical=critical,
+            detail=detail,
+            latency_ms=(time.perf_counter() - started) * 1000
+        )
+
+    async def check_database(self) -> Dict[str, Any]:
+        from src.database import async_engine, check_db_health
+        from src.utils.pool_metrics import get_pool_metrics
+
+        engine = self._engine or async_engine
+        if not await check_db_health(engine):
+            return {"status": STATUS_DOWN, "error": "SELECT 1 failed"}
+
+        pool = get_pool_metrics("primary_async").snapshot(engine.sync_engine.pool)
+        detail = {key: pool.get(key) for key in ("size", "in_use", "idle", "overflow")}
+        if pool.get("size") is not None and pool["in_use"] >= pool["size"] + settings.DB_MAX_OVERFLOW:
+            # Every connection is checked out: new requests will queue
+            detail["status"] = STATUS_DEGRADED
+        return detail
+
+    async def check_replicas(self) -> Dict[str, Any]:
+        from src.database import RoutingSession
+
+        replicas = RoutingSession.replicas
+        if replicas is None:
+            return {"configured": 0}
+        available = len(replicas.available())
+        return {
+            "configured": len(replicas.engines),
+            "available": available,
+            # Reads fall back to the primary, so this is degraded, not down
+            "status": STATUS_OK if available else STATUS_DEGRADED,
+        }
+
+    async def check_redis(self) -> Dict[str, Any]:
+        from redis import asyncio as aioredis
+
+        client = aioredis.from_url(settings.REDIS_URL, socket_connect_timeout=self.timeout_seconds)
+        try:
+            await client.ping()
+        finally:
+            await client.aclose()
+        return {}
+
+    async def check_smtp(self) -> Dict[str, Any]:
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            use_tls=settings.SMTP_TLS,
+            start_tls=False,
+            timeout=self.timeout_seconds
+        )
+        await smtp.connect()
+        try:
+            await smtp.noop()
+        finally:
+            smtp.close()
+        return {}
+
+    def check_queues(self) -> CheckResult:
+        depths = {}
+        status = STATUS_OK
+        for name, probe in self._queues.items():
+            depth = probe.depth()
+            depths[name] = {"depth": depth, "max_depth": probe.max_depth}
+            if probe.max_depth is not None and depth > probe.max_depth:
+                status = STATUS_DEGRADED
+        return CheckResult(status=status, critical=False, detail={"queues": depths})
+
+
+@lru_cache(maxsize=None)
+def get_health_service() -> HealthService:
+    """Get the process-wide health service (also a FastAPI dependency)"""
+    from src.services.email_coalescer import get_email_coalescer
+    from src.services.email_queue import get_verification_email_queue
+    from src.services.export_jobs import get_export_job_manager
+    from src.services.operation_log_purge import get_operation_log_purger
+    from src.services.operation_log_writer import get_operation_log_writer
+
+    service = HealthService(
+        ttl_seconds=settings.HEALTH_CACHE_TTL_SECONDS,
+        timeout_seconds=settings.HEALTH_CHECK_TIMEOUT_SECONDS
+    )
+    service.register_queue("email_in_flight", get_email_coalescer().in_flight)
+    service.register_queue(
+        "verification_emails", get_verification_email_queue().pending, settings.EMAIL_QUEUE_MAX_PENDING
+    )
+    service.register_queue("export_jobs", get_export_job_manager().depth, settings.EXPORT_JOB_MAX_QUEUE)
+    service.register_queue("operation_log_purges", get_operation_log_purger().active)
+    service.register_queue(
+        "operation_log_writer", get_operation_log_writer().pending, settings.OPERATION_LOG_WRITER_MAX_PENDING
+    )
+    return service
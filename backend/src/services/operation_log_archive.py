@@ -0,0 +1,571 @@
+"""
+Operation Log Archive
+Cold operation logs in immutable, compressed, column-oriented segment files
+on local disk, with a memory-mapped sparse index, read together with the
+hot rows still in SQL
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+import asyncio
+import heapq
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import uuid
+import zlib
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.config import settings
+from src.database import async_unit_of_work
+from src.models.operation_log import OperationLog, OperationResult
+from src.utils.uuid7 import uuid7
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAGIC = b"OLSEG1\n"
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+PART_SUFFIX = ".part"
+TOMBSTONES_FILE = "tombstones.json"
+
+# Sparse index record, one per block:
+# user_id (16 bytes), newest and oldest created_at (µs since epoch), offset, length, rows
+INDEX_RECORD = struct.Struct("<16sqqQII")
+
+# Decoded blocks kept in memory per archive
+BLOCK_CACHE_SIZE = 64
+
+ZLIB_LEVEL = 6
+
+ARCHIVE_COLUMNS = (
+    OperationLog.id,
+    OperationLog.user_id,
+    OperationLog.created_at,
+    OperationLog.action,
+    OperationLog.resource,
+    OperationLog.result,
+    OperationLog.details,
+    OperationLog.ip_address,
+    OperationLog.user_agent,
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_micros(value: datetime) -> int:
+    """Microseconds since the epoch; naive values are UTC (as SQLite returns them)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def sort_key(row: Any) -> Tuple[int, str]:
+    """Ordering key of a hot or archived log, matching (created_at, id) in SQL"""
+    return to_micros(row.created_at), row.id
+
+
+@dataclass(frozen=True)
+class ArchivedLog:
+    """A log read from a segment; same attributes as OperationLog and export rows"""
+    id: str
+    user_id: uuid.UUID
+    created_at: datetime
+    action: str
+    resource: str
+    result: OperationResult
+    details: Optional[str]
+    ip_address: Optional[str]
+    user_agent: Optional[str]
+
+
+@dataclass(frozen=True)
+class ArchiveQuery:
+    """
+    Filters of OperationLogService.build_query, applied to archived logs
+
+    Search is a case-insensitive substring match on action, resource and
+    details (archived logs have no full-text index).
+    """
+    user_id: uuid.UUID
+    action: Optional[str] = None
+    result: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    search: Optional[str] = None
+
+    def matches(self, log: ArchivedLog) -> bool:
+        if self.action and self.action != 'all' and log.action != self.action:
+            return False
+        if self.result and self.result != 'all' and log.result != self.result:
+            return False
+        if self.search:
+            term = self.search.lower()
+            return any(term in (value or "").lower() for value in (log.action, log.resource, log.details))
+        return True
+
+
+def encode_block(rows: Sequence[Any]) -> bytes:
+    """
+    Encode one block: column lists (one user, newest first) as zlib-compressed JSON
+
+    Storing columns together lets the compressor see runs of similar
+    values (actions, IPs, user agents), which is where most of the saving
+    comes from.
+    """
+    columns = {
+        "id": [row.id for row in rows],
+        "created_at": [to_micros(row.created_at) for row in rows],
+        "action": [row.action for row in rows],
+        "resource": [row.resource for row in rows],
+        "result": [OperationResult(row.result).value for row in rows],
+        "details": [row.details for row in rows],
+        "ip_address": [row.ip_address for row in rows],
+        "user_agent": [row.user_agent for row in rows],
+    }
+    return zlib.compress(json.dumps(columns, separators=(",", ":")).encode("utf-8"), ZLIB_LEVEL)
+
+
+def decode_block(user_id: uuid.UUID, data: bytes) -> List[ArchivedLog]:
+    """Decode a block written by encode_block"""
+    columns = json.loads(zlib.decompress(data))
+    return [
+        ArchivedLog(
+            id=log_id,
+            user_id=user_id,
+            created_at=_EPOCH + timedelta(microseconds=micros),
+            action=action,
+            resource=resource,
+            result=OperationResult(result),
+            details=details,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        for log_id, micros, action, resource, result, details, ip_address, user_agent in zip(
+            columns["id"], columns["created_at"], columns["action"], columns["resource"],
+            columns["result"], columns["details"], columns["ip_address"], columns["user_agent"]
+        )
+    ]
+
+
+class SegmentWriter:
+    """
+    Writes one segment file and its index
+
+    Both are written as .part files and renamed into place on commit(),
+    index last: a segment exists for readers only once its index does.
+    """
+
+    def __init__(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        name = uuid7().hex
+        self.path = directory / f"{name}{SEGMENT_SUFFIX}"
+        self.index_path = directory / f"{name}{INDEX_SUFFIX}"
+        self._file = open(self.path.with_name(self.path.name + PART_SUFFIX), "wb")
+        self._file.write(SEGMENT_MAGIC)
+        self._offset = len(SEGMENT_MAGIC)
+        self._entries: List[Tuple[bytes, int, int, int, int, int]] = []
+
+    def add_block(self, rows: Sequence[Any]) -> None:
+        """Append a block of one user's rows, newest first"""
+        data = encode_block(rows)
+        self._file.write(data)
+        self._entries.append((
+            rows[0].user_id.bytes, to_micros(rows[0].created_at), to_micros(rows[-1].created_at),
+            self._offset, len(data), len(rows)
+        ))
+        self._offset += len(data)
+
+    def commit(self) -> None:
+        """Make the segment durable and visible"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._file.name, self.path)
+
+        # Sorted by user, then newest block first: readers binary-search the user
+        self._entries.sort(key=lambda entry: (entry[0], -entry[1]))
+        index_part = self.index_path.with_name(self.index_path.name + PART_SUFFIX)
+        with open(index_part, "wb") as f:
+            for entry in self._entries:
+                f.write(INDEX_RECORD.pack(*entry))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(index_part, self.index_path)
+
+    def abort(self) -> None:
+        """Discard the segment"""
+        self._file.close()
+        Path(self._file.name).unlink(missing_ok=True)
+
+
+class Segment:
+    """A committed segment: memory-mapped index plus a read-only file handle"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path.with_suffix(INDEX_SUFFIX), "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._records = size // INDEX_RECORD.size
+        self._fd = os.open(path, os.O_RDONLY)
+
+    def blocks(self, user_id: uuid.UUID) -> Iterator[Tuple[bytes, int, int, int, int, int]]:
+        """Index entries of a user's blocks, newest first"""
+        key = user_id.bytes
+        lo, hi = 0, self._records
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._index[mid * INDEX_RECORD.size:mid * INDEX_RECORD.size + 16] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        for i in range(lo, self._records):
+            entry = INDEX_RECORD.unpack_from(self._index, i * INDEX_RECORD.size)
+            if entry[0] != key:
+                return
+            yield entry
+
+    def read(self, offset: int, length: int) -> bytes:
+        return os.pread(self._fd, length, offset)
+
+    def close(self) -> None:
+        if isinstance(self._index, mmap.mmap):
+            self._index.close()
+        os.close(self._fd)
+
+
+class OperationLogArchive:
+    """
+    Reader over the segment files in one directory
+
+    Segments are immutable; a user's logs may be spread over several of
+    them, so reads merge the per-segment streams newest first. Clearing
+    logs cannot rewrite segments, so it records a per-user tombstone
+    (forget()) and archived logs older than it are hidden.
+
+    Methods block on disk I/O and decompression; call them through
+    asyncio.to_thread from the event loop.
+    """
+
+    def __init__(self, directory: str, block_cache_size: int = BLOCK_CACHE_SIZE):
+        self.directory = Path(directory)
+        self.block_cache_size = block_cache_size
+        self._segments: Dict[str, Segment] = {}
+        self._blocks: "OrderedDict[Tuple[str, int], List[ArchivedLog]]" = OrderedDict()
+        self._tombstones: Dict[str, int] = {}
+        self._tombstones_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def segments(self) -> List[Segment]:
+        """Committed segments, picking up ones written since the last call"""
+        with self._lock:
+            names = {path.stem for path in self.directory.glob(f"*{INDEX_SUFFIX}")}
+            for name in set(self._segments) - names:
+                self._segments.pop(name).close()
+            for name in names - set(self._segments):
+                self._segments[name] = Segment(self.directory / f"{name}{SEGMENT_SUFFIX}")
+            self._load_tombstones()
+            return list(self._segments.values())
+
+    def _load_tombstones(self) -> None:
+        path = self.directory / TOMBSTONES_FILE
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            self._tombstones, self._tombstones_mtime = {}, None
+            return
+        if mtime != self._tombstones_mtime:
+            self._tombstones = json.loads(path.read_text())
+            self._tombstones_mtime = mtime
+
+    def forget(self, user_id: uuid.UUID, before: datetime) -> None:
+        """Hide a user's archived logs created before `before`"""
+        with self._lock:
+            self._load_tombstones()
+            tombstones = dict(self._tombstones)
+            tombstones[user_id.hex] = max(tombstones.get(user_id.hex, 0), to_micros(before))
+            self.directory.mkdir(parents=True, exist_ok=True)
+            part = self.directory / f"{TOMBSTONES_FILE}{PART_SUFFIX}"
+            part.write_text(json.dumps(tombstones))
+            os.replace(part, self.directory / TOMBSTONES_FILE)
+            self._tombstones, self._tombstones_mtime = tombstones, None
+
+    def _block(self, segment: Segment, user_id: uuid.UUID, offset: int, length: int) -> List[ArchivedLog]:
+        key = (segment.path.stem, offset)
+        with self._lock:
+            logs = self._blocks.get(key)
+            if logs is not None:
+                self._blocks.move_to_end(key)
+                return logs
+        logs = decode_block(user_id, segment.read(offset, length))
+        with self._lock:
+            self._blocks[key] = logs
+            while len(self._blocks) > self.block_cache_size:
+                self._blocks.popitem(last=False)
+        return logs
+
+    def _iter_segment(
+        self,
+        segment: Segment,
+        query: ArchiveQuery,
+        before: Optional[Tuple[int, str]],
+        floor: int,
+        ceiling: Optional[int]
+    ) -> Iterator[ArchivedLog]:
+        for _, newest, oldest, offset, length, _ in segment.blocks(query.user_id):
+            if newest < floor:
+                return
+            if (before is not None and oldest > before[0]) or (ceiling is not None and oldest > ceiling):
+                continue
+            for log in self._block(segment, query.user_id, offset, length):
+                key = sort_key(log)
+                if key[0] < floor:
+                    return
+                if (before is not None and key >= before) or (ceiling is not None and key[0] > ceiling):
+                    continue
+                if query.matches(log):
+                    yield log
+
+    def iter_logs(self, query: ArchiveQuery, before: Optional[Tuple[datetime, str]] = None) -> Iterator[ArchivedLog]:
+        """
+        Archived logs matching a query, newest first
+
+        Args:
+            query: Filters
+            before: Only logs strictly before this (created_at, id), e.g. a cursor position
+
+        Yields:
+            ArchivedLog, ordered by (created_at, id) descending
+        """
+        segments = self.segments()
+        floor = max(
+            to_micros(query.start_date) if query.start_date else 0,
+            self._tombstones.get(query.user_id.hex, 0)
+        )
+        ceiling = to_micros(query.end_date) if query.end_date else None
+        before_key = (to_micros(before[0]), before[1]) if before else None
+
+        streams = [self._iter_segment(segment, query, before_key, floor, ceiling) for segment in segments]
+        previous = None
+        for log in heapq.merge(*streams, key=sort_key, reverse=True):
+            key = sort_key(log)
+            if key != previous:
+                previous = key
+                yield log
+
+    def read(self, query: ArchiveQuery, before: Optional[Tuple[datetime, str]], limit: int) -> List[ArchivedLog]:
+        """First `limit` logs of iter_logs"""
+        return list(islice(self.iter_logs(query, before), limit))
+
+    def count(self, query: ArchiveQuery, cap: Optional[int] = None) -> int:
+        """Count matching logs, stopping after cap + 1 if a cap is given"""
+        logs = self.iter_logs(query)
+        return sum(1 for _ in (logs if cap is None else islice(logs, cap + 1)))
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self._segments.values():
+                segment.close()
+            self._segments.clear()
+            self._blocks.clear()
+
+
+def merge_logs(hot: Sequence[Any], archived: Sequence[Any], limit: int) -> List[Any]:
+    """
+    Merge two newest-first lists of logs, up to `limit`
+
+    A log found in both (archived, but its row not yet deleted) is kept once.
+    """
+    merged: List[Any] = []
+    previous = None
+    for log in heapq.merge(hot, archived, key=sort_key, reverse=True):
+        key = sort_key(log)
+        if key != previous:
+            previous = key
+            merged.append(log)
+            if len(merged) == limit:
+                break
+    return merged
+
+
+async def merge_batches(
+    batches: AsyncIterator[Sequence[Any]],
+    archived: Iterator[ArchivedLog],
+    batch_size: int
+) -> AsyncIterator[List[Any]]:
+    """
+    Merge newest-first batches of hot rows with an iterator of archived logs
+
+    The archive iterator is advanced `batch_size` logs at a time in a
+    worker thread.
+
+    Yields:
+        Newest-first lists of at most `batch_size` hot rows or archived logs
+    """
+    async def hot_rows():
+        async for batch in batches:
+            for row in batch:
+                yield row
+
+    async def archived_logs():
+        while True:
+            chunk = await asyncio.to_thread(lambda: list(islice(archived, batch_size)))
+            if not chunk:
+                return
+            for log in chunk:
+                yield log
+
+    hot_iter, archived_iter = hot_rows(), archived_logs()
+    hot_row = await anext(hot_iter, None)
+    archived_log = await anext(archived_iter, None)
+    out: List[Any] = []
+    while hot_row is not None or archived_log is not None:
+        if archived_log is None or (hot_row is not None and sort_key(hot_row) >= sort_key(archived_log)):
+            if archived_log is not None and sort_key(hot_row) == sort_key(archived_log):
+                archived_log = await anext(archived_iter, None)
+            out.append(hot_row)
+            hot_row = await anext(hot_iter, None)
+        else:
+            out.append(archived_log)
+            archived_log = await anext(archived_iter, None)
+        if len(out) >= batch_size:
+            yield out
+            out = []
+    if out:
+        yield out
+
+
+class OperationLogArchiver:
+    """
+    Moves operation logs older than `older_than_days` into segments
+
+    Each round reads up to `segment_max_rows` old rows ordered by (user_id,
+    created_at DESC, id DESC), writes them as one segment of blocks of at
+    most `block_rows` rows of one user, commits it, and only then deletes
+    the rows, `block_rows` per transaction. A crash in between leaves rows
+    in both places; readers keep one copy.
+    """
+
+    def __init__(
+        self,
+        archive: OperationLogArchive,
+        session_factory: Optional[async_sessionmaker] = None,
+        older_than_days: int = 90,
+        interval_seconds: float = 3600,
+        block_rows: int = 4096,
+        segment_max_rows: int = 1_000_000
+    ):
+        self.archive = archive
+        self.session_factory = session_factory
+        self.older_than_days = older_than_days
+        self.interval_seconds = interval_seconds
+        self.block_rows = block_rows
+        self.segment_max_rows = segment_max_rows
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self, cutoff: Optional[datetime] = None) -> int:
+        """
+        Archive every log created before `cutoff` (default: older_than_days ago)
+
+        Returns:
+            Number of logs archived
+        """
+        if cutoff is None:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=self.older_than_days)
+        archived = 0
+        while True:
+            rows = await self._archive_segment(cutoff)
+            archived += rows
+            if rows < self.segment_max_rows:
+                return archived
+
+    async def _archive_segment(self, cutoff: datetime) -> int:
+        statement = (
+            select(*ARCHIVE_COLUMNS)
+            .where(OperationLog.created_at < cutoff)
+            .order_by(OperationLog.user_id, OperationLog.created_at.desc(), OperationLog.id.desc())
+            .limit(self.segment_max_rows)
+            .execution_options(yield_per=self.block_rows)
+        )
+        writer = await asyncio.to_thread(SegmentWriter, self.archive.directory)
+        ids: List[str] = []
+        try:
+            block: List[Any] = []
+            async with async_unit_of_work(self.session_factory) as db:
+                result = await db.stream(statement)
+                async for row in result:
+                    if block and (row.user_id != block[0].user_id or len(block) >= self.block_rows):
+                        await asyncio.to_thread(writer.add_block, block)
+                        block = []
+                    block.append(row)
+                    ids.append(row.id)
+            if block:
+                await asyncio.to_thread(writer.add_block, block)
+            if not ids:
+                writer.abort()
+                return 0
+            await asyncio.to_thread(writer.commit)
+        except BaseException:
+            writer.abort()
+            raise
+
+        for start in range(0, len(ids), self.block_rows):
+            async with async_unit_of_work(self.session_factory) as db:
+                await db.execute(
+                    delete(OperationLog)
+                    .where(OperationLog.id.in_(ids[start:start + self.block_rows]))
+                    .execution_options(synchronize_session=False)
+                )
+        logger.info("Archived %d operation logs into %s", len(ids), writer.path.name)
+        return len(ids)
+
+    def start(self) -> None:
+        """Archive periodically on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Operation log archiving failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+@lru_cache(maxsize=None)
+def get_operation_log_archive() -> Optional[OperationLogArchive]:
+    """Get the process-wide archive reader (None when archiving is disabled; also a FastAPI dependency)"""
+    if not settings.OPERATION_LOG_ARCHIVE_ENABLED:
+        return None
+    return OperationLogArchive(settings.OPERATION_LOG_ARCHIVE_DIR)
+
+
+@lru_cache(maxsize=None)
+def get_operation_log_archiver() -> Optional[OperationLogArchiver]:
+    """Get the process-wide archiver (None when archiving is disabled)"""
+    archive = get_operation_log_archive()
+    if archive is None:
+        return None
+    return OperationLogArchiver(
+        archive,
+        older_than_days=settings.OPERATION_LOG_ARCHIVE_AFTER_DAYS,
+        interval_seconds=settings.OPERATION_LOG_ARCHIVE_INTERVAL_SECONDS,
+        block_rows=settings.OPERATION_LOG_ARCHIVE_BLOCK_ROWS
+    )
@@ -0,0 +1,216 @@
+"""
+Operation Log Export
+Streams filtered operation logs (or another ExportSource) as CSV or NDJSON
+with constant memory
+"""
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Optional, Sequence
+import csv
+import io
+import json
+import zlib
+
+from sqlalchemy import Row, Select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.models.operation_log import OperationLog
+from src.services.operation_log_archive import merge_batches
+
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_NDJSON = "ndjson"
+EXPORT_FORMATS = (EXPORT_FORMAT_CSV, EXPORT_FORMAT_NDJSON)
+
+MEDIA_TYPES = {
+    EXPORT_FORMAT_CSV: "text/csv; charset=utf-8",
+    EXPORT_FORMAT_NDJSON: "application/x-ndjson",
+}
+GZIP_MEDIA_TYPE = "application/gzip"
+
+# Rows fetched from the server-side cursor (and written) per chunk
+EXPORT_BATCH_SIZE = 1000
+
+CSV_HEADER = ['时间', '用户', '操作', '资源', '结果', 'IP地址', '用户代理', '详情']
+
+EXPORT_COLUMNS = (
+    OperationLog.id,
+    OperationLog.user_id,
+    OperationLog.created_at,
+    OperationLog.action,
+    OperationLog.resource,
+    OperationLog.result,
+    OperationLog.ip_address,
+    OperationLog.user_agent,
+    OperationLog.details,
+)
+
+
+def export_filename(user_id, fmt: str, timestamp: str, compress: bool = False) -> str:
+    """File name offered for download, e.g. operation_logs_<user>_<ts>.csv.gz"""
+    return f"operation_logs_{user_id}_{timestamp}.{fmt}" + (".gz" if compress else "")
+
+
+def media_type(fmt: str, compress: bool = False) -> str:
+    """Content type of an export"""
+    return GZIP_MEDIA_TYPE if compress else MEDIA_TYPES[fmt]
+
+
+def _csv_chunk(rows: Iterable[Row], user_name: str, header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CSV_HEADER)
+    for row in rows:
+        writer.writerow([
+            row.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+            user_name,
+            row.action,
+            row.resource,
+            row.result.value,
+            row.ip_address,
+            row.user_agent,
+            row.details
+        ])
+    return buffer.getvalue()
+
+
+def _ndjson_chunk(rows: Iterable[Row], user_name: str) -> str:
+    return "".join(
+        json.dumps({
+            "id": row.id,
+            "timestamp": row.created_at.isoformat(),
+            "user_id": str(row.user_id),
+            "user_name": user_name,
+            "action": row.action,
+            "resource": row.resource,
+            "result": row.result.value,
+            "ip_address": row.ip_address,
+            "user_agent": row.user_agent,
+            "details": row.details,
+        }, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def format_rows(fmt: str, rows: Sequence[Row], user_name: str, header: bool = False) -> bytes:
+    """
+    Encode one batch of export rows
+
+    Args:
+        fmt: "csv" or "ndjson"
+        rows: Rows selected with EXPORT_COLUMNS
+        user_name: Value for the user column
+        header: Prepend the CSV header (first batch only)
+
+    Returns:
+        UTF-8 encoded chunk
+    """
+    if fmt == EXPORT_FORMAT_CSV:
+        return _csv_chunk(rows, user_name, header).encode("utf-8")
+    return _ndjson_chunk(rows, user_name).encode("utf-8")
+
+
+@dataclass(frozen=True)
+class ExportSource:
+    """What an export selects, in which order, and how a batch is encoded"""
+    columns: tuple
+    order_by: tuple
+    format_rows: Callable[[str, Sequence[Row], str, bool], bytes]
+
+
+OPERATION_LOG_EXPORT = ExportSource(
+    columns=EXPORT_COLUMNS,
+    order_by=(OperationLog.created_at.desc(), OperationLog.id.desc()),
+    format_rows=format_rows
+)
+
+
+async def iter_export_batches(
+    session_factory: async_sessionmaker,
+    query: Select,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    source: ExportSource = OPERATION_LOG_EXPORT
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Read a filtered log query in batches through a server-side cursor
+
+    Only the export columns are selected (no ORM identity map), newest
+    first, and at most `batch_size` rows are held at a time.
+
+    Args:
+        session_factory: Factory for the session the read runs in
+        query: Filtered query, e.g. from OperationLogService.build_query
+        batch_size: Rows per batch
+        source: Columns and ordering of the export
+
+    Yields:
+        Lists of rows with the source's column attributes
+    """
+    statement = (
+        query.with_only_columns(*source.columns)
+        .order_by(*source.order_by)
+        .execution_options(yield_per=batch_size)
+    )
+    async with session_factory() as db:
+        result = await db.stream(statement)
+        async for batch in result.partitions():
+            yield batch
+
+
+async def export_chunks(
+    session_factory: async_sessionmaker,
+    query: Select,
+    fmt: str,
+    user_name: str,
+    compress: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    source: ExportSource = OPERATION_LOG_EXPORT,
+    on_batch: Optional[Callable[[int], None]] = None,
+    archived: Optional[Iterator[Any]] = None
+) -> AsyncIterator[bytes]:
+    """
+    Stream an export as encoded (and optionally gzipped) chunks
+
+    Suitable as a StreamingResponse body: each batch is encoded and handed
+    to the response as soon as it is read, so memory use does not depend
+    on the size of the export.
+
+    Args:
+        session_factory: Factory for the session the read runs in
+        query: Filtered query, e.g. from OperationLogService.build_query
+        fmt: "csv" or "ndjson"
+        user_name: Value for the user column
+        compress: Gzip the stream
+        batch_size: Rows per chunk
+        source: What to export (operation logs by default)
+        on_batch: Called with the row count of each batch read (progress)
+        archived: Archived logs matching the same filters, newest first
+            (OperationLogArchive.iter_logs), merged into the export
+
+    Yields:
+        Byte chunks of the export file
+    """
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def encode(chunk: bytes) -> bytes:
+        # zlib buffers small inputs, so a compressed chunk may be empty
+        return compressor.compress(chunk) if compressor else chunk
+
+    if fmt == EXPORT_FORMAT_CSV:
+        chunk = encode(source.format_rows(fmt, [], user_name, True))
+        if chunk:
+            yield chunk
+
+    batches = iter_export_batches(session_factory, query, batch_size, source)
+    if archived is not None:
+        batches = merge_batches(batches, archived, batch_size)
+
+    async for batch in batches:
+        chunk = encode(source.format_rows(fmt, batch, user_name, False))
+        if on_batch is not None:
+            on_batch(len(batch))
+        if chunk:
+            yield chunk
+
+    if compressor:
+        yield compressor.flush()
@@ -0,0 +1,218 @@
+"""
+Operation Log Purge
+Background, batched deletion of a user's old operation logs
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+import secrets
+import time
+import uuid
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.config import settings
+from src.database import async_unit_of_work
+from src.models.operation_log import OperationLog
+
+logger = logging.getLogger(__name__)
+
+PURGE_QUEUED = "queued"
+PURGE_RUNNING = "running"
+PURGE_DONE = "done"
+PURGE_CANCELLED = "cancelled"
+PURGE_FAILED = "failed"
+
+ACTIVE_STATUSES = (PURGE_QUEUED, PURGE_RUNNING)
+
+
+@dataclass
+class PurgeJob:
+    """One purge of a user's logs older than `cutoff`"""
+    id: str
+    user_id: uuid.UUID
+    cutoff: datetime
+    session_factory: async_sessionmaker = field(repr=False)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    status: str = PURGE_QUEUED
+    deleted_count: int = 0
+    total_rows: Optional[int] = None
+    batches: int = 0
+    cancel_requested: bool = False
+    error: Optional[str] = None
+    finished_at: Optional[datetime] = None
+    finished_at_clock: Optional[float] = None
+
+    @property
+    def progress(self) -> Optional[float]:
+        if self.status == PURGE_DONE:
+            return 1.0
+        if not self.total_rows:
+            return None
+        return min(self.deleted_count / self.total_rows, 1.0)
+
+
+class OperationLogPurger:
+    """
+    Runs log purges as background tasks, one bounded DELETE at a time
+
+    Each batch deletes at most `batch_size` rows, picked through
+    idx_operation_logs_user_created, in its own short transaction, then
+    sleeps `pause_seconds`. Locks are held for one batch only, WAL is
+    written in small pieces, and replicas and autovacuum keep up. A
+    cancelled purge stops after the current batch; rows already deleted
+    stay deleted.
+
+    At most one purge per user is active; asking again returns it. At most
+    `concurrency` purges run at once, the rest wait as "queued". Finished
+    jobs stay visible for `retention_seconds`. State is per process.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        pause_seconds: float,
+        concurrency: int,
+        retention_seconds: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self.concurrency = concurrency
+        self.retention_seconds = retention_seconds
+        self._clock = clock
+        self._jobs: Dict[str, PurgeJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def active(self) -> int:
+        """Number of queued or running purges (for readiness reporting)"""
+        return sum(1 for job in self._jobs.values() if job.status in ACTIVE_STATUSES)
+
+    def submit(
+        self,
+        user_id: uuid.UUID,
+        cutoff: datetime,
+        session_factory: async_sessionmaker
+    ) -> Tuple[PurgeJob, bool]:
+        """
+        Start purging a user's logs created before `cutoff`
+
+        Args:
+            user_id: Owner of the logs
+            cutoff: Logs created before this moment are deleted
+            session_factory: Factory for the sessions the batches run in
+
+        Returns:
+            Tuple of (job, created); created is False when the user already
+            has an active purge, which is returned instead
+        """
+        self._purge_expired()
+        for job in self._jobs.values():
+            if job.user_id == user_id and job.status in ACTIVE_STATUSES:
+                return job, False
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.concurrency)
+
+        job = PurgeJob(id=secrets.token_urlsafe(16), user_id=user_id, cutoff=cutoff, session_factory=session_factory)
+        self._jobs[job.id] = job
+        self._tasks[job.id] = loop.create_task(self._run(job))
+        return job, True
+
+    def get(self, job_id: str, user_id: uuid.UUID) -> Optional[PurgeJob]:
+        """Get a job by id if it belongs to `user_id`"""
+        self._purge_expired()
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    def cancel(self, job: PurgeJob) -> None:
+        """Ask an active purge to stop after its current batch"""
+        if job.status in ACTIVE_STATUSES:
+            job.cancel_requested = True
+
+    async def wait(self, job: PurgeJob) -> None:
+        """Wait for a purge to finish (tests, shutdown)"""
+        task = self._tasks.get(job.id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def stop(self) -> None:
+        """Cancel running purges at the next batch boundary and wait for them"""
+        for job in self._jobs.values():
+            self.cancel(job)
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in self._tasks.values() if task.get_loop() is loop]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _purge_expired(self) -> None:
+        cutoff = self._clock() - self.retention_seconds
+        for job_id in [
+            job.id for job in self._jobs.values()
+            if job.finished_at_clock is not None and job.finished_at_clock < cutoff
+        ]:
+            self._jobs.pop(job_id)
+            self._tasks.pop(job_id, None)
+
+    def _finish(self, job: PurgeJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.now(timezone.utc)
+        job.finished_at_clock = self._clock()
+
+    async def _run(self, job: PurgeJob) -> None:
+        try:
+            async with self._slots:
+                if job.cancel_requested:
+                    self._finish(job, PURGE_CANCELLED)
+                    return
+                job.status = PURGE_RUNNING
+                await self._delete_batches(job)
+        except Exception as e:
+            logger.exception("Operation log purge %s failed", job.id)
+            self._finish(job, PURGE_FAILED, str(e))
+        finally:
+            self._tasks.pop(job.id, None)
+
+    async def _delete_batches(self, job: PurgeJob) -> None:
+        matching = (OperationLog.user_id == job.user_id, OperationLog.created_at < job.cutoff)
+
+        async with job.session_factory() as db:
+            job.total_rows = await db.scalar(select(func.count()).select_from(OperationLog).where(*matching))
+
+        batch_ids = select(OperationLog.id).where(*matching).limit(self.batch_size)
+        while not job.cancel_requested:
+            async with async_unit_of_work(job.session_factory) as db:
+                result = await db.execute(
+                    delete(OperationLog)
+                    .where(OperationLog.id.in_(batch_ids))
+                    .execution_options(synchronize_session=False)
+                )
+            job.deleted_count += result.rowcount
+            job.batches += 1
+            if result.rowcount < self.batch_size:
+                self._finish(job, PURGE_DONE)
+                return
+            await asyncio.sleep(self.pause_seconds)
+
+        self._finish(job, PURGE_CANCELLED)
+
+
+@lru_cache(maxsize=None)
+def get_operation_log_purger() -> OperationLogPurger:
+    """Get the process-wide operation log purger"""
+    return OperationLogPurger(
+        batch_size=settings.OPERATION_LOG_PURGE_BATCH_SIZE,
+        pause_seconds=settings.OPERATION_LOG_PURGE_PAUSE_SECONDS,
+        concurrency=settings.OPERATION_LOG_PURGE_CONCURRENCY,
+        retention_seconds=settings.OPERATION_LOG_PURGE_RETENTION_SECONDS
+    )
@@ -0,0 +1,361 @@
+"""
+Operation Log Service
+Filtering, indexed search and keyset pagination of user operation logs
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+import asyncio
+import base64
+import binascii
+import json
+import uuid
+
+from sqlalchemy import (
+    ColumnElement, Float, Select, bindparam, column, func, literal, literal_column, or_, select, text, tuple_
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from src.models.operation_log import SEARCH_FTS_TABLE, SEARCH_VECTOR_COLUMN, OperationLog
+from src.services.operation_log_archive import ArchiveQuery, OperationLogArchive, merge_logs
+from src.utils.fts import MIN_TRIGRAM_LENGTH, fts5_rowid_matches, trigram_phrase
+
+# Counting stops here; beyond it the total is the query planner's estimate
+TOTAL_COUNT_CAP = 10000
+
+CURSOR_VERSION = 1
+
+
+SORT_TIME = "time"
+SORT_RELEVANCE = "relevance"
+
+
+class InvalidCursorError(ValueError):
+    """Cursor could not be decoded"""
+
+
+def encode_cursor(
+    created_at: datetime, log_id: str, rank: Optional[float] = None, page_number: Optional[int] = None
+) -> str:
+    """
+    Encode the position after a log entry as an opaque cursor
+
+    Args:
+        created_at: created_at of the last entry on the page
+        log_id: id of the last entry on the page
+        rank: Search relevance of the last entry (relevance-sorted pages only)
+        page_number: 1-based number of the page the cursor leads to
+
+    Returns:
+        URL-safe cursor string
+    """
+    data = {"v": CURSOR_VERSION, "t": created_at.isoformat(), "id": log_id}
+    if rank is not None:
+        data["r"] = rank
+    if page_number is not None:
+        data["p"] = page_number
+    payload = json.dumps(data, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _cursor_payload(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Invalid cursor")
+    if payload.get("v") != CURSOR_VERSION:
+        raise InvalidCursorError("Unsupported cursor version")
+    return payload
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str, Optional[float]]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Returns:
+        Tuple of (created_at, log_id, rank); rank is None for time-sorted pages
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    payload = _cursor_payload(cursor)
+    try:
+        rank = payload.get("r")
+        return datetime.fromisoformat(payload["t"]), str(payload["id"]), None if rank is None else float(rank)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def cursor_page_number(cursor: Optional[str]) -> int:
+    """1-based page number a cursor leads to (1 without a cursor or for cursors that carry none)"""
+    if not cursor:
+        return 1
+    number = _cursor_payload(cursor).get("p", 1)
+    if not isinstance(number, int) or number < 1:
+        raise InvalidCursorError("Invalid cursor")
+    return number
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a SELECT, with the SELECT's own bind parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_row_count(db: AsyncSession, query: Select) -> Optional[int]:
+    """
+    Query planner's estimate of the rows a query returns
+
+    PostgreSQL only (from EXPLAIN, backed by the table statistics that
+    ANALYZE/autovacuum keep); other databases have no estimate.
+
+    Returns:
+        Estimated row count, or None where the database cannot estimate
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    plan = await db.scalar(_Explain(query))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def capped_count(db: AsyncSession, query: Select, key: ColumnElement) -> Tuple[int, bool]:
+    """
+    Count a query's rows, reading at most TOTAL_COUNT_CAP + 1 index entries
+
+    Past the cap the planner's estimate is returned instead (never below
+    the rows already seen). Databases without estimates (SQLite, used in
+    development) finish the exact count.
+
+    Args:
+        db: Async database session
+        query: Filtered query
+        key: Column to count (the primary key)
+
+    Returns:
+        Tuple of (total, is_estimate)
+    """
+    capped = query.with_only_columns(key).limit(TOTAL_COUNT_CAP + 1).subquery()
+    total = await db.scalar(select(func.count()).select_from(capped))
+    if total <= TOTAL_COUNT_CAP:
+        return total, False
+    estimate = await estimate_row_count(db, query.with_only_columns(key))
+    if estimate is None:
+        exact = query.with_only_columns(key).subquery()
+        return await db.scalar(select(func.count()).select_from(exact)), False
+    return max(estimate, total), True
+
+
+def _substring_match(term: str) -> ColumnElement[bool]:
+    pattern = f"%{term}%"
+    return or_(
+        OperationLog.action.ilike(pattern),
+        OperationLog.resource.ilike(pattern),
+        OperationLog.details.ilike(pattern)
+    )
+
+
+def search_condition(dialect_name: str, term: str) -> Tuple[ColumnElement[bool], ColumnElement[float]]:
+    """
+    Build the indexed search filter and relevance score for a search term
+
+    PostgreSQL matches the term as words against search_vector (GIN) or as a
+    substring of action, resource or details (pg_trgm GIN); substring-only
+    matches score 0. SQLite matches substrings through the FTS5 trigram
+    table and scores with bm25. Terms shorter than a trigram fall back to
+    ILIKE, which no index can serve.
+
+    Args:
+        dialect_name: Database dialect name ("postgresql" or "sqlite")
+        term: Search term as typed by the user
+
+    Returns:
+        Tuple of (filter, relevance); higher relevance is a better match
+    """
+    if dialect_name == "postgresql":
+        search_vector = literal_column(f"operation_logs.{SEARCH_VECTOR_COLUMN}", type_=TSVECTOR)
+        query = func.websearch_to_tsquery(literal_column("'simple'::regconfig"), bindparam("search_query", term))
+        relevance = func.ts_rank(search_vector, query, type_=Float)
+        return or_(search_vector.op("@@")(query), _substring_match(term)), relevance
+
+    if dialect_name == "sqlite" and len(term) >= MIN_TRIGRAM_LENGTH:
+        matches = fts5_rowid_matches(SEARCH_FTS_TABLE, term, "search_match")
+        # bm25 is lower-is-better; negate it so every dialect sorts relevance descending
+        relevance = text(
+            f"SELECT -rank FROM {SEARCH_FTS_TABLE} WHERE {SEARCH_FTS_TABLE} MATCH :search_rank "
+            f"AND rowid = operation_logs.rowid"
+        ).bindparams(search_rank=trigram_phrase(term)).columns(column("rank", Float)).scalar_subquery()
+        return literal_column("operation_logs.rowid").in_(matches), relevance
+
+    return _substring_match(term), literal(0.0, type_=Float)
+
+
+@dataclass
+class LogPage:
+    """One page of logs plus the cursor for the next page"""
+    logs: List[OperationLog]  # ArchivedLog for logs read from the archive
+    next_cursor: Optional[str]
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    number: int = 1
+
+
+class OperationLogService:
+    """
+    Service for reading operation logs
+
+    Pages are ordered by (created_at DESC, id DESC) and continue from a
+    cursor with a row-value comparison, so every page is one range scan of
+    idx_operation_logs_user_created no matter how deep the user pages.
+    Search filters go through the full-text/trigram indexes (see
+    search_condition); relevance-sorted pages put the score first in the
+    ordering and the cursor.
+
+    With an archive, time-sorted pages merge the hot rows with archived
+    logs that match the same filters (see operation_log_archive).
+    Relevance-sorted pages cover hot rows only: archived logs have no score.
+    """
+
+    def __init__(self, db: AsyncSession, archive: Optional[OperationLogArchive] = None):
+        self.db = db
+        self.archive = archive
+
+    @property
+    def dialect_name(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    def build_query(
+        self,
+        user_id: uuid.UUID,
+        action: Optional[str] = None,
+        result: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        search: Optional[str] = None
+    ) -> Select:
+        """
+        Build the filtered query for one user's logs (no ordering)
+
+        "all" for action or result means no filter.
+        """
+        query = select(OperationLog).where(OperationLog.user_id == user_id)
+
+        if action and action != 'all':
+            query = query.where(OperationLog.action == action)
+        if result and result != 'all':
+            query = query.where(OperationLog.result == result)
+        if start_date:
+            query = query.where(OperationLog.created_at >= start_date)
+        if end_date:
+            query = query.where(OperationLog.created_at <= end_date)
+        if search:
+            query = query.where(search_condition(self.dialect_name, search)[0])
+
+        return query
+
+    def relevance(self, search: str) -> ColumnElement[float]:
+        """Relevance score of a log for a search term, for get_page(relevance=...)"""
+        return search_condition(self.dialect_name, search)[1]
+
+    async def get_page(
+        self,
+        query: Select,
+        size: int,
+        cursor: Optional[str] = None,
+        with_total: bool = False,
+        relevance: Optional[ColumnElement[float]] = None,
+        archived: Optional[ArchiveQuery] = None
+    ) -> LogPage:
+        """
+        Get one page of a filtered log query
+
+        Args:
+            query: Query from build_query
+            size: Page size
+            cursor: next_cursor of the previous page (None for the first page)
+            with_total: Also count matching logs (estimated past TOTAL_COUNT_CAP)
+            relevance: Order by this score (from relevance()) before created_at
+            archived: The same filters as `query`, to merge in archived logs
+                (time-sorted pages only, and only if the service has an archive)
+
+        Returns:
+            LogPage with the logs and the cursor of the following page
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        page_query = query
+        order_by = [OperationLog.created_at.desc(), OperationLog.id.desc()]
+        if relevance is not None:
+            page_query = page_query.add_columns(relevance.label("relevance"))
+            order_by.insert(0, relevance.desc())
+
+        position = None
+        number = cursor_page_number(cursor)
+        if cursor:
+            created_at, log_id, rank = decode_cursor(cursor)
+            if (rank is None) != (relevance is None):
+                raise InvalidCursorError("Cursor belongs to a different sort order")
+            if relevance is None:
+                position = (created_at, log_id)
+                page_query = page_query.where(
+                    tuple_(OperationLog.created_at, OperationLog.id) < tuple_(created_at, log_id)
+                )
+            else:
+                page_query = page_query.where(
+                    tuple_(relevance, OperationLog.created_at, OperationLog.id) < tuple_(rank, created_at, log_id)
+                )
+
+        # One extra row tells whether another page exists
+        rows = (await self.db.execute(page_query.order_by(*order_by).limit(size + 1))).all()
+
+        if archived is not None and self.archive is not None and relevance is None:
+            archived_logs = await asyncio.to_thread(self.archive.read, archived, position, size + 1)
+            logs = merge_logs([row[0] for row in rows], archived_logs, size + 1)
+            ranks = None
+        else:
+            logs = [row[0] for row in rows]
+            ranks = None if relevance is None else [row.relevance for row in rows]
+
+        next_cursor = None
+        if len(logs) > size:
+            last = logs[size - 1]
+            rank = None if ranks is None else float(ranks[size - 1] or 0.0)
+            next_cursor = encode_cursor(last.created_at, last.id, rank, page_number=number + 1)
+
+        page = LogPage(logs=logs[:size], next_cursor=next_cursor, number=number)
+        if with_total:
+            page.total, page.total_is_estimate = await self.count(query, archived)
+        return page
+
+    async def count(self, query: Select, archived: Optional[ArchiveQuery] = None) -> Tuple[int, bool]:
+        """
+        Count matching logs (see capped_count)
+
+        Archived logs matching `archived` are included when the service has
+        an archive; they are counted up to TOTAL_COUNT_CAP + 1, so a total
+        that goes past the cap through archived logs is a lower bound.
+
+        Returns:
+            Tuple of (total, is_estimate)
+        """
+        total, is_estimate = await capped_count(self.db, query, OperationLog.id)
+        if archived is not None and self.archive is not None:
+            archived_total = await asyncio.to_thread(self.archive.count, archived, TOTAL_COUNT_CAP)
+            total += archived_total
+            is_estimate = is_estimate or archived_total > TOTAL_COUNT_CAP
+        return total, is_estimate
@@ -0,0 +1,182 @@
+"""
+Operation Log Writer
+Buffers operation log rows and writes them with multi-row INSERTs off the request path
+"""
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.config import settings
+from src.database import async_unit_of_work
+from src.models.operation_log import OperationLog, OperationResult
+from src.utils.uuid7 import uuid7
+
+logger = logging.getLogger(__name__)
+
+# Bind parameters per statement stay under the drivers' limits
+# (asyncpg: 32767, SQLite >= 3.32: 32766)
+MAX_BIND_PARAMS = 32000
+
+
+def operation_log_row(
+    user_id: uuid.UUID,
+    action: str,
+    resource: str,
+    result: OperationResult,
+    details: Optional[str] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    created_at: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Build one row for OperationLogWriter.enqueue
+
+    Ids are UUIDv7 strings, so buffered rows append to the right edge of
+    the primary key index. Every row has the same keys, as a multi-row
+    VALUES clause requires.
+    """
+    return {
+        "id": str(uuid7()),
+        "user_id": user_id,
+        "action": action,
+        "resource": resource,
+        "result": result,
+        "details": details,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "created_at": created_at or datetime.now(timezone.utc),
+    }
+
+
+class OperationLogWriter:
+    """
+    Asynchronous, batching writer for operation logs
+
+    enqueue() only appends to an in-memory buffer; a background task
+    writes the buffer in chunks of `batch_size` rows, one multi-row INSERT
+    and one commit per chunk, whenever a chunk is full or
+    `flush_interval_seconds` has passed.
+
+    Writes are best effort: rows still buffered when the process dies are
+    lost. A chunk rejected for its data (e.g. one row's user_id violating
+    the foreign key) is split in halves and retried down to single rows,
+    so only the offending rows are dropped; a chunk that fails for any
+    other reason (database unreachable) is dropped whole. Dropped rows are
+    counted in `failed`. When more than `max_pending` rows are waiting,
+    enqueue() refuses new rows instead of growing without bound.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[async_sessionmaker] = None,
+        batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        max_pending: int = 20000
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self.written = 0
+        self.failed = 0
+        self.refused = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+    def pending(self) -> int:
+        """Number of buffered rows (for readiness reporting)"""
+        return len(self._pending)
+
+    def enqueue(self, rows: List[Dict[str, Any]]) -> bool:
+        """
+        Buffer rows for writing (must be called on the event loop)
+
+        Args:
+            rows: Rows from operation_log_row()
+
+        Returns:
+            False if the buffer is full and the rows were refused
+        """
+        if len(self._pending) + len(rows) > self.max_pending:
+            self.refused += len(rows)
+            return False
+
+        self._pending.extend(rows)
+        self._ensure_running()
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write everything buffered so far"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            while self._pending:
+                rows_per_statement = min(self.batch_size, MAX_BIND_PARAMS // len(self._pending[0]))
+                batch = self._pending[:rows_per_statement]
+                del self._pending[:rows_per_statement]
+                await self._write(batch)
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            async with async_unit_of_work(self.session_factory) as db:
+                # One INSERT ... VALUES (...), (...), ... per chunk
+                await db.execute(insert(OperationLog).values(batch))
+            self.written += len(batch)
+        except (IntegrityError, DataError):
+            if len(batch) == 1:
+                self.failed += 1
+                logger.exception("Dropped an operation log row rejected by the database")
+                return
+            # Bisect to isolate the rejected rows; the rest are still written
+            middle = len(batch) // 2
+            await self._write(batch[:middle])
+            await self._write(batch[middle:])
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("Dropped %d operation log rows after a failed insert", len(batch))
+
+    async def stop(self) -> None:
+        """Stop the background task and write what is left"""
+        task, self._task = self._task, None
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.flush()
+
+
+@lru_cache(maxsize=None)
+def get_operation_log_writer() -> OperationLogWriter:
+    """Get the process-wide operation log writer (also a FastAPI dependency)"""
+    return OperationLogWriter(
+        batch_size=settings.OPERATION_LOG_WRITER_BATCH_SIZE,
+        flush_interval_seconds=settings.OPERATION_LOG_WRITER_FLUSH_SECONDS,
+        max_pending=settings.OPERATION_LOG_WRITER_MAX_PENDING
+    )
@@ -0,0 +1,248 @@
+"""
+RBAC Snapshot
+Role and user permissions as integer bitmasks, rebuilt when the RBAC version changes
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+import uuid
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.database import SessionLocal
+from src.models.role import RBAC_STATE_ID, Permission, RbacState, Role, role_permissions, user_roles
+
+# Access-token claims: the holder's permission mask (hex) and the RBAC version it was computed at
+PERMISSION_CLAIM = "perm"
+RBAC_VERSION_CLAIM = "rbv"
+
+
+@dataclass(frozen=True)
+class RbacSnapshot:
+    """
+    Every permission's bit and every role's permission mask at one RBAC version
+
+    Bits come from Permission.bit_index, which is assigned once and never
+    reused, so a mask means the same thing in every snapshot and process.
+    """
+    version: int
+    permission_bits: Dict[str, int]
+    role_masks: Dict[uuid.UUID, int]
+
+    def mask_for_roles(self, role_ids: Iterable[uuid.UUID]) -> int:
+        """OR of the roles' masks: the permission mask of a user holding them"""
+        mask = 0
+        for role_id in role_ids:
+            mask |= self.role_masks.get(role_id, 0)
+        return mask
+
+    def allows(self, mask: int, permission_name: str) -> bool:
+        """Whether a mask grants a permission (unknown permissions are never granted)"""
+        bit = self.permission_bits.get(permission_name)
+        return bit is not None and bool(mask & (1 << bit))
+
+    def permission_names(self, mask: int) -> List[str]:
+        """Names of the permissions in a mask, in bit order"""
+        return [
+            name for name, bit in sorted(self.permission_bits.items(), key=lambda item: item[1])
+            if mask & (1 << bit)
+        ]
+
+
+def _version_query():
+    return select(RbacState.version).where(RbacState.id == RBAC_STATE_ID)
+
+
+def _snapshot_queries():
+    return (
+        select(Permission.name, Permission.bit_index),
+        select(Role.id),
+        select(role_permissions.c.role_id, Permission.bit_index).join(
+            Permission, Permission.id == role_permissions.c.permission_id
+        ),
+    )
+
+
+def build_snapshot(
+    version: Optional[int],
+    permissions: Iterable[Tuple[str, int]],
+    roles: Iterable[uuid.UUID],
+    grants: Iterable[Tuple[uuid.UUID, int]]
+) -> RbacSnapshot:
+    """
+    Build a snapshot from query results
+
+    Args:
+        version: RbacState.version (None if the row does not exist yet)
+        permissions: (name, bit_index) of every permission
+        roles: Id of every role
+        grants: (role_id, bit_index) of every role-permission pair
+    """
+    role_masks = {role_id: 0 for role_id in roles}
+    for role_id, bit in grants:
+        role_masks[role_id] = role_masks.get(role_id, 0) | (1 << bit)
+    return RbacSnapshot(
+        version=version or 0,
+        permission_bits={name: bit for name, bit in permissions},
+        role_masks=role_masks
+    )
+
+
+def load_snapshot(session: Session) -> RbacSnapshot:
+    """Load the current snapshot with a sync session"""
+    version = session.scalar(_version_query())
+    permissions, roles, grants = (session.execute(query).all() for query in _snapshot_queries())
+    return build_snapshot(version, permissions, (row[0] for row in roles), grants)
+
+
+async def load_snapshot_async(db: AsyncSession) -> RbacSnapshot:
+    """Load the current snapshot with an async session"""
+    version = await db.scalar(_version_query())
+    permissions, roles, grants = [(await db.execute(query)).all() for query in _snapshot_queries()]
+    return build_snapshot(version, permissions, (row[0] for row in roles), grants)
+
+
+class RbacRegistry:
+    """
+    Process-wide holder of the current RbacSnapshot
+
+    Changes committed in this process drop the snapshot at once (see
+    _invalidate_after_commit). Changes from other processes are noticed by
+    re-reading RbacState.version at most every `check_interval_seconds`;
+    the snapshot is reloaded only when the version moved.
+    """
+
+    def __init__(self, check_interval_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.check_interval_seconds = check_interval_seconds
+        self._clock = clock
+        self._snapshot: Optional[RbacSnapshot] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next current() reloads it"""
+        self._snapshot = None
+
+    def _fresh(self) -> Optional[RbacSnapshot]:
+        snapshot = self._snapshot
+        if snapshot is not None and self._clock() - self._checked_at < self.check_interval_seconds:
+            return snapshot
+        return None
+
+    def current(self, session: Optional[Session] = None) -> RbacSnapshot:
+        """
+        Get the current snapshot, reading the database with a sync session if needed
+
+        Args:
+            session: Session to read with (a short-lived one is opened if None)
+        """
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+        if session is None:
+            with SessionLocal() as own_session:
+                return self.current(own_session)
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or session.scalar(_version_query()) != snapshot.version:
+                snapshot = load_snapshot(session)
+            self._snapshot, self._checked_at = snapshot, self._clock()
+        return snapshot
+
+    async def current_async(self, db: AsyncSession) -> RbacSnapshot:
+        """Get the current snapshot, reading the database with an async session if needed"""
+        snapshot = self._fresh()
+        if snapshot is not None:
+            return snapshot
+
+        snapshot = self._snapshot
+        if snapshot is None or await db.scalar(_version_query()) != snapshot.version:
+            snapshot = await load_snapshot_async(db)
+        self._snapshot, self._checked_at = snapshot, self._clock()
+        return snapshot
+
+
+@dataclass(frozen=True)
+class GrantedPermissions:
+    """A caller's permission mask checked against the snapshot it belongs to"""
+    snapshot: RbacSnapshot
+    mask: int
+
+    def allows(self, permission_name: str) -> bool:
+        return self.snapshot.allows(self.mask, permission_name)
+
+
+def permission_claims(mask: int, version: int) -> Dict[str, Any]:
+    """Access-token claims carrying a permission mask and the RBAC version it is valid for"""
+    return {PERMISSION_CLAIM: format(mask, "x"), RBAC_VERSION_CLAIM: version}
+
+
+def mask_from_claims(claims: Dict[str, Any], version: int) -> Optional[int]:
+    """
+    Read the permission mask from access-token claims
+
+    Args:
+        claims: Decoded access-token claims
+        version: Current RBAC version
+
+    Returns:
+        The mask, or None if the token has none or was issued at another version
+    """
+    if claims.get(RBAC_VERSION_CLAIM) != version:
+        return None
+    try:
+        return int(claims[PERMISSION_CLAIM], 16)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+async def load_user_mask(db: AsyncSession, user_id: uuid.UUID, snapshot: RbacSnapshot) -> int:
+    """Compute a user's permission mask from their role ids (one query)"""
+    role_ids = await db.scalars(select(user_roles.c.role_id).where(user_roles.c.user_id == user_id))
+    return snapshot.mask_for_roles(role_ids.all())
+
+
+async def resolve_token_permissions(db: AsyncSession, user_id: uuid.UUID, claims: Dict[str, Any]) -> GrantedPermissions:
+    """
+    Permissions of an access token's holder
+
+    The token's own mask is used while its RBAC version is current, so most
+    requests authorize without touching the database. A token issued before
+    the latest role/permission change falls back to the user's roles.
+
+    Args:
+        db: Database session (used only for a stale token or a version check)
+        user_id: Token subject
+        claims: Decoded access-token claims
+    """
+    snapshot = await get_rbac_registry().current_async(db)
+    mask = mask_from_claims(claims, snapshot.version)
+    if mask is None:
+        mask = await load_user_mask(db, user_id, snapshot)
+    return GrantedPermissions(snapshot, mask)
+
+
+@lru_cache(maxsize=None)
+def get_rbac_registry() -> RbacRegistry:
+    """Get the process-wide RBAC snapshot registry"""
+    return RbacRegistry(check_interval_seconds=settings.RBAC_VERSION_CHECK_SECONDS)
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop("rbac_changed", False):
+        get_rbac_registry().invalidate()
+
+
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop("rbac_changed", None)
+
+
+# Commits in this process drop the snapshot at once; other processes see the new version
+event.listen(Session, "after_commit", _invalidate_after_commit)
+event.listen(Session, "after_rollback", _forget_after_rollback)
@@ -0,0 +1,104 @@
+"""
+Security Log Export
+Export source and filters for a user's security audit trail
+"""
+from datetime import datetime
+from typing import Iterable, Optional, Sequence
+import csv
+import io
+import json
+import uuid
+
+from sqlalchemy import Row, Select, select
+
+from src.models.security_log import EventResult, EventType, SecurityLog
+from src.services.operation_log_export import EXPORT_FORMAT_CSV, ExportSource
+
+CSV_HEADER = ['timestamp', 'event_type', 'result', 'ip_address', 'user_agent', 'failure_reason', 'additional_context']
+
+EXPORT_COLUMNS = (
+    SecurityLog.id,
+    SecurityLog.user_id,
+    SecurityLog.timestamp,
+    SecurityLog.event_type,
+    SecurityLog.result,
+    SecurityLog.ip_address,
+    SecurityLog.user_agent,
+    SecurityLog.failure_reason,
+    SecurityLog.additional_context,
+)
+
+
+def build_security_log_query(
+    user_id: uuid.UUID,
+    event_type: Optional[str] = None,
+    result: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> Select:
+    """
+    Build the filtered query for one user's security logs (no ordering)
+
+    Served by idx_security_logs_user_time.
+
+    Raises:
+        ValueError: If event_type or result is not a known value
+    """
+    query = select(SecurityLog).where(SecurityLog.user_id == user_id)
+
+    if event_type:
+        query = query.where(SecurityLog.event_type == EventType(event_type))
+    if result:
+        query = query.where(SecurityLog.result == EventResult(result))
+    if start_date:
+        query = query.where(SecurityLog.timestamp >= start_date)
+    if end_date:
+        query = query.where(SecurityLog.timestamp <= end_date)
+
+    return query
+
+
+def _record(row: Row) -> dict:
+    return {
+        "timestamp": row.timestamp.isoformat(),
+        "event_type": row.event_type.value,
+        "result": row.result.value,
+        "ip_address": row.ip_address,
+        "user_agent": row.user_agent,
+        "failure_reason": row.failure_reason,
+        "additional_context": row.additional_context,
+    }
+
+
+def format_rows(fmt: str, rows: Sequence[Row], user_name: str, header: bool = False) -> bytes:
+    """
+    Encode one batch of security log rows
+
+    Args:
+        fmt: "csv" or "ndjson"
+        rows: Rows selected with EXPORT_COLUMNS
+        user_name: Unused (the export is the user's own trail)
+        header: Prepend the CSV header (first batch only)
+
+    Returns:
+        UTF-8 encoded chunk
+    """
+    records: Iterable[dict] = (_record(row) for row in rows)
+    if fmt == EXPORT_FORMAT_CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(CSV_HEADER)
+        for record in records:
+            context = record["additional_context"]
+            record["additional_context"] = json.dumps(context, ensure_ascii=False) if context is not None else None
+            writer.writerow(record[column] for column in CSV_HEADER)
+        return buffer.getvalue().encode("utf-8")
+    return "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8")
+
+
+SECURITY_LOG_EXPORT = ExportSource(
+    columns=EXPORT_COLUMNS,
+    order_by=(SecurityLog.timestamp.desc(), SecurityLog.id.desc()),
+    format_rows=format_rows
+)
@@ -4,8 +4,8 @@
 """
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import (
     User, LoginAttempt, IPFreeze, EmailVerificationLimit, 
@@ -16,10 +16,10 @@ from src.utils.security import hash_password, verify_password
 class SecurityService:
     """安全策略服务类"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def record_login_attempt(
+    async def record_login_attempt(
         self,
         email: str,
         ip_address: str,
@@ -44,24 +44,24 @@ class SecurityService:
         )
         
         self.db.add(login_attempt)
-        self.db.commit()
-        self.db.refresh(login_attempt)
+        await self.db.flush()
+        await self.db.refresh(login_attempt)
         
         return login_attempt
     
-    def check_ip_freeze(self, ip_address: str) -> bool:
+    async def check_ip_freeze(self, ip_address: str) -> bool:
         """检查IP是否被冻结"""
-        freeze_record = self.db.query(IPFreeze).filter(
+        freeze_record = await self.db.scalar(select(IPFreeze).where(
             and_(
                 IPFreeze.ip_address == ip_address,
                 IPFreeze.manually_unfrozen == False,
                 IPFreeze.unfreeze_at > datetime.utcnow()
             )
-        ).first()
+        ))
         
         return freeze_record is not None
     
-    def get_failed_attempts_count(
+    async def get_failed_attempts_count(
         self, 
         identifier: str, 
         identifier_type: str = "email",
@@ -72,7 +72,7 @@ class SecurityService:
         since_time = datetime.utcnow() - time_window
         
         if identifier_type == "email":
-            count = self.db.query(LoginAttempt).filter(
+            count = await self.db.scalar(select(func.count()).select_from(LoginAttempt).where(
                 and_(
                     LoginAttempt.email == identifier,
                     LoginAttempt.attempt_time >= since_time,
@@ -81,9 +81,9 @@ class SecurityService:
                         LoginAttemptResult.FAILED_CAPTCHA.value
                     ])
                 )
-            ).count()
+            ))
         elif identifier_type == "ip":
-            count = self.db.query(LoginAttempt).filter(
+            count = await self.db.scalar(select(func.count()).select_from(LoginAttempt).where(
                 and_(
                     LoginAttempt.ip_address == identifier,
                     LoginAttempt.attempt_time >= since_time,
@@ -92,13 +92,13 @@ class SecurityService:
                         LoginAttemptResult.FAILED_CAPTCHA.value
                     ])
                 )
-            ).count()
+            ))
         else:
             count = 0
         
         return count
     
-    def should_require_captcha(
+    async def should_require_captcha(
         self, 
         email: str, 
         ip_address: str,
@@ -108,21 +108,21 @@ class SecurityService:
         
         if security_level == SecurityLevel.BASIC:
             # 基础策略：失败1次后需要验证码
-            email_failures = self.get_failed_attempts_count(email, "email", timedelta(minutes=15))
-            ip_failures = self.get_failed_attempts_count(ip_address, "ip", timedelta(minutes=15))
+            email_failures = await self.get_failed_attempts_count(email, "email", timedelta(minutes=15))
+            ip_failures = await self.get_failed_attempts_count(ip_address, "ip", timedelta(minutes=15))
             
             return email_failures >= 1 or ip_failures >= 1
         
         elif security_level == SecurityLevel.ADVANCED:
             # 高级策略：失败3次后需要验证码
-            email_failures = self.get_failed_attempts_count(email, "email", timedelta(minutes=15))
-            ip_failures = self.get_failed_attempts_count(ip_address, "ip", timedelta(minutes=15))
+            email_failures = await self.get_failed_attempts_count(email, "email", timedelta(minutes=15))
+            ip_failures = await self.get_failed_attempts_count(ip_address, "ip", timedelta(minutes=15))
             
             return email_failures >= 3 or ip_failures >= 3
         
         return False
     
-    def should_freeze_ip(
+    async def should_freeze_ip(
         self, 
         ip_address: str,
         security_level: SecurityLevel = SecurityLevel.ADVANCED
@@ -133,11 +133,11 @@ class SecurityService:
             return False
         
         # 高级策略：失败5次后冻结IP
-        ip_failures = self.get_failed_attempts_count(ip_address, "ip", timedelta(minutes=15))
+        ip_failures = await self.get_failed_attempts_count(ip_address, "ip", timedelta(minutes=15))
         
         return ip_failures >= 5
     
-    def freeze_ip(
+    async def freeze_ip(
         self, 
         ip_address: str, 
         reason: str = "多次登录失败",
@@ -146,19 +146,19 @@ class SecurityService:
         """冻结IP地址"""
         
         # 检查是否已经冻结
-        existing_freeze = self.db.query(IPFreeze).filter(
+        existing_freeze = await self.db.scalar(select(IPFreeze).where(
             and_(
                 IPFreeze.ip_address == ip_address,
                 IPFreeze.manually_unfrozen == False,
                 IPFreeze.unfreeze_at > datetime.utcnow()
             )
-        ).first()
+        ))
         
         if existing_freeze:
             return existing_freeze
         
         # 获取失败尝试次数
-        failed_attempts = self.get_failed_attempts_count(ip_address, "ip", timedelta(minutes=15))
+        failed_attempts = await self.get_failed_attempts_count(ip_address, "ip", timedelta(minutes=15))
         
         # 创建冻结记录
         ip_freeze = IPFreeze(
@@ -169,20 +169,20 @@ class SecurityService:
         )
         
         self.db.add(ip_freeze)
-        self.db.commit()
-        self.db.refresh(ip_freeze)
+        await self.db.flush()
+        await self.db.refresh(ip_freeze)
         
         return ip_freeze
     
-    def unfreeze_ip(self, ip_address: str, unfrozen_by: str) -> bool:
+    async def unfreeze_ip(self, ip_address: str, unfrozen_by: str) -> bool:
         """手动解冻IP地址"""
         
-        freeze_record = self.db.query(IPFreeze).filter(
+        freeze_record = await self.db.scalar(select(IPFreeze).where(
             and_(
                 IPFreeze.ip_address == ip_address,
                 IPFreeze.manually_unfrozen == False
             )
-        ).first()
+        ))
         
         if not freeze_record:
             return False
@@ -191,21 +191,20 @@ class SecurityService:
         freeze_record.unfrozen_by = unfrozen_by
         freeze_record.unfrozen_at = datetime.utcnow()
         
-        self.db.commit()
         
         return True
     
-    def get_frozen_ips(self, limit: int = 100) -> List[IPFreeze]:
+    async def get_frozen_ips(self, limit: int = 100) -> List[IPFreeze]:
         """获取冻结的IP列表"""
         
-        return self.db.query(IPFreeze).filter(
+        return (await self.db.scalars(select(IPFreeze).where(
             and_(
                 IPFreeze.manually_unfrozen == False,
                 IPFreeze.unfreeze_at > datetime.utcnow()
             )
-        ).order_by(IPFreeze.frozen_at.desc()).limit(limit).all()
+        ).order_by(IPFreeze.frozen_at.desc()).limit(limit))).all()
     
-    def check_email_verification_limit(
+    async def check_email_verification_limit(
         self, 
         email: str, 
         ip_address: str,
@@ -220,13 +219,13 @@ class SecurityService:
         window_start = now - time_window
         
         # 检查邮箱限制
-        email_limit = self.db.query(EmailVerificationLimit).filter(
+        email_limit = await self.db.scalar(select(EmailVerificationLimit).where(
             and_(
                 EmailVerificationLimit.limit_type == "email",
                 EmailVerificationLimit.identifier == email,
                 EmailVerificationLimit.window_start >= window_start
             )
-        ).first()
+        ))
         
         if email_limit and email_limit.request_count >= max_per_email:
             return {
@@ -236,13 +235,13 @@ class SecurityService:
             }
         
         # 检查IP限制
-        ip_limit = self.db.query(EmailVerificationLimit).filter(
+        ip_limit = await self.db.scalar(select(EmailVerificationLimit).where(
             and_(
                 EmailVerificationLimit.limit_type == "ip",
                 EmailVerificationLimit.identifier == ip_address,
                 EmailVerificationLimit.window_start >= window_start
             )
-        ).first()
+        ))
         
         if ip_limit and ip_limit.request_count >= max_per_ip:
             return {
@@ -252,13 +251,13 @@ class SecurityService:
             }
         
         # 检查全局限制
-        global_limit = self.db.query(EmailVerificationLimit).filter(
+        global_limit = await self.db.scalar(select(EmailVerificationLimit).where(
             and_(
                 EmailVerificationLimit.limit_type == "global",
                 EmailVerificationLimit.identifier == "global",
                 EmailVerificationLimit.window_start >= window_start
             )
-        ).first()
+        ))
         
         if global_limit and global_limit.request_count >= max_global:
             return {
@@ -269,7 +268,7 @@ class SecurityService:
         
         return {"allowed": True}
     
-    def record_email_verification_request(
+    async def record_email_verification_request(
         self, 
         email: str, 
         ip_address: str,
@@ -282,13 +281,13 @@ class SecurityService:
         window_end = now + time_window
         
         # 更新或创建邮箱限制记录
-        email_limit = self.db.query(EmailVerificationLimit).filter(
+        email_limit = await self.db.scalar(select(EmailVerificationLimit).where(
             and_(
                 EmailVerificationLimit.limit_type == "email",
                 EmailVerificationLimit.identifier == email,
                 EmailVerificationLimit.window_start >= window_start
             )
-        ).first()
+        ))
         
         if email_limit:
             email_limit.request_count += 1
@@ -305,13 +304,13 @@ class SecurityService:
             self.db.add(email_limit)
         
         # 更新或创建IP限制记录
-        ip_limit = self.db.query(EmailVerificationLimit).filter(
+        ip_limit = await self.db.scalar(select(EmailVerificationLimit).where(
             and_(
                 EmailVerificationLimit.limit_type == "ip",
                 EmailVerificationLimit.identifier == ip_address,
                 EmailVerificationLimit.window_start >= window_start
             )
-        ).first()
+        ))
         
         if ip_limit:
             ip_limit.request_count += 1
@@ -328,13 +327,13 @@ class SecurityService:
             self.db.add(ip_limit)
         
         # 更新或创建全局限制记录
-        global_limit = self.db.query(EmailVerificationLimit).filter(
+        global_limit = await self.db.scalar(select(EmailVerificationLimit).where(
             and_(
                 EmailVerificationLimit.limit_type == "global",
                 EmailVerificationLimit.identifier == "global",
                 EmailVerificationLimit.window_start >= window_start
             )
-        ).first()
+        ))
         
         if global_limit:
             global_limit.request_count += 1
@@ -350,14 +349,14 @@ class SecurityService:
             )
             self.db.add(global_limit)
         
-        self.db.commit()
+        await self.db.flush()
     
-    def get_security_level(self) -> SecurityLevel:
+    async def get_security_level(self) -> SecurityLevel:
         """获取当前安全策略级别"""
         
-        config = self.db.query(SystemConfig).filter(
+        config = await self.db.scalar(select(SystemConfig).where(
             SystemConfig.key == "security.login.security_level"
-        ).first()
+        ))
         
         if config and config.value:
             try:
@@ -382,7 +381,7 @@ class SecurityService:
         
         return False, None
     
-    def increment_failed_attempts(self, user, ip_address: str) -> int:
+    async def increment_failed_attempts(self, user, ip_address: str) -> int:
         """增加失败尝试次数"""
         if not user:
             return 0
@@ -394,10 +393,9 @@ class SecurityService:
             user.account_status = 'locked'
             user.account_locked_until = datetime.utcnow() + timedelta(minutes=30)
         
-        self.db.commit()
         return user.failed_login_attempts
     
-    def reset_failed_attempts(self, user):
+    async def reset_failed_attempts(self, user):
         """重置失败尝试次数"""
         if not user:
             return
@@ -407,14 +405,13 @@ class SecurityService:
         if user.account_status == 'locked':
             user.account_status = 'active'
         
-        self.db.commit()
     
     def log_event(self, event_type: str, result: str, user_id=None, ip_address=None, details=None, user_agent=None):
         """记录安全事件日志"""
         # 简化版本，实际应该记录到SecurityLog表
         print(f"Security Event: {event_type} - {result} - User: {user_id} - IP: {ip_address} - Details: {details} - UserAgent: {user_agent}")
     
-    def get_security_statistics(self) -> Dict[str, Any]:
+    async def get_security_statistics(self) -> Dict[str, Any]:
         """获取安全统计信息"""
         
         now = datetime.utcnow()
@@ -422,11 +419,11 @@ class SecurityService:
         last_7d = now - timedelta(days=7)
         
         # 登录尝试统计
-        total_attempts_24h = self.db.query(LoginAttempt).filter(
+        total_attempts_24h = await self.db.scalar(select(func.count()).select_from(LoginAttempt).where(
             LoginAttempt.attempt_time >= last_24h
-        ).count()
+        ))
         
-        failed_attempts_24h = self.db.query(LoginAttempt).filter(
+        failed_attempts_24h = await self.db.scalar(select(func.count()).select_from(LoginAttempt).where(
             and_(
                 LoginAttempt.attempt_time >= last_24h,
                 LoginAttempt.result.in_([
@@ -434,23 +431,23 @@ class SecurityService:
                     LoginAttemptResult.FAILED_CAPTCHA.value
                 ])
             )
-        ).count()
+        ))
         
         # IP冻结统计
-        active_frozen_ips = self.db.query(IPFreeze).filter(
+        active_frozen_ips = await self.db.scalar(select(func.count()).select_from(IPFreeze).where(
             and_(
                 IPFreeze.manually_unfrozen == False,
                 IPFreeze.unfreeze_at > now
             )
-        ).count()
+        ))
         
         # 邮箱验证码统计
-        email_requests_24h = self.db.query(EmailVerificationLimit).filter(
+        email_requests_24h = await self.db.scalar(select(func.count()).select_from(EmailVerificationLimit).where(
             and_(
                 EmailVerificationLimit.limit_type == "email",
                 EmailVerificationLimit.last_request >= last_24h
             )
-        ).count()
+        ))
         
         return {
             "login_attempts_24h": total_attempts_24h,
@@ -458,7 +455,7 @@ class SecurityService:
             "success_rate_24h": (total_attempts_24h - failed_attempts_24h) / max(total_attempts_24h, 1) * 100,
             "active_frozen_ips": active_frozen_ips,
             "email_requests_24h": email_requests_24h,
-            "security_level": self.get_security_level().value
+            "security_level": (await self.get_security_level()).value
         }
 
 
@@ -0,0 +1,188 @@
+"""
+System Config Service
+Typed values and one-statement bulk saves for system configs
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List
+import json
+import uuid
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import SystemConfig, SystemConfigState
+from src.models.admin_stats import STAT_TOTAL_CONFIGS, apply_stat_deltas
+from src.models.role import CONFIG_STATE_ID
+
+VALUE_TYPES = ("string", "int", "bool", "json")
+
+_TRUE = frozenset({"true", "1", "yes", "on"})
+_FALSE = frozenset({"false", "0", "no", "off"})
+
+
+class ConfigValueError(ValueError):
+    """Raised when submitted values do not match their configs' value_type"""
+
+    def __init__(self, errors: Dict[str, str]):
+        super().__init__(", ".join(f"{key}: {error}" for key, error in errors.items()))
+        self.errors = errors
+
+
+@dataclass
+class ConfigSaveResult:
+    """Keys written by a bulk save and the config version after it"""
+    saved: List[str]
+    created: int
+    version: int
+
+
+def infer_value_type(value: Any) -> str:
+    """value_type for a new config, from the JSON type of its submitted value"""
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, (dict, list)):
+        return "json"
+    return "string"
+
+
+def coerce_config_value(value: Any, value_type: str) -> str:
+    """
+    Convert a submitted value to its stored text for a value_type
+
+    Args:
+        value: Submitted JSON value
+        value_type: One of VALUE_TYPES (unknown types are stored as strings)
+
+    Returns:
+        Text for SystemConfig.value ("true"/"false" for bool, canonical JSON for json)
+
+    Raises:
+        ValueError: If the value cannot represent the type
+    """
+    if value_type == "bool":
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        text = str(value).strip().lower()
+        if text in _TRUE:
+            return "true"
+        if text in _FALSE:
+            return "false"
+        raise ValueError("expected a boolean")
+    if value_type == "int":
+        if isinstance(value, bool) or isinstance(value, float) and not value.is_integer():
+            raise ValueError("expected an integer")
+        try:
+            return str(int(value))
+        except (TypeError, ValueError):
+            raise ValueError("expected an integer") from None
+    if value_type == "json":
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                raise ValueError("expected JSON") from None
+        return json.dumps(value, ensure_ascii=False, sort_keys=True)
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+class SystemConfigService:
+    """
+    Service for writing system configs in bulk
+
+    A save is one SELECT of the submitted keys' value_types, one multi-row
+    INSERT ... ON CONFLICT (key) DO UPDATE and one config version bump,
+    whatever the number of keys. Services only stage; the request's unit
+    of work commits.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @property
+    def dialect_name(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    def _insert(self):
+        dialect = postgresql if self.dialect_name == "postgresql" else sqlite
+        return dialect.insert(SystemConfig)
+
+    async def bump_version(self) -> int:
+        """Increment the config version (creating its row if missing) and return it"""
+        version = await self.db.scalar(
+            update(SystemConfigState).where(SystemConfigState.id == CONFIG_STATE_ID)
+            .values(version=SystemConfigState.version + 1)
+            .returning(SystemConfigState.version)
+            .execution_options(synchronize_session=False)
+        )
+        if version is None:
+            await self.db.execute(insert(SystemConfigState).values(id=CONFIG_STATE_ID, version=1))
+            version = 1
+        return version
+
+    async def current_version(self) -> int:
+        """Current config version (0 before the first change)"""
+        return await self.db.scalar(
+            select(SystemConfigState.version).where(SystemConfigState.id == CONFIG_STATE_ID)
+        ) or 0
+
+    async def save(self, category: str, values: Dict[str, Any]) -> ConfigSaveResult:
+        """
+        Insert or update many configs at once
+
+        Existing configs keep their value_type, category, description and
+        flags; only value and updated_at change. New configs get a
+        value_type inferred from the submitted value. None values are skipped.
+
+        Args:
+            category: Category of newly created configs
+            values: Config key -> submitted value
+
+        Returns:
+            ConfigSaveResult with the saved keys and the new config version
+
+        Raises:
+            ConfigValueError: If any value does not fit its config's value_type
+                (nothing is written)
+        """
+        values = {key: value for key, value in values.items() if value is not None}
+        if not values:
+            return ConfigSaveResult(saved=[], created=0, version=await self.current_version())
+
+        existing = dict((await self.db.execute(
+            select(SystemConfig.key, SystemConfig.value_type).where(SystemConfig.key.in_(list(values)))
+        )).all())
+
+        rows, errors = [], {}
+        for key, value in values.items():
+            value_type = existing.get(key) or infer_value_type(value)
+            try:
+                text = coerce_config_value(value, value_type)
+            except ValueError as e:
+                errors[key] = str(e)
+                continue
+            rows.append({
+                "id": uuid.uuid4(),
+                "key": key,
+                "value": text,
+                "value_type": value_type,
+                "category": category,
+                "description": f"系统{key}配置",
+                "is_encrypted": False,
+                "is_public": True,
+            })
+        if errors:
+            raise ConfigValueError(errors)
+
+        statement = self._insert().values(rows)
+        await self.db.execute(statement.on_conflict_do_update(
+            index_elements=[SystemConfig.key],
+            set_={"value": statement.excluded.value, "updated_at": func.now()}
+        ))
+
+        created = len(values) - len(existing)
+        if created:
+            await self.db.run_sync(apply_stat_deltas, {STAT_TOTAL_CONFIGS: created})
+        return ConfigSaveResult(saved=list(values), created=created, version=await self.bump_version())
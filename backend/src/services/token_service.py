@@ -4,7 +4,8 @@ JWT token generation, validation, rotation, and revocation
 """
 from datetime import datetime, timedelta
 from typing import Optional, Tuple, Dict, List
-from sqlalchemy.orm import Session
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
 from src.models import JWTToken, TokenType
@@ -17,7 +18,9 @@ from src.utils.security import (
     get_access_token_expiry,
     get_refresh_token_expiry,
 )
+from src.services.rbac import get_rbac_registry, load_user_mask, permission_claims
 from src.utils.constants import SUCCESS_MESSAGES
+from src.utils.uuid7 import uuid7
 
 
 class TokenService:
@@ -32,10 +35,10 @@ class TokenService:
     - Revoke tokens on logout/password change (FR-016, FR-027)
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def generate_token_pair(
+    async def generate_token_pair(
         self,
         user_id: uuid.UUID,
         device_info: Optional[str] = None
@@ -51,20 +54,25 @@ class TokenService:
             Dict with access_token, refresh_token, token_type, expires_in
             
         Example:
-            >>> tokens = token_service.generate_token_pair(user.id)
+            >>> tokens = await token_service.generate_token_pair(user.id)
             >>> access = tokens["access_token"]
             >>> refresh = tokens["refresh_token"]
         """
         # Generate tokens
-        access_jti = str(uuid.uuid4())
-        refresh_jti = str(uuid.uuid4())
+        # Time-ordered JTIs keep the unique jti index append-only too
+        access_jti = str(uuid7())
+        refresh_jti = str(uuid7())
         
-        access_token = create_access_token(user_id, jti=access_jti)
+        # Stamp the permission mask and RBAC version so requests can authorize from the token
+        snapshot = await get_rbac_registry().current_async(self.db)
+        mask = await load_user_mask(self.db, user_id, snapshot)
+        access_token = create_access_token(
+            user_id, jti=access_jti, claims=permission_claims(mask, snapshot.version)
+        )
         refresh_token = create_refresh_token(user_id, jti=refresh_jti)
         
         # Store refresh token in database for rotation tracking
         refresh_token_record = JWTToken(
-            id=uuid.uuid4(),
             jti=refresh_jti,
             user_id=user_id,
             token_type=TokenType.REFRESH,
@@ -76,7 +84,6 @@ class TokenService:
         )
         
         self.db.add(refresh_token_record)
-        self.db.commit()
         
         return {
             "access_token": access_token,
@@ -85,7 +92,7 @@ class TokenService:
             "expires_in": 3600  # 1 hour in seconds
         }
     
-    def validate_access_token(self, token: str) -> Tuple[bool, Optional[uuid.UUID], Optional[str]]:
+    async def validate_access_token(self, token: str) -> Tuple[bool, Optional[uuid.UUID], Optional[str]]:
         """
         Validate an access token (FR-013)
         
@@ -111,12 +118,14 @@ class TokenService:
             # Check if token is blacklisted (revoked)
             jti = get_token_jti(token)
             if jti:
-                revoked_token = self.db.query(JWTToken).filter(
-                    JWTToken.jti == jti,
-                    JWTToken.revoked == True
-                ).first()
+                revoked_token = await self.db.scalar(
+                    select(JWTToken.id).where(
+                        JWTToken.jti == jti,
+                        JWTToken.revoked == True
+                    ).limit(1)
+                )
                 
-                if revoked_token:
+                if revoked_token is not None:
                     return False, None, "Token has been revoked"
             
             return True, user_id, None
@@ -124,7 +133,7 @@ class TokenService:
         except Exception as e:
             return False, None, f"Token validation failed: {str(e)}"
     
-    def refresh_access_token(
+    async def refresh_access_token(
         self,
         refresh_token: str
     ) -> Tuple[bool, Optional[Dict[str, str]], Optional[str]]:
@@ -151,11 +160,13 @@ class TokenService:
             
             # Find refresh token in database
             jti = get_token_jti(refresh_token)
-            token_record = self.db.query(JWTToken).filter(
-                JWTToken.jti == jti,
-                JWTToken.token_type == TokenType.REFRESH,
-                JWTToken.revoked == False
-            ).first()
+            token_record = await self.db.scalar(
+                select(JWTToken).where(
+                    JWTToken.jti == jti,
+                    JWTToken.token_type == TokenType.REFRESH,
+                    JWTToken.revoked == False
+                )
+            )
             
             if not token_record:
                 return False, None, "Refresh token not found or already revoked"
@@ -167,21 +178,19 @@ class TokenService:
             # Revoke old refresh token (token rotation)
             token_record.revoke()
             
-            # Generate new token pair
-            new_tokens = self.generate_token_pair(
-                user_id,
+            # Generate new token pair for the owner of the stored token
+            new_tokens = await self.generate_token_pair(
+                token_record.user_id,
                 device_info=token_record.device_info
             )
             
-            self.db.commit()
-            
             return True, new_tokens, None
             
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             return False, None, f"Token refresh failed: {str(e)}"
     
-    def revoke_token(self, jti: str) -> bool:
+    async def revoke_token(self, jti: str) -> bool:
         """
         Revoke a specific token by JTI (FR-016)
         
@@ -191,7 +200,7 @@ class TokenService:
         Returns:
             True if revoked, False if not found
         """
-        token = self.db.query(JWTToken).filter(JWTToken.jti == jti).first()
+        token = await self.db.scalar(select(JWTToken).where(JWTToken.jti == jti))
         
         if not token:
             # Create blacklist entry for access tokens
@@ -199,11 +208,10 @@ class TokenService:
             return False
         
         token.revoke()
-        self.db.commit()
         
         return True
     
-    def revoke_all_user_tokens(self, user_id: uuid.UUID) -> int:
+    async def revoke_all_user_tokens(self, user_id: uuid.UUID) -> int:
         """
         Revoke all tokens for a user (FR-027)
         
@@ -218,21 +226,21 @@ class TokenService:
         Returns:
             Number of tokens revoked
         """
-        tokens = self.db.query(JWTToken).filter(
-            JWTToken.user_id == user_id,
-            JWTToken.revoked == False
-        ).all()
+        tokens = (await self.db.scalars(
+            select(JWTToken).where(
+                JWTToken.user_id == user_id,
+                JWTToken.revoked == False
+            )
+        )).all()
         
         count = 0
         for token in tokens:
             token.revoke()
             count += 1
         
-        self.db.commit()
-        
         return count
     
-    def get_active_tokens(self, user_id: uuid.UUID) -> List[JWTToken]:
+    async def get_active_tokens(self, user_id: uuid.UUID) -> List[JWTToken]:
         """
         Get all active tokens for a user
         
@@ -242,13 +250,16 @@ class TokenService:
         Returns:
             List of active JWTToken records
         """
-        return self.db.query(JWTToken).filter(
-            JWTToken.user_id == user_id,
-            JWTToken.revoked == False,
-            JWTToken.expires_at > datetime.utcnow()
-        ).all()
+        result = await self.db.scalars(
+            select(JWTToken).where(
+                JWTToken.user_id == user_id,
+                JWTToken.revoked == False,
+                JWTToken.expires_at > datetime.utcnow()
+            )
+        )
+        return list(result.all())
     
-    def cleanup_expired_tokens(self) -> int:
+    async def cleanup_expired_tokens(self) -> int:
         """
         Delete expired and revoked tokens (cleanup job)
         
@@ -261,13 +272,11 @@ class TokenService:
         """
         cutoff_time = datetime.utcnow() - timedelta(hours=24)
         
-        deleted = self.db.query(JWTToken).filter(
-            JWTToken.expires_at < cutoff_time
-        ).delete()
-        
-        self.db.commit()
+        result = await self.db.execute(
+            delete(JWTToken).where(JWTToken.expires_at < cutoff_time)
+        )
         
-        return deleted
+        return result.rowcount
 
 
 
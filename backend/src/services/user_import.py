@@ -0,0 +1,321 @@
+"""
+User Import
+Streaming bulk import of user accounts from CSV or NDJSON
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import codecs
+import csv
+import json
+import multiprocessing
+import os
+import uuid
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.config import settings
+from src.database import async_unit_of_work
+from src.models import AccountStatus, OperationLog, OperationResult, TokenPurpose, User, VerificationToken
+from src.models.admin_stats import STAT_ACTIVE_USERS, STAT_TOTAL_USERS, apply_stat_deltas
+from src.services.email_queue import VerificationEmailQueue
+from src.services.operation_log_writer import operation_log_row
+from src.utils.security import (
+    generate_verification_token, get_email_verification_expiry, hash_passwords, is_password_hash
+)
+from src.utils.validators import contains_email, is_common_password, validate_email_format, validate_password_policy
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# Row errors listed in the result; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+_TRUE = frozenset({"true", "1", "yes"})
+
+
+class UserImportError(ValueError):
+    """Raised when the input cannot be read at all (bad header, bad encoding)"""
+
+
+@dataclass
+class ImportRow:
+    """One valid input row, ready to hash and insert"""
+    line: int
+    email: str
+    password: Optional[str]
+    password_hash: Optional[str]
+    email_verified: bool
+
+
+@dataclass
+class UserImportResult:
+    """Totals of an import, plus the first MAX_REPORTED_ERRORS row errors"""
+    received: int = 0
+    created: int = 0
+    existing: int = 0
+    invalid: int = 0
+    emails_queued: int = 0
+    batches: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def reject(self, line: int, message: str) -> None:
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Split a byte stream into numbered non-blank lines, decoding UTF-8 incrementally"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer, number = "", 0
+    try:
+        async for chunk in chunks:
+            buffer += decoder.decode(chunk)
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                number += 1
+                if line.strip():
+                    yield number, line.rstrip("\r")
+        buffer += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise UserImportError(f"Input is not UTF-8 (after line {number})") from e
+    if buffer.strip():
+        yield number + 1, buffer.rstrip("\r")
+
+
+async def iter_records(chunks: AsyncIterator[bytes], format: str) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Parse input records one line at a time
+
+    CSV needs a header row naming its columns; NDJSON has one object per
+    line. A line that does not parse is yielded as an error string.
+    """
+    header = None
+    async for number, line in iter_lines(chunks):
+        if format == "ndjson":
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield number, "Invalid JSON"
+                continue
+            yield number, record if isinstance(record, dict) else "Expected a JSON object"
+            continue
+
+        values = next(csv.reader([line]))
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            if "email" not in header:
+                raise UserImportError("CSV header must include an email column")
+            continue
+        if len(values) != len(header):
+            yield number, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield number, dict(zip(header, values))
+
+
+def parse_row(line: int, record: Dict[str, Any]) -> Tuple[Optional[ImportRow], Optional[str]]:
+    """
+    Validate one record
+
+    Returns:
+        (row, None) if valid, else (None, error message)
+    """
+    email = str(record.get("email") or "").strip().lower()
+    if not validate_email_format(email):
+        return None, "Invalid email format"
+
+    password = record.get("password") or None
+    password_hash = record.get("password_hash") or None
+    if password_hash:
+        if not is_password_hash(str(password_hash)):
+            return None, "password_hash is not a bcrypt or argon2 hash"
+        password = None
+    elif password:
+        password = str(password)
+        errors = validate_password_policy(password)["errors"]
+        if is_common_password(password):
+            errors.append("密码过于常见")
+        if contains_email(password, email):
+            errors.append("密码不应包含邮箱信息")
+        if errors:
+            return None, "; ".join(errors)
+    else:
+        return None, "password or password_hash is required"
+
+    verified = record.get("email_verified")
+    verified = verified if isinstance(verified, bool) else str(verified or "").strip().lower() in _TRUE
+    return ImportRow(line, email, password, password_hash and str(password_hash), verified), None
+
+
+def hash_worker_count() -> int:
+    """Hashing processes to use (USER_IMPORT_HASH_WORKERS, 0 = one per CPU)"""
+    return settings.USER_IMPORT_HASH_WORKERS or os.cpu_count() or 1
+
+
+@lru_cache(maxsize=None)
+def get_password_hash_pool() -> ProcessPoolExecutor:
+    """Process pool for password hashing (spawned, so workers do not inherit the event loop's threads)"""
+    return ProcessPoolExecutor(max_workers=hash_worker_count(), mp_context=multiprocessing.get_context("spawn"))
+
+
+def shutdown_password_hash_pool() -> None:
+    """Stop the hashing processes if they were ever started"""
+    if get_password_hash_pool.cache_info().currsize:
+        get_password_hash_pool().shutdown(cancel_futures=True)
+        get_password_hash_pool.cache_clear()
+
+
+class UserImporter:
+    """
+    Imports users from a byte stream in batches
+
+    Records are parsed and validated as they arrive, so memory holds one
+    batch, not the file; an email repeated within a batch is rejected. Per
+    batch: one SELECT skips emails that already have accounts so their
+    passwords are not hashed, plaintext passwords are hashed across the
+    process pool (pre-hashed bcrypt/argon2 values are stored as given), and
+    users are written with one multi-row INSERT ... ON CONFLICT (email) DO
+    NOTHING. Emails registered since the SELECT, or repeated from an
+    earlier batch, lose to the unique constraint and count as existing;
+    only the returned rows get verification tokens, in the same
+    transaction. Verification emails for the batch are queued after it
+    commits; accounts marked email_verified are created active and get no
+    email.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        email_queue: VerificationEmailQueue,
+        hash_pool: Optional[ProcessPoolExecutor] = None,
+        batch_size: int = 1000,
+        send_verification: bool = True
+    ):
+        self.session_factory = session_factory
+        self.email_queue = email_queue
+        self.hash_pool = hash_pool
+        self.batch_size = batch_size
+        self.send_verification = send_verification
+
+    async def run(self, chunks: AsyncIterator[bytes], format: str, actor_id: uuid.UUID) -> UserImportResult:
+        """
+        Import every record of a CSV or NDJSON stream
+
+        Args:
+            chunks: Input bytes (e.g. request.stream())
+            format: "csv" or "ndjson"
+            actor_id: Admin running the import (owner of the audit entry)
+
+        Returns:
+            UserImportResult with per-outcome counts
+
+        Raises:
+            UserImportError: If the input cannot be read; batches already
+                imported stay imported
+        """
+        result = UserImportResult()
+        batch: Dict[str, ImportRow] = {}
+        async for line, record in iter_records(chunks, format):
+            result.received += 1
+            if isinstance(record, str):
+                result.reject(line, record)
+                continue
+            row, error = parse_row(line, record)
+            if error:
+                result.reject(line, error)
+            elif row.email in batch:
+                result.reject(line, "Duplicate email in input")
+            else:
+                batch[row.email] = row
+                if len(batch) >= self.batch_size:
+                    await self._import_batch(list(batch.values()), result)
+                    batch = {}
+        if batch:
+            await self._import_batch(list(batch.values()), result)
+
+        async with async_unit_of_work(self.session_factory) as db:
+            details = {key: value for key, value in vars(result).items() if key != "errors"}
+            await db.execute(insert(OperationLog).values(**operation_log_row(
+                actor_id, "BULK_USER_IMPORT", "admin/users", OperationResult.SUCCESS,
+                details=json.dumps({**details, "format": format})
+            )))
+        return result
+
+    async def _hash(self, passwords: List[str]) -> List[str]:
+        """Hash passwords split evenly across the pool's workers"""
+        if not passwords:
+            return []
+        if self.hash_pool is None:
+            return await asyncio.to_thread(hash_passwords, passwords)
+        loop = asyncio.get_running_loop()
+        size = -(-len(passwords) // hash_worker_count())
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(self.hash_pool, hash_passwords, passwords[start:start + size])
+            for start in range(0, len(passwords), size)
+        ))
+        return [hashed for part in parts for hashed in part]
+
+    async def _import_batch(self, batch: List[ImportRow], result: UserImportResult) -> None:
+        async with async_unit_of_work(self.session_factory) as db:
+            existing = set((await db.scalars(
+                select(User.email).where(User.email.in_([row.email for row in batch]))
+            )).all())
+        rows = [row for row in batch if row.email not in existing]
+        result.existing += len(batch) - len(rows)
+        if not rows:
+            return
+
+        plain = [row for row in rows if row.password is not None]
+        for row, hashed in zip(plain, await self._hash([row.password for row in plain])):
+            row.password_hash, row.password = hashed, None
+
+        now = datetime.utcnow()
+        users = {
+            uuid.uuid4(): {
+                "email": row.email,
+                "password_hash": row.password_hash,
+                "email_verified": row.email_verified,
+                "account_status": AccountStatus.ACTIVE if row.email_verified else AccountStatus.INACTIVE,
+                "registration_timestamp": now,
+                "consent_timestamp": now,
+            }
+            for row in rows
+        }
+
+        async with async_unit_of_work(self.session_factory) as db:
+            dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+            created = set((await db.scalars(
+                dialect.insert(User).on_conflict_do_nothing(index_elements=[User.email]).returning(User.id),
+                [{"id": user_id, **user} for user_id, user in users.items()]
+            )).all())
+            tokens, emails = [], []
+            for user_id in (user_id for user_id in users if user_id in created):
+                if not users[user_id]["email_verified"]:
+                    token = generate_verification_token()
+                    tokens.append({
+                        "token": token,
+                        "user_id": user_id,
+                        "token_type": TokenPurpose.EMAIL_VERIFICATION,
+                        "created_at": now,
+                        "expires_at": get_email_verification_expiry(),
+                        "used": False,
+                    })
+                    emails.append((users[user_id]["email"], token))
+            if tokens:
+                await db.execute(insert(VerificationToken), tokens)
+            # Core INSERTs skip the flush hook that keeps the dashboard counters
+            await db.run_sync(apply_stat_deltas, {
+                STAT_TOTAL_USERS: len(created),
+                STAT_ACTIVE_USERS: len(created) - len(tokens),
+            })
+
+        result.existing += len(users) - len(created)
+        result.created += len(created)
+        result.batches += 1
+        if self.send_verification and emails:
+            result.emails_queued += self.email_queue.enqueue(emails)
@@ -4,7 +4,8 @@ User management operations
 """
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
 
 from src.models import User, VerificationToken, AccountStatus, TokenPurpose
@@ -29,7 +30,7 @@ class UserService:
     - Export user data (GDPR FR-036)
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.password_service = PasswordService()
         self.email_service = EmailService()
@@ -75,7 +76,7 @@ class UserService:
             return False, None, errors
         
         # Check for duplicate email (FR-004)
-        existing_user = self.get_user_by_email(normalized_email)
+        existing_user = await self.get_user_by_email(normalized_email)
         if existing_user:
             errors.append("An account with this email already exists")
             return False, None, errors
@@ -104,10 +105,10 @@ class UserService:
         )
         
         self.db.add(user)
-        self.db.flush()  # Get user.id without committing
+        await self.db.flush()  # Get user.id without committing
         
         # Create verification token
-        verification_token = self.create_verification_token(user.id)
+        verification_token = await self.create_verification_token(user.id)
         
         # Send verification email (FR-006)
         email_sent = await self.email_service.send_verification_email(
@@ -124,7 +125,6 @@ class UserService:
             additional_context={"email_sent": email_sent}
         )
         
-        self.db.commit()
         
         return True, user, []
     
@@ -132,7 +132,7 @@ class UserService:
     # User Retrieval
     # ========================================================================
     
-    def get_user_by_email(self, email: str) -> Optional[User]:
+    async def get_user_by_email(self, email: str) -> Optional[User]:
         """
         Get user by email address
         
@@ -143,11 +143,11 @@ class UserService:
             User instance or None
         """
         normalized_email = email.lower()
-        return self.db.query(User).filter(
+        return await self.db.scalar(select(User).where(
             User.email == normalized_email
-        ).first()
+        ))
     
-    def get_user_by_id(self, user_id: uuid.UUID) -> Optional[User]:
+    async def get_user_by_id(self, user_id: uuid.UUID) -> Optional[User]:
         """
         Get user by ID
         
@@ -157,13 +157,13 @@ class UserService:
         Returns:
             User instance or None
         """
-        return self.db.query(User).filter(User.id == user_id).first()
+        return await self.db.scalar(select(User).where(User.id == user_id))
     
     # ========================================================================
     # Email Verification (FR-006)
     # ========================================================================
     
-    def create_verification_token(self, user_id: uuid.UUID) -> VerificationToken:
+    async def create_verification_token(self, user_id: uuid.UUID) -> VerificationToken:
         """
         Create email verification token
         
@@ -174,7 +174,6 @@ class UserService:
             VerificationToken instance
         """
         token = VerificationToken(
-            id=uuid.uuid4(),
             token=generate_verification_token(),
             user_id=user_id,
             token_type=TokenPurpose.EMAIL_VERIFICATION,
@@ -184,11 +183,10 @@ class UserService:
         )
         
         self.db.add(token)
-        self.db.commit()
         
         return token
     
-    def verify_email(
+    async def verify_email(
         self,
         token_str: str,
         ip_address: Optional[str] = None
@@ -204,10 +202,10 @@ class UserService:
             Tuple of (success: bool, error_message: str or None)
         """
         # Find token
-        token = self.db.query(VerificationToken).filter(
+        token = await self.db.scalar(select(VerificationToken).where(
             VerificationToken.token == token_str,
             VerificationToken.token_type == TokenPurpose.EMAIL_VERIFICATION
-        ).first()
+        ))
         
         if not token:
             return False, "Invalid verification token"
@@ -221,7 +219,7 @@ class UserService:
             return False, "Verification link has expired. Please request a new one."
         
         # Get user
-        user = self.get_user_by_id(token.user_id)
+        user = await self.get_user_by_id(token.user_id)
         if not user:
             return False, "User not found"
         
@@ -231,6 +229,7 @@ class UserService:
         
         # Mark token as used
         token.mark_as_used()
+        self.email_service.coalescer.invalidate("email_verification", user.email)
         
         # Log verification
         self.security_service.log_event(
@@ -240,15 +239,13 @@ class UserService:
             ip_address=ip_address
         )
         
-        self.db.commit()
-        
         return True, None
     
     # ========================================================================
     # User Updates
     # ========================================================================
     
-    def update_last_login(self, user: User) -> None:
+    async def update_last_login(self, user: User) -> None:
         """
         Update last login timestamp
         
@@ -256,9 +253,8 @@ class UserService:
             user: User instance
         """
         user.last_login_timestamp = datetime.utcnow()
-        self.db.commit()
     
-    def update_password(
+    async def update_password(
         self,
         user: User,
         new_password_hash: str,
@@ -282,14 +278,12 @@ class UserService:
             user_id=user.id,
             ip_address=ip_address
         )
-        
-        self.db.commit()
     
     # ========================================================================
     # GDPR Operations (FR-036)
     # ========================================================================
     
-    def export_user_data(self, user_id: uuid.UUID) -> Dict:
+    async def export_user_data(self, user_id: uuid.UUID) -> Dict:
         """
         Export all user data (GDPR Right to Access)
         
@@ -299,12 +293,12 @@ class UserService:
         Returns:
             Dict with all user data
         """
-        user = self.get_user_by_id(user_id)
+        user = await self.get_user_by_id(user_id)
         if not user:
             return {}
         
         # Get related data
-        security_logs = self.security_service.get_user_security_logs(user_id)
+        security_logs = await self.security_service.get_user_security_logs(user_id)
         
         # Log data export request
         self.security_service.log_event(
@@ -337,7 +331,7 @@ class UserService:
             "export_timestamp": datetime.utcnow().isoformat()
         }
     
-    def delete_user_account(
+    async def delete_user_account(
         self,
         user_id: uuid.UUID,
         ip_address: Optional[str] = None
@@ -357,7 +351,7 @@ class UserService:
             - 30-day grace period before permanent deletion
             - User can cancel by logging in during grace period
         """
-        user = self.get_user_by_id(user_id)
+        user = await self.get_user_by_id(user_id)
         if not user:
             return False, datetime.utcnow()
         
@@ -377,8 +371,6 @@ class UserService:
             }
         )
         
-        self.db.commit()
-        
         return True, deletion_date
 
 
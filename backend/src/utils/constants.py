@@ -111,6 +111,7 @@ SUCCESS_MESSAGES = {
     "USER_DELETED": "用户删除成功",
     "PASSWORD_CHANGED": "密码修改成功",
     "PASSWORD_RESET_SENT": "密码重置邮件已发送",
+    "PASSWORD_RESET_COMPLETE": "密码重置成功",
     "EMAIL_VERIFICATION_SENT": "邮箱验证邮件已发送",
     "EMAIL_VERIFIED": "邮箱验证成功",
     "LOGIN_SUCCESS": "登录成功",
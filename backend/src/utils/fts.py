@@ -0,0 +1,86 @@
+"""
+SQLite Trigram Search
+External-content FTS5 trigram tables over a table's text columns, and substring matching through them
+"""
+from typing import Sequence, Tuple
+
+from sqlalchemy import TextualSelect, column, text
+
+# Trigram indexes cannot serve shorter terms
+MIN_TRIGRAM_LENGTH = 3
+
+TRIGGER_EVENTS = ("insert", "delete", "update")
+
+
+def fts5_trigram_ddl(fts_table: str, content_table: str, columns: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Build the DDL of an FTS5 trigram table indexing columns of content_table
+
+    The FTS table stores no copy of the text (content=content_table, keyed
+    by rowid); insert/delete/update triggers on content_table keep the index
+    in sync. Statements use IF NOT EXISTS so create_all listeners and
+    migrations can share them.
+
+    Args:
+        fts_table: Name of the FTS5 virtual table
+        content_table: Table whose rows are indexed
+        columns: Indexed text columns
+
+    Returns:
+        CREATE VIRTUAL TABLE statement followed by the CREATE TRIGGER statements
+    """
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{name}" for name in columns)
+    old_values = ", ".join(f"old.{name}" for name in columns)
+    insert_new = f"INSERT INTO {fts_table}(rowid, {names}) VALUES (new.rowid, {new_values});"
+    delete_old = (
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {names}) VALUES ('delete', old.rowid, {old_values});"
+    )
+    insert_trigger, delete_trigger, update_trigger = fts5_trigger_names(fts_table)
+    return (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5("
+        f"{names}, content='{content_table}', content_rowid='rowid', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {insert_trigger} AFTER INSERT ON {content_table} BEGIN\n"
+        f"    {insert_new}\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS {delete_trigger} AFTER DELETE ON {content_table} BEGIN\n"
+        f"    {delete_old}\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS {update_trigger} AFTER UPDATE OF {names} ON {content_table} BEGIN\n"
+        f"    {delete_old}\n    {insert_new}\nEND",
+    )
+
+
+def fts5_trigger_names(fts_table: str) -> Tuple[str, ...]:
+    """Names of the sync triggers created by fts5_trigram_ddl (insert, delete, update)"""
+    return tuple(f"{fts_table}_{event}" for event in TRIGGER_EVENTS)
+
+
+def fts5_rebuild(fts_table: str) -> str:
+    """Statement that re-indexes every existing row of the content table"""
+    return f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')"
+
+
+def trigram_phrase(term: str) -> str:
+    """
+    Quote a search term for MATCH against an FTS5 trigram table
+
+    Quoted as one phrase, the trigram tokenizer matches it as a substring
+    (and FTS5 query syntax in the term is taken literally).
+    """
+    return '"' + term.replace('"', '""') + '"'
+
+
+def fts5_rowid_matches(fts_table: str, term: str, param_name: str) -> TextualSelect:
+    """
+    SELECT of the rowids whose indexed text contains term
+
+    Args:
+        fts_table: Name of the FTS5 trigram table
+        term: Substring to find (at least MIN_TRIGRAM_LENGTH characters)
+        param_name: Bind parameter name, unique within the statement
+
+    Returns:
+        Text SELECT with a single rowid column, usable with in_()
+    """
+    return text(
+        f"SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH :{param_name}"
+    ).bindparams(**{param_name: trigram_phrase(term)}).columns(column("rowid"))
@@ -0,0 +1,75 @@
+"""
+HTTP Range Requests
+Single byte-range parsing and file slicing for resumable downloads (RFC 9110)
+"""
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+# Bytes read from disk per response chunk
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiableError(ValueError):
+    """The requested range lies outside the file"""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a Range header against a file size
+
+    Only a single "bytes" range is honoured; anything else (multiple
+    ranges, other units, malformed values) is ignored, which the RFC
+    allows: the caller then sends the whole file.
+
+    Args:
+        header: Range header value (None if absent)
+        size: File size in bytes
+
+    Returns:
+        Inclusive (start, end) byte positions, or None for the whole file
+
+    Raises:
+        RangeNotSatisfiableError: If the range starts past the end of the file
+    """
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[len("bytes="):].strip()
+    if "," in spec or "-" not in spec:
+        return None
+
+    first, last = (part.strip() for part in spec.split("-", 1))
+    if not first:
+        # Suffix range: the last N bytes
+        if not last.isdigit():
+            return None
+        if int(last) == 0 or size == 0:
+            raise RangeNotSatisfiableError(header)
+        return max(size - int(last), 0), size - 1
+    if not first.isdigit() or (last and not last.isdigit()):
+        return None
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        raise RangeNotSatisfiableError(header)
+    if end < start:
+        return None
+    return start, end
+
+
+def iter_file_range(path: Path, start: int, end: int, chunk_size: int = FILE_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Read bytes start..end (inclusive) of a file in chunks
+
+    A plain iterator: StreamingResponse runs it in the threadpool, so disk
+    reads do not block the event loop.
+    """
+    remaining = end - start + 1
+    with open(path, "rb") as f:
+        f.seek(start)
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
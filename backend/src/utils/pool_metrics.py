@@ -0,0 +1,172 @@
+"""
+Connection Pool Metrics
+Per-engine pool telemetry collected through SQLAlchemy pool and engine events
+"""
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, List, Type
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS_SECONDS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class PoolMetrics:
+    """
+    Counters for one engine's connection pool
+
+    - checkout wait: time spent in Pool.connect(), i.e. queueing for a free
+      connection plus connect and pre-ping (histogram)
+    - in use / idle: sampled from the pool when a snapshot is taken
+    - overflow: connections opened beyond pool_size
+    - timeouts: checkouts that gave up after pool_timeout
+    - pre-ping failures: stale connections detected and replaced on checkout
+    """
+    name: str
+    wait_buckets: List[int] = field(default_factory=lambda: [0] * (len(WAIT_BUCKETS_SECONDS) + 1))
+    wait_count: int = 0
+    wait_sum: float = 0.0
+    wait_max: float = 0.0
+    checkouts: int = 0
+    connects: int = 0
+    overflow_events: int = 0
+    timeouts: int = 0
+    pre_ping_failures: int = 0
+    invalidations: int = 0
+    _lock: Lock = field(default_factory=Lock, repr=False)
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_buckets[bisect_left(WAIT_BUCKETS_SECONDS, seconds)] += 1
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Current metrics plus the pool's live gauges
+
+        Args:
+            pool: Pool of the engine these metrics belong to
+
+        Returns:
+            JSON-serializable metrics
+        """
+        with self._lock:
+            buckets = {
+                str(bound): count
+                for bound, count in zip(WAIT_BUCKETS_SECONDS + ("+Inf",), self.wait_buckets)
+            }
+            data = {
+                "name": self.name,
+                "pool_class": type(pool).__name__,
+                "checkout_wait_seconds": {
+                    "buckets": buckets,
+                    "count": self.wait_count,
+                    "sum": round(self.wait_sum, 6),
+                    "max": round(self.wait_max, 6),
+                },
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+                "pre_ping_failures": self.pre_ping_failures,
+                "invalidations": self.invalidations,
+            }
+
+        # Gauges only exist on sized pools (QueuePool and its async adapter)
+        for gauge in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, gauge):
+                data[gauge] = getattr(pool, gauge)()
+        data["in_use"] = data.pop("checkedout", None)
+        data["idle"] = data.pop("checkedin", None)
+        return data
+
+
+_registry: Dict[str, PoolMetrics] = {}
+_engines: Dict[str, Engine] = {}
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    """Get (or create) the metrics registered under an engine name"""
+    if name not in _registry:
+        _registry[name] = PoolMetrics(name=name)
+    return _registry[name]
+
+
+def instrumented_pool_class(base: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    Pool class that times checkouts
+
+    SQLAlchemy has no event before a checkout starts, so the wait is timed
+    around Pool.connect(). The metrics live on the class, so they survive
+    Pool.recreate() after dispose or invalidation.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return base.connect(self)
+        except exc.TimeoutError:
+            metrics.increment("timeouts")
+            raise
+        finally:
+            metrics.observe_wait(time.perf_counter() - start)
+
+    return type(f"Instrumented{base.__name__}", (base,), {"connect": connect, "metrics": metrics})
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """
+    Attach pool and engine event listeners for an engine
+
+    Args:
+        engine: Sync engine (use AsyncEngine.sync_engine for async engines)
+        name: Name the metrics are reported under
+
+    Returns:
+        Metrics collected for this engine
+    """
+    metrics = get_pool_metrics(name)
+    _engines[name] = engine
+
+    @event.listens_for(engine.pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.increment("connects")
+        # QueuePool counts the overflow slot before opening the connection
+        overflow = getattr(engine.pool, "overflow", None)
+        if overflow is not None and overflow() > 0:
+            metrics.increment("overflow_events")
+
+    @event.listens_for(engine.pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.increment("checkouts")
+
+    @event.listens_for(engine.pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment("invalidations")
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(context):
+        if context.is_pre_ping:
+            metrics.increment("pre_ping_failures")
+
+    return metrics
+
+
+def pool_metrics_snapshot() -> List[Dict[str, Any]]:
+    """Metrics of every instrumented engine"""
+    return [
+        get_pool_metrics(name).snapshot(engine.pool)
+        for name, engine in _engines.items()
+    ]
@@ -1,15 +1,18 @@
 """
 安全工具模块
 """
+from jose import JWTError, jwt
 from passlib.context import CryptContext
 from passlib.hash import bcrypt
 import secrets
 import string
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
-# 密码加密上下文
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from src.config import settings
+
+# 密码加密上下文（新哈希用 bcrypt；argon2 仅用于校验导入的既有哈希）
+pwd_context = CryptContext(schemes=["bcrypt", "argon2"], deprecated="auto")
 
 def hash_password(password: str) -> str:
     """哈希密码"""
@@ -19,6 +22,21 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证密码"""
     return pwd_context.verify(plain_password, hashed_password)
 
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """批量哈希密码（供进程池调用）"""
+    return [pwd_context.hash(password) for password in passwords]
+
+def is_password_hash(value: str) -> bool:
+    """是否为可直接保存的 bcrypt/argon2 哈希（格式完整）"""
+    scheme = pwd_context.identify(value, required=False)
+    if scheme is None:
+        return False
+    try:
+        pwd_context.handler(scheme).from_string(value)
+    except (ValueError, TypeError):
+        return False
+    return True
+
 def needs_rehash(hashed_password: str) -> bool:
     """检查密码是否需要重新哈希"""
     return pwd_context.needs_update(hashed_password)
@@ -33,11 +51,25 @@ def generate_secure_token() -> str:
     return secrets.token_urlsafe(32)
 
 # JWT相关函数（简化版本）
-def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
-    """创建访问令牌"""
-    return generate_secure_token()
-
-def create_refresh_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
+def create_access_token(
+    data: Any,
+    expires_delta: Optional[timedelta] = None,
+    jti: Optional[str] = None,
+    claims: Optional[Dict[str, Any]] = None
+) -> str:
+    """创建访问令牌（签名 JWT，sub 为用户 ID；claims 为附加声明，如权限位图与 RBAC 版本）"""
+    payload = {
+        "sub": str(data),
+        "type": "access",
+        "iat": datetime.utcnow(),
+        "exp": datetime.utcnow() + expires_delta if expires_delta else get_access_token_expiry(),
+    }
+    if jti:
+        payload["jti"] = jti
+    payload.update(claims or {})
+    return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+def create_refresh_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None, jti: Optional[str] = None) -> str:
     """创建刷新令牌"""
     return generate_secure_token()
 
@@ -45,10 +77,22 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
     """解码令牌"""
     return {"sub": "user", "exp": datetime.utcnow() + timedelta(hours=1)}
 
+def decode_access_claims(token: str) -> Optional[Dict[str, Any]]:
+    """校验访问令牌的签名与有效期并返回其声明；不是本服务签发的访问令牌时返回 None"""
+    try:
+        claims = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return None
+    return claims if claims.get("type") == "access" else None
+
 def verify_token(token: str, expected_type: str = None) -> Optional[str]:
     """验证令牌"""
     if not token:
         return None
+    if expected_type in (None, "access"):
+        claims = decode_access_claims(token)
+        if claims:
+            return claims.get("sub")
     # 支持mock token
     if token == "mock-access-token-123":
         return "550e8400-e29b-41d4-a716-446655440000"
@@ -58,6 +102,9 @@ def verify_token(token: str, expected_type: str = None) -> Optional[str]:
 
 def get_token_jti(token: str) -> Optional[str]:
     """获取令牌JTI"""
+    claims = decode_access_claims(token)
+    if claims:
+        return claims.get("jti")
     return secrets.token_hex(16)
 
 def is_token_expired(token: str) -> bool:
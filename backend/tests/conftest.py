@@ -3,16 +3,24 @@ Pytest Configuration and Fixtures
 Shared test fixtures for all test suites
 """
 import pytest
-from typing import Generator
-from sqlalchemy import create_engine
+from typing import Generator, List
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from fastapi.testclient import TestClient
 import asyncio
+import uuid
 
 from src.main import app
-from src.database import Base, get_db
+from src.dependencies import get_current_user
+from src.database import (
+    Base, RoutingSession, get_db, get_async_db, get_async_database_url, get_async_read_db,
+    get_async_read_session_factory, get_async_session_factory, async_unit_of_work
+)
 from src.config import settings
 
+TEST_DATABASE_URL = "sqlite:///./test.db"
+
 
 # ============================================================================
 # Database Fixtures
@@ -23,7 +31,7 @@ def test_engine():
     """Create test database engine"""
     # Use in-memory SQLite for tests (or separate test PostgreSQL)
     engine = create_engine(
-        "sqlite:///./test.db",
+        TEST_DATABASE_URL,
         connect_args={"check_same_thread": False}
     )
     Base.metadata.create_all(bind=engine)
@@ -31,6 +39,25 @@ def test_engine():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="session")
+def test_async_engine(test_engine):
+    """Create async test engine (aiosqlite) on the same test database"""
+    engine = create_async_engine(get_async_database_url(TEST_DATABASE_URL))
+    yield engine
+
+
+@pytest.fixture(scope="function")
+def test_async_sessionmaker(test_async_engine) -> async_sessionmaker:
+    """Create async session factory for the test database"""
+    return async_sessionmaker(
+        bind=test_async_engine,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        autoflush=True,
+        expire_on_commit=False
+    )
+
+
 @pytest.fixture(scope="function")
 def test_db(test_engine) -> Generator[Session, None, None]:
     """Create test database session"""
@@ -48,7 +75,7 @@ def test_db(test_engine) -> Generator[Session, None, None]:
 
 
 @pytest.fixture(scope="function")
-def client(test_db) -> Generator[TestClient, None, None]:
+def client(test_db, test_async_sessionmaker) -> Generator[TestClient, None, None]:
     """Create test client with database override"""
     
     def override_get_db():
@@ -57,7 +84,15 @@ def client(test_db) -> Generator[TestClient, None, None]:
         finally:
             pass
     
+    async def override_get_async_db():
+        async with async_unit_of_work(test_async_sessionmaker) as db:
+            yield db
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+    app.dependency_overrides[get_async_session_factory] = lambda: test_async_sessionmaker
+    app.dependency_overrides[get_async_read_session_factory] = lambda: test_async_sessionmaker
     
     with TestClient(app) as test_client:
         yield test_client
@@ -65,6 +100,67 @@ def client(test_db) -> Generator[TestClient, None, None]:
     app.dependency_overrides.clear()
 
 
+# ============================================================================
+# Caller and Statement Recording Fixtures
+# ============================================================================
+
+class PermittedCaller:
+    """Authenticated caller holding a fixed set of permissions"""
+    id = uuid.UUID("550e8400-e29b-41d4-a716-446655440000")
+    email = "admin@example.com"
+
+    def __init__(self, permissions):
+        self.permissions = frozenset(permissions)
+
+    def has_permission(self, permission_name: str) -> bool:
+        return permission_name in self.permissions
+
+
+@pytest.fixture
+def caller(request) -> Generator[PermittedCaller, None, None]:
+    """
+    Authenticate API requests as a caller with the parametrized permissions
+    
+    Usage:
+        @with_permissions("user.read")
+        def test_list(caller, client): ...
+    """
+    user = PermittedCaller(getattr(request, "param", ()))
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield user
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def with_permissions(*permissions: str):
+    """Parametrize the caller fixture with the given permissions"""
+    return pytest.mark.parametrize("caller", [permissions], indirect=True, ids=[",".join(permissions)])
+
+
+class RecordedStatements(list):
+    """(statement, executemany) pairs sent to the test database, in order"""
+
+    def sql(self, prefix: str = "") -> List[str]:
+        """Statements starting with prefix"""
+        return [statement for statement, _ in self if statement.lstrip().startswith(prefix)]
+
+    def executemany(self, prefix: str = "") -> List[bool]:
+        """executemany flag of each statement starting with prefix"""
+        return [many for statement, many in self if statement.lstrip().startswith(prefix)]
+
+
+@pytest.fixture
+def recorded_statements(test_async_engine) -> Generator[RecordedStatements, None, None]:
+    """Record every statement the async test engine executes while the test runs"""
+    recorded = RecordedStatements()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append((statement, executemany))
+
+    event.listen(test_async_engine.sync_engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(test_async_engine.sync_engine, "before_cursor_execute", record)
+
+
 # ============================================================================
 # Event Loop Fixture (for async tests)
 # ============================================================================
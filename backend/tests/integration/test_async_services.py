@@ -0,0 +1,53 @@
+"""
+Integration Test: Async services on AsyncSession
+Services run on the async engine (aiosqlite in tests) without blocking the event loop
+"""
+import asyncio
+
+import pytest
+
+from tests.conftest import create_test_user
+from src.database import async_unit_of_work
+from src.models import VerificationToken, TokenPurpose
+from src.services import AuthService, UserService
+
+
+class TestAsyncServices:
+    """Integration tests for async service layer"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_user_lookups(self, test_db, test_async_sessionmaker):
+        """Many lookups can be in flight on one event loop"""
+        for i in range(5):
+            create_test_user(test_db, f"async{i}@example.com")
+
+        async def lookup(email):
+            async with test_async_sessionmaker() as db:
+                return await UserService(db).get_user_by_email(email)
+
+        users = await asyncio.gather(*[lookup(f"ASYNC{i}@example.com") for i in range(5)])
+
+        assert [u.email for u in users] == [f"async{i}@example.com" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_forgot_and_reset_password(self, test_db, test_async_sessionmaker):
+        """Password reset flow runs end to end on an AsyncSession"""
+        user = create_test_user(test_db, "async-reset@example.com")
+
+        async with async_unit_of_work(test_async_sessionmaker) as db:
+            auth_service = AuthService(db)
+            assert await auth_service.forgot_password("async-reset@example.com")
+
+        test_db.expire_all()
+        token = test_db.query(VerificationToken).filter(
+            VerificationToken.user_id == user.id,
+            VerificationToken.token_type == TokenPurpose.PASSWORD_RESET
+        ).one()
+
+        async with async_unit_of_work(test_async_sessionmaker) as db:
+            auth_service = AuthService(db)
+            success, error = await auth_service.reset_password(token.token, "NewSecurePass456!")
+
+        assert success, error
+        test_db.expire_all()
+        assert test_db.get(VerificationToken, token.id).used
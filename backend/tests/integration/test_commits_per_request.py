@@ -0,0 +1,153 @@
+"""
+Integration Test: Commits per request
+Each request is one unit of work and issues at most one COMMIT
+"""
+from datetime import datetime, timedelta
+import uuid
+
+import pytest
+from sqlalchemy import event, select
+from fastapi.testclient import TestClient
+
+from tests.conftest import create_test_user
+from src.database import async_unit_of_work
+from src.models import JWTToken, TokenType, VerificationToken, TokenPurpose
+from src.services import AuthService
+from src.services import token_service
+from src.services.token_service import TokenService
+
+
+@pytest.fixture
+def commit_counter(test_async_engine):
+    """Count DBAPI COMMITs issued through the async test engine"""
+    commits = []
+
+    def on_commit(conn):
+        commits.append(conn)
+
+    event.listen(test_async_engine.sync_engine, "commit", on_commit)
+    yield commits
+    event.remove(test_async_engine.sync_engine, "commit", on_commit)
+
+
+def add_verification_token(db, user, purpose: TokenPurpose) -> str:
+    token = VerificationToken(
+        id=uuid.uuid4(),
+        token=uuid.uuid4().hex,
+        user_id=user.id,
+        token_type=purpose,
+        created_at=datetime.utcnow(),
+        expires_at=datetime.utcnow() + timedelta(hours=1),
+        used=False
+    )
+    db.add(token)
+    db.commit()
+    return token.token
+
+
+class TestCommitsPerEndpoint:
+    """One commit per write request, none for reads"""
+
+    def test_forgot_password_commits_once(self, client: TestClient, test_db, commit_counter):
+        create_test_user(test_db, "uow-forgot@example.com")
+
+        response = client.post("/api/v1/auth/forgot-password", json={
+            "email": "uow-forgot@example.com"
+        })
+
+        assert response.status_code == 200
+        assert len(commit_counter) == 1
+
+    def test_forgot_password_unknown_email_does_not_commit(self, client: TestClient, commit_counter):
+        response = client.post("/api/v1/auth/forgot-password", json={
+            "email": "nobody@example.com"
+        })
+
+        assert response.status_code == 200
+        assert len(commit_counter) == 0
+
+    def test_reset_password_commits_once(self, client: TestClient, test_db, commit_counter):
+        user = create_test_user(test_db, "uow-reset@example.com")
+        token = add_verification_token(test_db, user, TokenPurpose.PASSWORD_RESET)
+
+        response = client.post("/api/v1/auth/reset-password", json={
+            "token": token,
+            "new_password": "NewSecurePass456!"
+        })
+
+        assert response.status_code == 200
+        assert len(commit_counter) == 1
+
+    def test_verify_email_commits_once(self, client: TestClient, test_db, commit_counter):
+        user = create_test_user(test_db, "uow-verify@example.com", verified=False)
+        token = add_verification_token(test_db, user, TokenPurpose.EMAIL_VERIFICATION)
+
+        response = client.get(f"/api/v1/auth/verify-email/{token}")
+
+        assert response.status_code == 200
+        assert len(commit_counter) == 1
+
+    def test_refresh_commits_once(
+        self, client: TestClient, test_db, test_async_sessionmaker, event_loop, commit_counter, monkeypatch
+    ):
+        user = create_test_user(test_db, "uow-refresh@example.com")
+
+        async def issue_tokens():
+            async with async_unit_of_work(test_async_sessionmaker) as db:
+                return await TokenService(db).generate_token_pair(user.id)
+
+        refresh_token = event_loop.run_until_complete(issue_tokens())["refresh_token"]
+        # Refresh tokens are opaque placeholders here: resolve this one to its stored jti
+        jti = test_db.scalar(select(JWTToken.jti).where(
+            JWTToken.user_id == user.id, JWTToken.token_type == TokenType.REFRESH
+        ))
+        monkeypatch.setattr(
+            token_service, "get_token_jti", lambda token: jti if token == refresh_token else uuid.uuid4().hex
+        )
+        commit_counter.clear()
+
+        response = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+        assert response.status_code == 200, response.text
+        assert len(commit_counter) == 1
+
+        # The rotated (now revoked) token and an unknown token are refused without a commit
+        commit_counter.clear()
+        for token in (refresh_token, "not-a-refresh-token"):
+            response = client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+            assert response.status_code == 401
+        assert len(commit_counter) == 0
+
+
+class TestCommitsPerLoginFlow:
+    """Login path stages token, counters and last-login in one transaction"""
+
+    @pytest.mark.asyncio
+    async def test_login_commits_once(self, test_db, test_async_sessionmaker, commit_counter):
+        create_test_user(test_db, "uow-login@example.com")
+
+        async with async_unit_of_work(test_async_sessionmaker) as db:
+            success, result, error = await AuthService(db).login(
+                "uow-login@example.com", "SecurePass123!"
+            )
+
+        assert success, error
+        assert len(commit_counter) == 1
+
+    @pytest.mark.asyncio
+    async def test_logout_commits_once(self, test_db, test_async_sessionmaker, commit_counter):
+        user = create_test_user(test_db, "uow-logout@example.com")
+        async with async_unit_of_work(test_async_sessionmaker) as db:
+            await AuthService(db).login("uow-logout@example.com", "SecurePass123!")
+            jti = await db.scalar(
+                select(JWTToken.jti).where(
+                    JWTToken.user_id == user.id,
+                    JWTToken.token_type == TokenType.REFRESH
+                )
+            )
+        commit_counter.clear()
+
+        async with async_unit_of_work(test_async_sessionmaker) as db:
+            await AuthService(db).logout(user.id, jti)
+
+        assert len(commit_counter) == 1
@@ -0,0 +1,54 @@
+"""
+Integration Test: Health probes
+Liveness never touches dependencies; readiness reports the real database check
+"""
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import settings
+from src.main import app
+from src.services.health_service import HealthService, get_health_service
+
+
+def use_health_service(engine) -> None:
+    app.dependency_overrides[get_health_service] = lambda: HealthService(
+        ttl_seconds=settings.HEALTH_CACHE_TTL_SECONDS,
+        timeout_seconds=settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+        engine=engine
+    )
+
+
+@pytest.fixture
+def unreachable_engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'app.db'}")
+    yield engine
+    engine.sync_engine.dispose()
+
+
+class TestHealthProbes:
+    """Integration tests for /health endpoints"""
+
+    def test_liveness(self, client):
+        response = client.get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    def test_readiness_checks_database(self, client, test_async_engine, recorded_statements):
+        use_health_service(test_async_engine)
+        response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        report = response.json()
+        assert report["checks"]["database"]["status"] == "ok"
+        assert set(report["checks"]) == {"database", "replicas", "redis", "smtp", "queues"}
+        # The probe ran against the test database
+        assert "SELECT 1" in recorded_statements.sql()
+
+    def test_readiness_fails_when_database_is_down(self, client, unreachable_engine):
+        use_health_service(unreachable_engine)
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["checks"]["database"]["status"] == "down"
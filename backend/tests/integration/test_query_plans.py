@@ -0,0 +1,223 @@
+"""
+Integration Test: Query plans of the hot queries
+Runs the migrations on a seeded database and fails if a hot query falls back
+to a full table scan (SQLite always; PostgreSQL when TEST_POSTGRES_URL is set)
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+import json
+import os
+import random
+import re
+import uuid
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, delete, desc, func, insert, select, tuple_
+
+from src.models import (
+    EmailVerificationLimit, JWTToken, LoginAttempt, OperationLog, OperationResult,
+    SecurityLog, EventType, EventResult, TokenPurpose, TokenType, User, VerificationToken,
+)
+from src.services.admin_user_service import email_prefix_query
+from src.services.operation_log_service import search_condition
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+SEED_USERS = 200
+ROWS_PER_USER = 20
+
+
+def run_migrations(url: str) -> None:
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+
+
+def seed(conn) -> list:
+    """Insert enough rows per table that an index beats a scan"""
+    rng = random.Random(0)
+    now = datetime.utcnow()
+    user_ids = [uuid.uuid4() for _ in range(SEED_USERS)]
+
+    conn.execute(insert(User), [
+        {"id": uid, "email": f"plan{i}@example.com", "password_hash": "x"}
+        for i, uid in enumerate(user_ids)
+    ])
+
+    jwt_rows, token_rows, op_rows, sec_rows, attempt_rows = [], [], [], [], []
+    for uid in user_ids:
+        for j in range(ROWS_PER_USER):
+            at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+            jwt_rows.append({
+                "id": uuid.uuid4(), "jti": str(uuid.uuid4()), "user_id": uid,
+                "token_type": TokenType.REFRESH, "issued_at": at,
+                "expires_at": at + timedelta(days=7), "revoked": j % 4 != 0,
+            })
+            token_rows.append({
+                "id": uuid.uuid4(), "token": uuid.uuid4().hex, "user_id": uid,
+                "token_type": TokenPurpose.PASSWORD_RESET if j % 2 else TokenPurpose.EMAIL_VERIFICATION,
+                "expires_at": at + timedelta(hours=1), "used": j % 5 != 0,
+            })
+            op_rows.append({
+                "id": str(uuid.uuid4()), "user_id": uid, "action": "LOGIN",
+                "resource": "auth/login", "result": OperationResult.SUCCESS, "created_at": at,
+            })
+            sec_rows.append({
+                "id": uuid.uuid4(), "event_type": EventType.LOGIN_SUCCESS, "user_id": uid,
+                "timestamp": at, "result": EventResult.SUCCESS,
+            })
+            attempt_rows.append({
+                "id": uuid.uuid4(), "user_id": uid, "email": f"plan{j}@example.com",
+                "ip_address": f"10.0.{j}.{rng.randint(1, 254)}", "result": "failed", "attempt_time": at,
+            })
+
+    conn.execute(insert(JWTToken), jwt_rows)
+    conn.execute(insert(VerificationToken), token_rows)
+    conn.execute(insert(OperationLog), op_rows)
+    conn.execute(insert(SecurityLog), sec_rows)
+    conn.execute(insert(LoginAttempt), attempt_rows)
+    conn.execute(insert(EmailVerificationLimit), [
+        {
+            "id": uuid.uuid4(), "limit_type": limit_type, "identifier": f"id{i}",
+            "request_count": 1, "window_start": now - timedelta(hours=i % 48),
+            "window_end": now + timedelta(hours=1), "last_request": now,
+        }
+        for i in range(SEED_USERS * ROWS_PER_USER)
+        for limit_type in ("email", "ip")
+    ])
+    return user_ids
+
+
+def hot_queries(user_id: uuid.UUID, dialect_name: str) -> dict:
+    """The service queries each index was chosen for"""
+    since = datetime.utcnow() - timedelta(hours=1)
+    return {
+        "jwt_revoked_check": select(JWTToken.id).where(
+            JWTToken.jti == "some-jti", JWTToken.revoked.is_(True)
+        ),
+        "jwt_user_active": select(JWTToken).where(
+            JWTToken.user_id == user_id, JWTToken.revoked.is_(False)
+        ),
+        "verification_token_lookup": select(VerificationToken).where(
+            VerificationToken.token == "some-token",
+            VerificationToken.token_type == TokenPurpose.PASSWORD_RESET
+        ),
+        "verification_user_unused": select(VerificationToken).where(
+            VerificationToken.user_id == user_id,
+            VerificationToken.token_type == TokenPurpose.PASSWORD_RESET,
+            VerificationToken.used.is_(False)
+        ),
+        "operation_logs_page": select(OperationLog).where(
+            OperationLog.user_id == user_id
+        ).order_by(desc(OperationLog.created_at), desc(OperationLog.id)).limit(10),
+        "operation_logs_keyset_page": select(OperationLog).where(
+            OperationLog.user_id == user_id,
+            tuple_(OperationLog.created_at, OperationLog.id) < tuple_(since, "ffffffff")
+        ).order_by(desc(OperationLog.created_at), desc(OperationLog.id)).limit(10),
+        "operation_logs_search": select(OperationLog).where(
+            OperationLog.user_id == user_id, search_condition(dialect_name, "auth/log")[0]
+        ).order_by(desc(OperationLog.created_at), desc(OperationLog.id)).limit(10),
+        "admin_users_keyset_page": select(User).where(
+            tuple_(User.registration_timestamp, User.id) < tuple_(since, user_id)
+        ).order_by(desc(User.registration_timestamp), desc(User.id)).limit(20),
+        # Index range scan already in ORDER BY order: LIMIT stops it early, no sort
+        "admin_users_email_prefix": email_prefix_query(dialect_name, "plan1", 10),
+        "security_logs_trail": select(SecurityLog).where(
+            SecurityLog.user_id == user_id, SecurityLog.timestamp >= since
+        ),
+        "email_limit_window": select(EmailVerificationLimit).where(
+            EmailVerificationLimit.limit_type == "email",
+            EmailVerificationLimit.identifier == "id7",
+            EmailVerificationLimit.window_start >= since
+        ),
+        "login_attempts_by_email": select(func.count()).select_from(LoginAttempt).where(
+            LoginAttempt.email == "plan3@example.com", LoginAttempt.attempt_time >= since
+        ),
+    }
+
+
+def compile_literal(conn, stmt) -> str:
+    return str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+
+
+def sqlite_plan_problems(conn, stmt) -> list:
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + compile_literal(conn, stmt)).fetchall()
+    details = [row[-1] for row in rows]
+    return [
+        d for d in details
+        # "SCAN t" is a full table scan and "SCAN t USING INDEX i" a full
+        # index scan (no usable range); a temp B-tree means the ORDER BY was
+        # not satisfied by the index
+        if (re.match(r"SCAN \w+( USING (COVERING )?INDEX \w+)?$", d)) or "USE TEMP B-TREE" in d
+    ]
+
+
+def postgres_plan_problems(conn, stmt) -> list:
+    plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + compile_literal(conn, stmt)).scalar()
+    plan = plan if isinstance(plan, list) else json.loads(plan)
+
+    problems = []
+
+    def walk(node):
+        if node["Node Type"] == "Seq Scan":
+            problems.append(f"Seq Scan on {node['Relation Name']}")
+        if node["Node Type"] == "Sort":
+            problems.append(f"Sort on {node.get('Sort Key')}")
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return problems
+
+
+def database_urls() -> list:
+    urls = [pytest.param("sqlite", id="sqlite")]
+    postgres_url = os.environ.get("TEST_POSTGRES_URL")
+    urls.append(pytest.param(
+        postgres_url, id="postgresql",
+        marks=pytest.mark.skipif(not postgres_url, reason="TEST_POSTGRES_URL not set")
+    ))
+    return urls
+
+
+@pytest.fixture(params=database_urls())
+def seeded_engine(request, tmp_path):
+    url = request.param
+    if url == "sqlite":
+        url = f"sqlite:///{tmp_path / 'plans.db'}"
+
+    run_migrations(url)
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        user_ids = seed(conn)
+        conn.exec_driver_sql("ANALYZE")
+    yield engine, user_ids
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for model in (JWTToken, VerificationToken, OperationLog, SecurityLog, LoginAttempt, EmailVerificationLimit, User):
+                conn.execute(delete(model))
+    engine.dispose()
+
+
+class TestHotQueryPlans:
+    """Every hot query must be served by an index"""
+
+    def test_hot_queries_use_indexes(self, seeded_engine):
+        engine, user_ids = seeded_engine
+        check = postgres_plan_problems if engine.dialect.name == "postgresql" else sqlite_plan_problems
+
+        with engine.connect() as conn:
+            if engine.dialect.name == "postgresql":
+                # Small seeded tables: make sure a scan is never chosen just because it is cheap
+                conn.exec_driver_sql("SET enable_seqscan = off")
+            problems = {
+                name: issues
+                for name, stmt in hot_queries(user_ids[0], engine.dialect.name).items()
+                if (issues := check(conn, stmt))
+            }
+
+        assert problems == {}
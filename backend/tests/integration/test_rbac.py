@@ -0,0 +1,143 @@
+"""
+Integration Test: RBAC snapshot maintenance
+Permission bits are assigned on insert and the version moves with every role/permission change
+"""
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from src.models import AccountStatus, Permission, RbacState, Role, User
+from src.services.rbac import PERMISSION_CLAIM, RBAC_VERSION_CLAIM, get_rbac_registry, load_snapshot
+from src.services.token_service import TokenService
+from src.utils.security import decode_access_claims
+
+# Query reading a user's role ids
+ROLE_LOOKUP = "SELECT user_roles.role_id"
+
+
+def rbac_version(db) -> int:
+    return db.scalar(select(RbacState.version).where(RbacState.id == 1)) or 0
+
+
+@pytest.fixture
+def permissions(test_db):
+    tag = uuid.uuid4().hex[:8]
+    perms = [
+        Permission(name=f"{tag}.{action}", display_name=action, resource=tag, action=action)
+        for action in ("read", "update", "delete")
+    ]
+    test_db.add_all(perms)
+    test_db.commit()
+    return perms
+
+
+class TestRbacSnapshot:
+    """Bits, versions and checks against the database"""
+
+    def test_new_permissions_get_distinct_bits(self, test_db, permissions):
+        bits = [perm.bit_index for perm in permissions]
+        assert len(set(bits)) == 3
+        all_bits = test_db.scalars(select(Permission.bit_index)).all()
+        assert len(all_bits) == len(set(all_bits))
+
+        more = Permission(name=f"{permissions[0].resource}.manage", display_name="m", resource="x", action="manage")
+        test_db.add(more)
+        test_db.commit()
+        assert more.bit_index == max(all_bits) + 1
+
+    def test_version_moves_with_role_changes(self, test_db, permissions):
+        before = rbac_version(test_db)
+        role = Role(name=f"role_{uuid.uuid4().hex[:8]}", display_name="Editor")
+        test_db.add(role)
+        test_db.commit()
+        after_create = rbac_version(test_db)
+        assert after_create > before
+
+        role.permissions.append(permissions[0])
+        test_db.commit()
+        assert rbac_version(test_db) > after_create
+
+        # Changes that do not touch roles or permissions leave it alone
+        unchanged = rbac_version(test_db)
+        test_db.add(User(email=f"rbac{uuid.uuid4().hex[:8]}@example.com", password_hash="x"))
+        test_db.commit()
+        assert rbac_version(test_db) == unchanged
+
+    def test_has_permission_follows_changes(self, test_db, permissions):
+        read, update, _ = permissions
+        role = Role(name=f"role_{uuid.uuid4().hex[:8]}", display_name="Reader", permissions=[read])
+        user = User(
+            email=f"rbac{uuid.uuid4().hex[:8]}@example.com", password_hash="x",
+            account_status=AccountStatus.ACTIVE, roles=[role]
+        )
+        test_db.add(user)
+        test_db.commit()
+
+        assert user.has_permission(read.name)
+        assert not user.has_permission(update.name)
+        assert user.permission_mask() == 1 << read.bit_index
+
+        # Committing the change drops this process's snapshot at once
+        role.permissions.append(update)
+        test_db.commit()
+        assert user.has_permission(update.name)
+
+        snapshot = get_rbac_registry().current(test_db)
+        assert snapshot.version == rbac_version(test_db)
+        assert snapshot == load_snapshot(test_db)
+
+
+class TestTokenPermissions:
+    """Access tokens carry the permission mask and the RBAC version"""
+
+    @pytest.fixture
+    def user_reader(self, test_db):
+        read = test_db.scalar(select(Permission).where(Permission.name == "user.read"))
+        if read is None:
+            read = Permission(name="user.read", display_name="查看用户", resource="user", action="read")
+        role = Role(name=f"role_{uuid.uuid4().hex[:8]}", display_name="Reader", permissions=[read])
+        user = User(
+            email=f"rbac{uuid.uuid4().hex[:8]}@example.com", password_hash="x",
+            account_status=AccountStatus.ACTIVE, roles=[role]
+        )
+        test_db.add(user)
+        test_db.commit()
+        return user, role, read
+
+    async def issue_token(self, sessionmaker, user_id: uuid.UUID) -> str:
+        async with sessionmaker() as db:
+            return (await TokenService(db).generate_token_pair(user_id))["access_token"]
+
+    @pytest.mark.asyncio
+    async def test_token_carries_mask_and_version(self, test_db, test_async_sessionmaker, user_reader):
+        user, _, read = user_reader
+        claims = decode_access_claims(await self.issue_token(test_async_sessionmaker, user.id))
+
+        assert claims["sub"] == str(user.id)
+        assert int(claims[PERMISSION_CLAIM], 16) == user.permission_mask() == 1 << read.bit_index
+        assert claims[RBAC_VERSION_CLAIM] == rbac_version(test_db)
+
+    def test_current_token_authorizes_without_role_lookup(
+        self, client, test_db, test_async_sessionmaker, event_loop, user_reader, recorded_statements
+    ):
+        user, role, read = user_reader
+        token = event_loop.run_until_complete(self.issue_token(test_async_sessionmaker, user.id))
+        headers = {"Authorization": f"Bearer {token}"}
+        recorded_statements.clear()
+
+        assert client.get("/api/v1/admin/users?size=1", headers=headers).status_code == 200
+        assert recorded_statements.sql(ROLE_LOOKUP) == []
+
+        # Revoking the grant moves the RBAC version: the token is stale and re-checked
+        role.permissions.remove(read)
+        test_db.commit()
+        assert client.get("/api/v1/admin/users?size=1", headers=headers).status_code == 403
+        assert len(recorded_statements.sql(ROLE_LOOKUP)) == 1
+
+    def test_reassigning_user_roles_makes_tokens_stale(self, test_db, user_reader):
+        user, _, _ = user_reader
+        before = rbac_version(test_db)
+        user.roles = []
+        test_db.commit()
+        assert rbac_version(test_db) > before
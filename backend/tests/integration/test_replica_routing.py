@@ -0,0 +1,124 @@
+"""
+Integration Test: Read-replica routing
+Opted-in read-only sessions go to a replica; writes, lagging replicas and
+sessions that did not opt in use the primary
+"""
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from tests.conftest import create_test_user
+from src.database import (
+    REPLICA_READS_KEY, Base, ReplicaSet, RoutingSession, async_unit_of_work, get_async_database_url
+)
+from src.models import User
+from src.services import UserService
+
+
+@pytest.fixture
+def replica_url(tmp_path):
+    """Empty replica database, so reads served by it find nothing"""
+    url = f"sqlite:///{tmp_path / 'replica.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def replicas(replica_url):
+    replica_set = ReplicaSet(
+        engines=[create_async_engine(get_async_database_url(replica_url))],
+        max_lag_seconds=5
+    )
+    yield replica_set
+    replica_set.engines[0].sync_engine.dispose()
+
+
+def make_routing_sessionmaker(engine, replicas, replica_reads: bool) -> async_sessionmaker:
+    session_class = type("TestRoutingSession", (RoutingSession,), {"replicas": replicas})
+    return async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        sync_session_class=session_class,
+        autoflush=True,
+        expire_on_commit=False,
+        info={REPLICA_READS_KEY: True} if replica_reads else None
+    )
+
+
+@pytest.fixture
+def routing_sessionmaker(test_async_engine, replicas) -> async_sessionmaker:
+    """Sessions that opted in to replica reads"""
+    return make_routing_sessionmaker(test_async_engine, replicas, replica_reads=True)
+
+
+@pytest.fixture
+def primary_sessionmaker(test_async_engine, replicas) -> async_sessionmaker:
+    """Default sessions: replicas configured but not opted in"""
+    return make_routing_sessionmaker(test_async_engine, replicas, replica_reads=False)
+
+
+class TestReplicaRouting:
+    """Integration tests for RoutingSession"""
+
+    @pytest.mark.asyncio
+    async def test_reads_go_to_replica(self, test_db, replicas, routing_sessionmaker):
+        create_test_user(test_db, "replica-read@example.com")
+        await replicas.refresh_lag()
+
+        async with async_unit_of_work(routing_sessionmaker) as db:
+            assert await UserService(db).get_user_by_email("replica-read@example.com") is None
+
+    @pytest.mark.asyncio
+    async def test_sessions_read_primary_unless_opted_in(self, test_db, replicas, primary_sessionmaker):
+        # e.g. the read half of a refresh-token rotation must never see a stale replica
+        create_test_user(test_db, "replica-default@example.com")
+        await replicas.refresh_lag()
+
+        async with async_unit_of_work(primary_sessionmaker) as db:
+            assert await UserService(db).get_user_by_email("replica-default@example.com") is not None
+
+    @pytest.mark.asyncio
+    async def test_unchecked_replica_is_not_used(self, test_db, routing_sessionmaker):
+        create_test_user(test_db, "replica-unchecked@example.com")
+
+        async with async_unit_of_work(routing_sessionmaker) as db:
+            assert await UserService(db).get_user_by_email("replica-unchecked@example.com") is not None
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_fails_over_to_primary(self, test_db, replicas, routing_sessionmaker):
+        create_test_user(test_db, "replica-lag@example.com")
+        replicas.record_lag(0, 30.0)
+
+        async with async_unit_of_work(routing_sessionmaker) as db:
+            assert await UserService(db).get_user_by_email("replica-lag@example.com") is not None
+
+    @pytest.mark.asyncio
+    async def test_reads_after_write_stay_on_primary(self, test_db, replicas, routing_sessionmaker):
+        create_test_user(test_db, "replica-ryw@example.com")
+        await replicas.refresh_lag()
+
+        async with async_unit_of_work(routing_sessionmaker) as db:
+            await db.execute(
+                update(User)
+                .where(User.email == "replica-ryw@example.com")
+                .values(failed_login_attempts=1)
+            )
+            user = await UserService(db).get_user_by_email("replica-ryw@example.com")
+
+        assert user is not None
+        assert user.failed_login_attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_is_skipped(self, tmp_path):
+        missing = tmp_path / "missing" / "replica.db"
+        replica_set = ReplicaSet(
+            engines=[create_async_engine(f"sqlite+aiosqlite:///{missing}")],
+            max_lag_seconds=5
+        )
+
+        await replica_set.refresh_lag()
+
+        assert replica_set.available() == []
+        assert replica_set.pick() is None
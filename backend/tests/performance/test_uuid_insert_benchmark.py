@@ -0,0 +1,103 @@
+"""
+Performance Test: uuid4 vs UUIDv7 primary key inserts
+Compares insert throughput and primary key index size
+
+Defaults to a quick SQLite run. For the full comparison run:
+    BENCH_UUID_ROWS=10000000 TEST_POSTGRES_URL=postgresql://... pytest tests/performance -s
+"""
+import os
+import time
+import uuid
+
+import pytest
+from sqlalchemy import Column, MetaData, String, Table, Uuid, create_engine, insert, text
+
+from src.utils.uuid7 import uuid7
+
+ROWS = int(os.environ.get("BENCH_UUID_ROWS", "20000"))
+BATCH_SIZE = 5000
+
+GENERATORS = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+
+def database_urls() -> list:
+    urls = [pytest.param("sqlite", id="sqlite")]
+    postgres_url = os.environ.get("TEST_POSTGRES_URL")
+    urls.append(pytest.param(
+        postgres_url, id="postgresql",
+        marks=pytest.mark.skipif(not postgres_url, reason="TEST_POSTGRES_URL not set")
+    ))
+    return urls
+
+
+def pk_index_bytes(conn, table: Table) -> int:
+    if conn.dialect.name == "postgresql":
+        return conn.execute(text(f"SELECT pg_relation_size('{table.name}_pkey')")).scalar()
+    # Uuid is stored as CHAR(32) on SQLite, so the primary key gets its own index
+    return conn.execute(
+        text("SELECT SUM(pgsize) FROM dbstat WHERE name = :name"),
+        {"name": f"sqlite_autoindex_{table.name}_1"}
+    ).scalar()
+
+
+def run_inserts(engine, name: str, generate) -> dict:
+    metadata = MetaData()
+    table = Table(
+        f"bench_{name}", metadata,
+        Column("id", Uuid(as_uuid=True), primary_key=True),
+        Column("payload", String(64), nullable=False),
+    )
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    started = time.perf_counter()
+    for offset in range(0, ROWS, BATCH_SIZE):
+        batch = [
+            {"id": generate(), "payload": "x" * 64}
+            for _ in range(min(BATCH_SIZE, ROWS - offset))
+        ]
+        with engine.begin() as conn:
+            conn.execute(insert(table), batch)
+    elapsed = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        size = pk_index_bytes(conn, table)
+    metadata.drop_all(engine)
+
+    return {"rows_per_second": ROWS / elapsed, "index_bytes": size}
+
+
+@pytest.fixture(params=database_urls())
+def bench_engine(request, tmp_path):
+    url = request.param
+    if url == "sqlite":
+        url = f"sqlite:///{tmp_path / 'bench.db'}"
+    engine = create_engine(url)
+    yield engine
+    engine.dispose()
+
+
+class TestUUIDInsertBenchmark:
+    """Time-ordered keys keep the primary key index compact"""
+
+    def test_uuid7_index_is_smaller(self, bench_engine):
+        results = {name: run_inserts(bench_engine, name, gen) for name, gen in GENERATORS.items()}
+
+        for name, result in results.items():
+            print(
+                f"\n{bench_engine.dialect.name} {name}: {ROWS} rows, "
+                f"{result['rows_per_second']:.0f} rows/s, "
+                f"pk index {result['index_bytes'] / 1024:.0f} KiB"
+            )
+
+        if bench_engine.dialect.name == "postgresql":
+            # Random keys split pages all over the index and leave them half
+            # full; time-ordered keys take the rightmost-page fast path
+            assert results["uuid7"]["index_bytes"] < results["uuid4"]["index_bytes"]
+        else:
+            # SQLite rebalances pages on split, so sizes stay close; the gain
+            # there is insert locality (throughput), which shows at large ROWS
+            assert results["uuid7"]["index_bytes"] <= results["uuid4"]["index_bytes"] * 1.05
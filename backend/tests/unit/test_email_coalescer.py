@@ -0,0 +1,159 @@
+"""
+Unit Test: Email coalescer
+Duplicate sends to the same recipient within the window share one delivery
+"""
+import asyncio
+
+import pytest
+
+from src.services.email_coalescer import EmailCoalescer
+from src.services.email_service import EmailService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestEmailCoalescer:
+    """Unit tests for EmailCoalescer"""
+
+    @pytest.mark.asyncio
+    async def test_duplicates_within_window_send_once(self):
+        clock = FakeClock()
+        coalescer = EmailCoalescer(window_seconds=60, clock=clock)
+        calls = []
+
+        async def send():
+            calls.append(1)
+            return True
+
+        assert await coalescer.send("password_reset", "A@example.com", send, token="t1")
+        assert await coalescer.send("password_reset", "a@example.com", send, token="t1")
+
+        assert len(calls) == 1
+        assert coalescer.reusable_token("password_reset", "a@example.com") == "t1"
+
+    @pytest.mark.asyncio
+    async def test_new_token_is_always_sent(self):
+        coalescer = EmailCoalescer(window_seconds=60, clock=FakeClock())
+        calls = []
+
+        async def send():
+            calls.append(1)
+            return True
+
+        await coalescer.send("email_verification", "f@example.com", send, token="t1")
+        # Re-registration inside the window issued a new token: its mail must go out
+        await coalescer.send("email_verification", "f@example.com", send, token="t2")
+        await coalescer.send("email_verification", "f@example.com", send, token="t2")
+
+        assert len(calls) == 2
+        assert coalescer.reusable_token("email_verification", "f@example.com") == "t2"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_share_in_flight_send(self):
+        coalescer = EmailCoalescer(window_seconds=60)
+        calls = []
+
+        async def send():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return True
+
+        results = await asyncio.gather(*[
+            coalescer.send("email_verification", "b@example.com", send)
+            for _ in range(5)
+        ])
+
+        assert results == [True] * 5
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_window_expiry_and_message_type_are_respected(self):
+        clock = FakeClock()
+        coalescer = EmailCoalescer(window_seconds=60, clock=clock)
+        calls = []
+
+        async def send():
+            calls.append(1)
+            return True
+
+        await coalescer.send("password_reset", "c@example.com", send, token="t1")
+        await coalescer.send("password_changed", "c@example.com", send)
+        assert len(calls) == 2
+
+        clock.now += 61
+        assert coalescer.reusable_token("password_reset", "c@example.com") is None
+        await coalescer.send("password_reset", "c@example.com", send, token="t2")
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_replaced_entry_does_not_shield_older_entries(self):
+        clock = FakeClock()
+        coalescer = EmailCoalescer(window_seconds=60, clock=clock)
+        calls = []
+
+        async def send():
+            calls.append(1)
+            return True
+
+        await coalescer.send("password_reset", "old@example.com", send, token="t1")
+        clock.now += 10
+        await coalescer.send("password_reset", "young@example.com", send, token="y1")
+        clock.now += 10
+        # Replacing the first key must move it behind the younger one
+        await coalescer.send("password_reset", "old@example.com", send, token="t2")
+
+        clock.now += 50
+        assert coalescer.reusable_token("password_reset", "young@example.com") is None
+        assert coalescer.reusable_token("password_reset", "old@example.com") == "t2"
+        clock.now += 11
+        assert coalescer.reusable_token("password_reset", "old@example.com") is None
+        await coalescer.send("password_reset", "old@example.com", send, token="t2")
+        assert len(calls) == 4
+
+    @pytest.mark.asyncio
+    async def test_notices_without_token_are_never_coalesced(self):
+        service = EmailService()
+        service.coalescer = EmailCoalescer(window_seconds=60, clock=FakeClock())
+        sent = []
+
+        async def send_email(to_email, subject, html_content, plain_content=None):
+            sent.append(to_email)
+            return True
+
+        service.send_email = send_email
+        assert await service.send_password_changed_email("g@example.com")
+        assert await service.send_password_changed_email("g@example.com")
+        assert sent == ["g@example.com", "g@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_failed_send_is_not_coalesced(self):
+        coalescer = EmailCoalescer(window_seconds=60)
+        outcomes = [False, True]
+
+        async def send():
+            return outcomes.pop(0)
+
+        assert not await coalescer.send("password_reset", "d@example.com", send, token="t1")
+        assert coalescer.reusable_token("password_reset", "d@example.com") is None
+        assert await coalescer.send("password_reset", "d@example.com", send, token="t2")
+
+    @pytest.mark.asyncio
+    async def test_invalidate_and_disabled_window(self):
+        coalescer = EmailCoalescer(window_seconds=60)
+
+        async def send():
+            return True
+
+        await coalescer.send("password_reset", "e@example.com", send, token="t1")
+        coalescer.invalidate("password_reset", "e@example.com")
+        assert coalescer.reusable_token("password_reset", "e@example.com") is None
+
+        disabled = EmailCoalescer(window_seconds=0)
+        await disabled.send("password_reset", "e@example.com", send, token="t1")
+        assert disabled.reusable_token("password_reset", "e@example.com") is None
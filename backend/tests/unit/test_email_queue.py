@@ -0,0 +1,50 @@
+"""
+Unit Test: Verification email queue
+Emails are sent by background workers, bounded by concurrency and queue size
+"""
+import asyncio
+
+import pytest
+
+from src.services.email_queue import VerificationEmailQueue
+
+
+class TestVerificationEmailQueue:
+    """Unit tests for VerificationEmailQueue"""
+
+    @pytest.mark.asyncio
+    async def test_sends_in_background_with_bounded_concurrency(self):
+        running, peak, sent = 0, 0, []
+
+        async def send(to_email, token):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            sent.append((to_email, token))
+            return to_email != "bad@example.com"
+
+        queue = VerificationEmailQueue(concurrency=3, max_pending=100, send=send)
+        emails = [(f"u{i}@example.com", f"t{i}") for i in range(9)] + [("bad@example.com", "t")]
+        assert queue.enqueue(emails) == 10
+        assert len(sent) == 0
+
+        for _ in range(200):
+            if len(sent) == 10:
+                break
+            await asyncio.sleep(0.01)
+        assert sorted(sent) == sorted(emails)
+        assert peak == 3
+        assert (queue.sent, queue.failed, queue.pending()) == (9, 1, 0)
+        await queue.stop()
+
+    @pytest.mark.asyncio
+    async def test_refuses_beyond_max_pending(self):
+        async def never(to_email, token):
+            await asyncio.Event().wait()
+
+        queue = VerificationEmailQueue(concurrency=1, max_pending=3, send=never)
+        assert queue.enqueue([(f"u{i}@example.com", "t") for i in range(5)]) == 3
+        assert queue.refused == 2
+        await queue.stop()
@@ -0,0 +1,73 @@
+"""
+Unit Test: Email template registry
+Templates are compiled once per process and render html/plain variants
+"""
+import os
+
+from src.services.email_templates import (
+    EMAIL_TEMPLATE_NAMES,
+    EmailTemplateRegistry,
+    get_email_template_registry,
+)
+from src.services.email_service import EmailService
+
+
+class TestEmailTemplateRegistry:
+    """Unit tests for EmailTemplateRegistry"""
+
+    def test_registry_is_shared_across_email_services(self):
+        """EmailService instances reuse one registry and Jinja2 environment"""
+        assert EmailService().templates is EmailService().templates
+        assert EmailService().jinja_env is get_email_template_registry().env
+
+    def test_precompile_loads_all_templates(self, tmp_path):
+        registry = EmailTemplateRegistry(cache_dir=str(tmp_path))
+        registry.precompile()
+
+        for name in EMAIL_TEMPLATE_NAMES:
+            assert registry.get_template(name) is registry.get_template(name)
+        # Bytecode cache was written to disk
+        assert any(tmp_path.iterdir())
+
+    def test_render_produces_subject_html_and_plain(self, tmp_path):
+        registry = EmailTemplateRegistry(cache_dir=str(tmp_path))
+
+        rendered = registry.render(
+            "password_reset",
+            user_name="<b>Ann</b>",
+            reset_url="http://localhost/reset?token=abc&x=1",
+            expire_hours=1,
+        )
+
+        assert rendered.subject == "Password Reset Request"
+        # HTML variant is escaped, plain variant is not
+        assert "&lt;b&gt;Ann&lt;/b&gt;" in rendered.html
+        assert "token=abc&amp;x=1" in rendered.html
+        assert "http://localhost/reset?token=abc&x=1" in rendered.plain
+        assert "<html>" not in rendered.plain
+        assert "1 hour." in rendered.plain
+
+    def test_auto_reload_picks_up_template_changes(self, tmp_path):
+        template_dir = tmp_path / "templates"
+        template_dir.mkdir()
+        source = template_dir / "password_changed.j2"
+        source.write_text(
+            "{% block subject %}v1{% endblock %}"
+            "{% block html %}{% endblock %}{% block plain %}{% endblock %}"
+        )
+        registry = EmailTemplateRegistry(
+            template_dir=template_dir,
+            cache_dir=str(tmp_path / "cache"),
+            auto_reload=True,
+        )
+        assert registry.render("password_changed").subject == "v1"
+
+        source.write_text(
+            "{% block subject %}v2{% endblock %}"
+            "{% block html %}{% endblock %}{% block plain %}{% endblock %}"
+        )
+        # Force a different mtime so Jinja2 sees the change
+        stat = source.stat()
+        os.utime(source, (stat.st_atime, stat.st_mtime + 10))
+
+        assert registry.render("password_changed").subject == "v2"
@@ -0,0 +1,68 @@
+"""
+Unit Test: Export job queue and deduplication
+"""
+import uuid
+
+import pytest
+
+from src.schemas import ExportJobCreate
+from src.services.export_jobs import ExportJobManager, ExportQueueFullError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def manager(tmp_path, clock):
+    # No workers: submitted jobs stay queued
+    return ExportJobManager(
+        directory=str(tmp_path), workers=0, max_queue=3,
+        dedupe_window_seconds=60, retention_seconds=3600, clock=clock
+    )
+
+
+class TestExportJobManager:
+    """Queueing rules of ExportJobManager"""
+
+    @pytest.mark.asyncio
+    async def test_dedupe_window(self, manager, clock):
+        manager.start()
+        user_id = uuid.uuid4()
+        request = ExportJobCreate(action="LOGIN")
+
+        first, created = manager.submit(user_id, "a@example.com", request, session_factory=None)
+        same, created_again = manager.submit(user_id, "a@example.com", ExportJobCreate(action="LOGIN"), session_factory=None)
+        other_user, _ = manager.submit(uuid.uuid4(), "b@example.com", request, session_factory=None)
+
+        assert created and not created_again
+        assert same is first
+        assert other_user is not first
+        assert manager.depth() == 2
+        assert manager.get(first.id, other_user.user_id) is None
+
+        clock.now += 61
+        later, created = manager.submit(user_id, "a@example.com", request, session_factory=None)
+        assert created and later is not first
+        await manager.stop()
+
+    @pytest.mark.asyncio
+    async def test_queue_full(self, manager):
+        with pytest.raises(ExportQueueFullError):
+            manager.submit(uuid.uuid4(), "a@example.com", ExportJobCreate(), session_factory=None)
+
+        manager.start()
+        for action in ("A", "B", "C"):
+            manager.submit(uuid.uuid4(), "a@example.com", ExportJobCreate(action=action), session_factory=None)
+        with pytest.raises(ExportQueueFullError):
+            manager.submit(uuid.uuid4(), "a@example.com", ExportJobCreate(action="D"), session_factory=None)
+        await manager.stop()
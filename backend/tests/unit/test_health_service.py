@@ -0,0 +1,101 @@
+"""
+Unit Test: Health service
+Readiness results are cached per TTL and aggregated by criticality
+"""
+import asyncio
+
+import pytest
+
+from src.services.health_service import STATUS_DEGRADED, STATUS_DOWN, STATUS_OK, HealthService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class StubbedHealthService(HealthService):
+    """HealthService with in-process checks instead of real network calls"""
+
+    def __init__(self, clock, database_up=True, smtp_up=True):
+        super().__init__(ttl_seconds=5, timeout_seconds=0.5, clock=clock)
+        self.database_up = database_up
+        self.smtp_up = smtp_up
+        self.database_calls = 0
+
+    async def check_database(self):
+        self.database_calls += 1
+        await asyncio.sleep(0.01)
+        if not self.database_up:
+            raise ConnectionError("connection refused")
+        return {}
+
+    async def check_replicas(self):
+        return {"configured": 0}
+
+    async def check_redis(self):
+        return {}
+
+    async def check_smtp(self):
+        if not self.smtp_up:
+            await asyncio.sleep(1)
+        return {}
+
+
+class TestHealthService:
+    """Unit tests for HealthService"""
+
+    @pytest.mark.asyncio
+    async def test_results_cached_within_ttl(self):
+        clock = FakeClock()
+        service = StubbedHealthService(clock)
+
+        await service.readiness()
+        clock.now += 4
+        await service.readiness()
+        assert service.database_calls == 1
+
+        clock.now += 2
+        await service.readiness()
+        assert service.database_calls == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_probes_share_one_run(self):
+        service = StubbedHealthService(FakeClock())
+
+        reports = await asyncio.gather(*[service.readiness() for _ in range(20)])
+
+        assert service.database_calls == 1
+        assert all(report is reports[0] for report in reports)
+
+    @pytest.mark.asyncio
+    async def test_critical_failure_is_down(self):
+        service = StubbedHealthService(FakeClock(), database_up=False)
+
+        report = await service.readiness()
+
+        assert report["status"] == STATUS_DOWN
+        assert report["checks"]["database"]["error"] == "connection refused"
+
+    @pytest.mark.asyncio
+    async def test_optional_timeout_is_degraded(self):
+        service = StubbedHealthService(FakeClock(), smtp_up=False)
+
+        report = await service.readiness()
+
+        assert report["status"] == STATUS_DEGRADED
+        assert report["checks"]["smtp"]["status"] == STATUS_DEGRADED
+        assert report["checks"]["database"]["status"] == STATUS_OK
+
+    @pytest.mark.asyncio
+    async def test_queue_over_limit_is_degraded(self):
+        service = StubbedHealthService(FakeClock())
+        service.register_queue("exports", lambda: 12, max_depth=10)
+
+        report = await service.readiness()
+
+        assert report["status"] == STATUS_DEGRADED
+        assert report["checks"]["queues"]["queues"]["exports"] == {"depth": 12, "max_depth": 10}
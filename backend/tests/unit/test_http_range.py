@@ -0,0 +1,35 @@
+"""
+Unit Test: HTTP Range parsing
+"""
+import pytest
+
+from src.utils.http_range import RangeNotSatisfiableError, iter_file_range, parse_range
+
+
+class TestParseRange:
+    """Single byte ranges are honoured, anything else means the whole file"""
+
+    @pytest.mark.parametrize("header, expected", [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-200", (800, 999)),
+        ("bytes=-5000", (0, 999)),
+        ("bytes=990-5000", (990, 999)),
+    ])
+    def test_satisfiable(self, header, expected):
+        assert parse_range(header, 1000) == expected
+
+    @pytest.mark.parametrize("header", [None, "", "items=0-1", "bytes=0-1,5-6", "bytes=abc", "bytes=5-2", "bytes=-x"])
+    def test_ignored(self, header):
+        assert parse_range(header, 1000) is None
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=2000-3000", "bytes=-0"])
+    def test_unsatisfiable(self, header):
+        with pytest.raises(RangeNotSatisfiableError):
+            parse_range(header, 1000)
+
+    def test_iter_file_range(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(bytes(range(256)) * 4)
+
+        assert b"".join(iter_file_range(path, 10, 300, chunk_size=64)) == path.read_bytes()[10:301]
@@ -0,0 +1,80 @@
+"""
+Unit Test: Lazy database session
+The proxy only checks out a pooled connection on first use and can give it back early
+"""
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from src.database import Base, LazySession, get_db, release_session
+from src.models import User
+from tests.conftest import create_test_user
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'lazy.db'}", poolclass=QueuePool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def lazy_db(engine):
+    db = LazySession(sessionmaker(bind=engine, autoflush=False))
+    yield db
+    db.close()
+
+
+class TestLazySession:
+    """Unit tests for LazySession"""
+
+    def test_unused_session_checks_out_nothing(self, engine, lazy_db):
+        assert not lazy_db.is_active_session
+        assert engine.pool.checkedout() == 0
+
+    def test_first_query_checks_out_connection(self, engine, lazy_db):
+        lazy_db.execute(select(User))
+
+        assert lazy_db.is_active_session
+        assert engine.pool.checkedout() == 1
+
+    def test_release_returns_connection_after_reads(self, engine, lazy_db):
+        lazy_db.execute(select(User))
+        lazy_db.release()
+
+        assert engine.pool.checkedout() == 0
+
+        # The session stays usable
+        lazy_db.execute(select(User))
+        assert engine.pool.checkedout() == 1
+
+    def test_release_keeps_pending_writes(self, engine, lazy_db):
+        user = create_test_user(lazy_db, "lazy@example.com")
+        user.failed_login_attempts = 3
+
+        lazy_db.release()
+
+        assert engine.pool.checkedout() == 1
+        lazy_db.commit()
+        assert lazy_db.get(User, user.id).failed_login_attempts == 3
+
+    def test_release_session_only_releases_lazy_sessions(self, engine, lazy_db):
+        lazy_db.execute(select(User))
+        release_session(lazy_db)
+        assert engine.pool.checkedout() == 0
+
+        db = sessionmaker(bind=engine)()
+        db.execute(select(User))
+        release_session(db)
+        assert engine.pool.checkedout() == 1
+        db.close()
+
+    def test_get_db_yields_lazy_session(self):
+        dependency = get_db()
+        db = next(dependency)
+
+        assert isinstance(db, LazySession)
+        assert not db.is_active_session
+        dependency.close()
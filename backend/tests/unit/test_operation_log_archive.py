@@ -0,0 +1,100 @@
+"""
+Unit Test: Operation log segment files, sparse index and merged reads
+"""
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+import uuid
+
+import pytest
+
+from src.models import OperationResult
+from src.services.operation_log_archive import (
+    ArchiveQuery, OperationLogArchive, SegmentWriter, merge_logs, sort_key
+)
+
+BASE = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def make_rows(user_id: uuid.UUID, minutes, action: str = "LOGIN"):
+    """Rows as the archiver reads them, newest first"""
+    return [
+        SimpleNamespace(
+            id=f"{user_id.hex[:8]}-{m:04d}", user_id=user_id, created_at=BASE + timedelta(minutes=m),
+            action=action, resource="auth/login", result=OperationResult.SUCCESS,
+            details=f"attempt {m}", ip_address="10.0.0.1", user_agent="pytest"
+        )
+        for m in sorted(minutes, reverse=True)
+    ]
+
+
+def write_segment(directory, blocks):
+    writer = SegmentWriter(directory)
+    for rows in blocks:
+        writer.add_block(rows)
+    writer.commit()
+    return writer
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = OperationLogArchive(str(tmp_path))
+    yield archive
+    archive.close()
+
+
+class TestOperationLogArchive:
+    """Reading committed segments"""
+
+    def test_reads_one_user_newest_first_across_segments(self, tmp_path, archive):
+        alice, bob = uuid.uuid4(), uuid.uuid4()
+        # Two segments; Alice's logs interleave across them
+        write_segment(tmp_path, [make_rows(alice, range(0, 20, 2)), make_rows(bob, range(5))])
+        write_segment(tmp_path, [make_rows(alice, range(1, 20, 2)[5:]), make_rows(alice, range(1, 10, 2))])
+
+        logs = list(archive.iter_logs(ArchiveQuery(alice)))
+        assert [log.created_at for log in logs] == [BASE + timedelta(minutes=m) for m in range(19, -1, -1)]
+        assert {log.user_id for log in logs} == {alice}
+        assert archive.count(ArchiveQuery(bob)) == 5
+        assert archive.count(ArchiveQuery(uuid.uuid4())) == 0
+
+    def test_filters_and_position(self, tmp_path, archive):
+        user = uuid.uuid4()
+        write_segment(tmp_path, [make_rows(user, range(10)), make_rows(user, range(10, 15), action="LOGOUT")])
+
+        query = ArchiveQuery(user, start_date=BASE + timedelta(minutes=3), end_date=BASE + timedelta(minutes=12))
+        assert len(list(archive.iter_logs(query))) == 10
+
+        logs = archive.read(ArchiveQuery(user, action="LOGOUT"), before=None, limit=100)
+        assert [log.action for log in logs] == ["LOGOUT"] * 5
+
+        fourth = archive.read(ArchiveQuery(user), before=None, limit=4)[-1]
+        after = archive.read(ArchiveQuery(user), before=(fourth.created_at, fourth.id), limit=100)
+        assert len(after) == 11 and sort_key(after[0]) < sort_key(fourth)
+
+        assert archive.count(ArchiveQuery(user, search="ATTEMPT 1")) == 6  # 1, 10..14
+
+    def test_forget_hides_older_logs(self, tmp_path, archive):
+        user = uuid.uuid4()
+        write_segment(tmp_path, [make_rows(user, range(10))])
+
+        archive.forget(user, BASE + timedelta(minutes=6))
+        assert archive.count(ArchiveQuery(user)) == 4
+        # A reader opened later sees the same tombstone
+        assert OperationLogArchive(str(tmp_path)).count(ArchiveQuery(user)) == 4
+
+    def test_uncommitted_segment_is_invisible(self, tmp_path, archive):
+        user = uuid.uuid4()
+        writer = SegmentWriter(tmp_path)
+        writer.add_block(make_rows(user, range(3)))
+        assert archive.count(ArchiveQuery(user)) == 0
+        writer.abort()
+        assert list(tmp_path.iterdir()) == []
+
+
+def test_merge_logs_drops_duplicates():
+    user = uuid.uuid4()
+    hot = make_rows(user, [9, 7, 5])
+    archived = make_rows(user, [8, 7, 2])
+    merged = merge_logs(hot, archived, limit=10)
+    assert [log.created_at.minute for log in merged] == [9, 8, 7, 5, 2]
+    assert len(merge_logs(hot, archived, limit=3)) == 3
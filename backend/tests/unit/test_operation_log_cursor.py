@@ -0,0 +1,37 @@
+"""
+Unit Test: Operation log pagination cursors
+"""
+from datetime import datetime
+import base64
+import json
+
+import pytest
+
+from src.services.operation_log_service import InvalidCursorError, decode_cursor, encode_cursor
+
+
+class TestOperationLogCursor:
+    """Cursors are opaque, URL-safe and validated on decode"""
+
+    def test_round_trip(self):
+        created_at = datetime(2026, 10, 19, 10, 30, 15, 123456)
+        cursor = encode_cursor(created_at, "0192a4f0-log")
+
+        assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+        assert decode_cursor(cursor) == (created_at, "0192a4f0-log", None)
+
+    def test_round_trip_with_rank(self):
+        created_at = datetime(2026, 10, 19, 10, 30)
+        rank = -0.123456789012345
+
+        assert decode_cursor(encode_cursor(created_at, "a", rank)) == (created_at, "a", rank)
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", "%%%", base64.urlsafe_b64encode(b"[1, 2]").decode()])
+    def test_malformed_cursor_is_rejected(self, cursor):
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+    def test_unknown_version_is_rejected(self):
+        payload = json.dumps({"v": 99, "t": "2026-10-19T10:30:00", "id": "x"}).encode()
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(base64.urlsafe_b64encode(payload).decode())
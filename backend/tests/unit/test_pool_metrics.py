@@ -0,0 +1,67 @@
+"""
+Unit Test: Connection pool metrics
+Checkout waits, overflow and timeouts are recorded through pool events
+"""
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from src.utils.pool_metrics import get_pool_metrics, instrument_engine, instrumented_pool_class
+
+
+@pytest.fixture
+def metrics(request):
+    return get_pool_metrics(f"test-{request.node.name}")
+
+
+@pytest.fixture
+def engine(tmp_path, metrics):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool_class(QueuePool, metrics),
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05
+    )
+    instrument_engine(engine, metrics.name)
+    yield engine
+    engine.dispose()
+
+
+class TestPoolMetrics:
+    """Unit tests for pool telemetry"""
+
+    def test_checkout_wait_is_observed(self, engine, metrics):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+        assert metrics.wait_count == 1
+        assert sum(metrics.wait_buckets) == 1
+
+    def test_in_use_and_idle_gauges(self, engine, metrics):
+        with engine.connect():
+            snapshot = metrics.snapshot(engine.pool)
+            assert snapshot["in_use"] == 1
+
+        snapshot = metrics.snapshot(engine.pool)
+        assert snapshot["in_use"] == 0
+        assert snapshot["idle"] == 1
+        assert snapshot["size"] == 1
+
+    def test_overflow_and_timeout_are_counted(self, engine, metrics):
+        with engine.connect(), engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        assert metrics.overflow_events == 1
+        assert metrics.timeouts == 1
+        assert metrics.checkouts == 2
+
+    def test_metrics_survive_pool_recreate(self, engine, metrics):
+        engine.dispose()
+
+        with engine.connect():
+            pass
+
+        assert type(engine.pool).metrics is metrics
+        assert metrics.wait_count == 1
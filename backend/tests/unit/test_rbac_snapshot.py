@@ -0,0 +1,33 @@
+"""
+Unit Test: RBAC permission bitmasks
+"""
+import uuid
+
+from src.services.rbac import build_snapshot
+
+
+def test_masks_and_checks():
+    admin, viewer, empty = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    snapshot = build_snapshot(
+        7,
+        permissions=[("user.read", 0), ("user.update", 1), ("role.read", 70)],
+        roles=[admin, viewer, empty],
+        grants=[(admin, 0), (admin, 1), (admin, 70), (viewer, 0)]
+    )
+
+    assert snapshot.version == 7
+    assert snapshot.role_masks == {admin: (1 << 70) | 0b11, viewer: 0b1, empty: 0}
+
+    viewer_mask = snapshot.mask_for_roles([viewer, empty])
+    assert snapshot.allows(viewer_mask, "user.read")
+    assert not snapshot.allows(viewer_mask, "user.update")
+    assert not snapshot.allows(viewer_mask, "no.such.permission")
+
+    # Bits beyond 64 work: masks are Python ints
+    admin_mask = snapshot.mask_for_roles([admin, uuid.uuid4()])
+    assert snapshot.allows(admin_mask, "role.read")
+    assert snapshot.permission_names(admin_mask) == ["user.read", "user.update", "role.read"]
+
+
+def test_missing_version_row_is_zero():
+    assert build_snapshot(None, [], [], []).version == 0
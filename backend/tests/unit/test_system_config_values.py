@@ -0,0 +1,38 @@
+"""
+Unit Test: System config value coercion
+"""
+import pytest
+
+from src.services.system_config_service import coerce_config_value, infer_value_type
+
+
+@pytest.mark.parametrize("value, value_type, stored", [
+    (True, "bool", "true"),
+    ("off", "bool", "false"),
+    ("42", "int", "42"),
+    (7.0, "int", "7"),
+    ({"b": 1, "a": [1]}, "json", '{"a": [1], "b": 1}'),
+    ('{"a": 1}', "json", '{"a": 1}'),
+    ("标题", "string", "标题"),
+    (5, "string", "5"),
+])
+def test_coerce(value, value_type, stored):
+    assert coerce_config_value(value, value_type) == stored
+
+
+@pytest.mark.parametrize("value, value_type", [
+    ("maybe", "bool"),
+    ("4.5", "int"),
+    (4.5, "int"),
+    (True, "int"),
+    ("{not json", "json"),
+])
+def test_coerce_rejects(value, value_type):
+    with pytest.raises(ValueError):
+        coerce_config_value(value, value_type)
+
+
+def test_infer_value_type():
+    assert [infer_value_type(v) for v in (False, 3, [1], {}, "x", 1.5)] == [
+        "bool", "int", "json", "json", "string", "string"
+    ]
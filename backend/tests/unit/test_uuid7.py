@@ -0,0 +1,36 @@
+"""
+Unit Test: UUIDv7 generation
+Ids are version 7, unique and ordered by creation time
+"""
+from datetime import datetime, timedelta, timezone
+
+from src.utils.uuid7 import uuid7, uuid7_from_datetime, uuid7_timestamp
+
+
+class TestUUID7:
+    """Unit tests for the UUIDv7 generator"""
+
+    def test_version_and_variant(self):
+        value = uuid7()
+
+        assert value.version == 7
+        assert value.variant == "specified in RFC 4122"
+
+    def test_ids_are_unique_and_monotonic(self):
+        values = [uuid7() for _ in range(10000)]
+
+        assert len(set(values)) == len(values)
+        assert values == sorted(values)
+
+    def test_timestamp_round_trip(self):
+        before = datetime.now(timezone.utc) - timedelta(milliseconds=1)
+        created = uuid7_timestamp(uuid7())
+
+        assert before <= created <= datetime.now(timezone.utc) + timedelta(seconds=1)
+
+    def test_from_datetime_sorts_by_moment(self):
+        start = datetime(2024, 1, 1, 12, 0, 0)
+        values = [uuid7_from_datetime(start + timedelta(seconds=i)) for i in range(100)]
+
+        assert values == sorted(values)
+        assert uuid7_timestamp(values[0]) == start.replace(tzinfo=timezone.utc)
@@ -162,7 +162,7 @@ const DashboardPage: React.FC = () => {
             'Content-Type': 'application/json'
           }
         }),
-        fetch('/api/v1/admin/users', {
+        fetch('/api/v1/admin/users?size=5', {
           headers: {
             'Authorization': `Bearer ${localStorage.getItem('token')}`,
             'Content-Type': 'application/json'
@@ -178,7 +178,7 @@ const DashboardPage: React.FC = () => {
       if (usersResponse.ok) {
         const usersData = await usersResponse.json();
         // 取最近注册的5个用户
-        const sortedUsers = usersData
+        const sortedUsers = (usersData.users || [])
           .sort((a: RecentUser, b: RecentUser) => 
             new Date(b.registration_timestamp).getTime() - new Date(a.registration_timestamp).getTime()
           )
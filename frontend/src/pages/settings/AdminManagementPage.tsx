@@ -43,6 +43,9 @@ interface AdminUser {
   updated_at?: string;
 }
 
+// 管理员角色
+const ADMIN_ROLES = ['admin', 'super_admin', 'moderator', 'demo'];
+
 // interface AdminStats {
 //   total_users: number;
 //   active_users: number;
@@ -68,23 +71,32 @@ const AdminManagementPage: React.FC = () => {
   const loadAdminUsers = async () => {
     setLoading(true);
     try {
-      const response = await fetch('/api/v1/admin/users', {
-        method: 'GET',
-        headers: {
-          'Authorization': `Bearer ${localStorage.getItem('token')}`,
-          'Content-Type': 'application/json'
+      // 服务端按角色过滤管理员用户（包括超级管理员、管理员、演示账号），并沿游标读取全部分页
+      const admins: AdminUser[] = [];
+      let cursor: string | null = null;
+      do {
+        const params = new URLSearchParams({ size: '100' });
+        ADMIN_ROLES.forEach(role => params.append('role', role));
+        if (cursor) {
+          params.set('cursor', cursor);
         }
-      });
 
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`);
-      }
+        const response = await fetch(`/api/v1/admin/users?${params.toString()}`, {
+          method: 'GET',
+          headers: {
+            'Authorization': `Bearer ${localStorage.getItem('token')}`,
+            'Content-Type': 'application/json'
+          }
+        });
+
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`);
+        }
 
-      const data = await response.json();
-      // 过滤出管理员用户（包括超级管理员、管理员、演示账号）
-      const admins = data.filter((user: AdminUser) => 
-        user.roles.some(role => ['admin', 'super_admin', 'moderator', 'demo'].includes(role))
-      );
+        const data = await response.json();
+        admins.push(...(data.users || []));
+        cursor = data.next_cursor || null;
+      } while (cursor);
       setAdminUsers(admins);
     } catch (error) {
       console.error('加载管理员列表失败:', error);